@@ -0,0 +1,125 @@
+from hetool.include.hetool import Hetool
+from pathlib import Path
+import tempfile
+import json
+import time
+import os
+
+# LOAD BENCHMARK
+# Each model of the 'models' folder is scaled up by placing copies of it side
+# by side in the same file, and the time to open the resulting files is
+# measured. The copies do not touch each other, so that they are stored as
+# additional vertices, edges and faces and as inner loops of the infinity face.
+
+
+# Returns a copy of the model file data with '_n' x '_n' copies of the model
+def tileModel(_model, _n):
+    vertices = _model['vertices']
+    edges = _model['edges']
+    faces = _model['faces']
+
+    # sizes of the model and offsets of the IDs of each copy
+    xs = [vertex['point'][0] for vertex in vertices]
+    ys = [vertex['point'][1] for vertex in vertices]
+    dx = 1.5 * (max(xs) - min(xs))
+    dy = 1.5 * (max(ys) - min(ys))
+
+    max_loop = 0
+    max_he = 0
+    for face in faces:
+        loops = [face['loop']] + face['intLoops']
+        for loop in loops:
+            max_loop = max(max_loop, loop['ID'])
+            if loop['he_loop'] is not None:
+                for he in loop['he_loop']:
+                    max_he = max(max_he, he['ID'])
+
+    id_vertex = max(vertex['ID'] for vertex in vertices)
+    id_edge = max(edge['ID'] for edge in edges)
+    id_face = max(face['ID'] for face in faces)
+
+    def shiftId(_id, _offset):
+        if _id is None:
+            return None
+        return _id + _offset
+
+    def shiftLoop(_loop, _k, _face_ID):
+        loop = dict(_loop)
+        loop['ID'] = shiftId(loop['ID'], _k*max_loop)
+        loop['face_ID'] = _face_ID
+        if loop['he_loop'] is not None:
+            he_loop = []
+            for he in loop['he_loop']:
+                he = dict(he)
+                he['ID'] = shiftId(he['ID'], _k*max_he)
+                he['prev_ID'] = shiftId(he['prev_ID'], _k*max_he)
+                he['next_ID'] = shiftId(he['next_ID'], _k*max_he)
+                he['vertex_ID'] = shiftId(he['vertex_ID'], _k*id_vertex)
+                he['edge_ID'] = shiftId(he['edge_ID'], _k*id_edge)
+                he['loop_ID'] = loop['ID']
+                he_loop.append(he)
+            loop['he_loop'] = he_loop
+        return loop
+
+    new_vertices = []
+    new_edges = []
+    new_faces = [dict(faces[0])]
+    new_faces[0]['intLoops'] = []
+
+    for k in range(0, _n*_n):
+        ox = (k % _n) * dx
+        oy = (k // _n) * dy
+
+        for vertex in vertices:
+            vertex = dict(vertex)
+            vertex['ID'] = shiftId(vertex['ID'], k*id_vertex)
+            vertex['he_ID'] = shiftId(vertex['he_ID'], k*max_he)
+            vertex['point'] = [vertex['point'][0] + ox, vertex['point'][1] + oy]
+            new_vertices.append(vertex)
+
+        for edge in edges:
+            edge = dict(edge)
+            edge['ID'] = shiftId(edge['ID'], k*id_edge)
+            edge['he1_ID'] = shiftId(edge['he1_ID'], k*max_he)
+            edge['he2_ID'] = shiftId(edge['he2_ID'], k*max_he)
+            edge['points'] = [[pt[0] + ox, pt[1] + oy] for pt in edge['points']]
+            new_edges.append(edge)
+
+        # the inner loops of the infinity face of all copies are merged
+        for loop in faces[0]['intLoops']:
+            new_faces[0]['intLoops'].append(shiftLoop(loop, k, faces[0]['ID']))
+
+        for face in faces[1:]:
+            face = dict(face)
+            face['ID'] = shiftId(face['ID'], k*id_face)
+            face['loop'] = shiftLoop(face['loop'], k, face['ID'])
+            face['intLoops'] = [shiftLoop(loop, k, face['ID'])
+                                for loop in face['intLoops']]
+            new_faces.append(face)
+
+    model = dict(_model)
+    model['vertices'] = new_vertices
+    model['edges'] = new_edges
+    model['faces'] = new_faces
+
+    return model
+
+
+folder = tempfile.mkdtemp()
+
+for name in ['model_1.json', 'model_2.json', 'model_3.json']:
+    with open(str(Path('models', name)), 'r') as file:
+        model = json.load(file)
+
+    for n in [1, 4, 8]:
+        pth = os.path.join(folder, f'{n}x{n}_{name}')
+        with open(pth, 'w') as file:
+            json.dump(tileModel(model, n), file)
+
+        start = time.perf_counter()
+        Hetool.openFile(pth)
+        elapsed = time.perf_counter() - start
+
+        print(f'{name} {n}x{n}: {len(Hetool.getSegments())} segments, '
+              f'{len(Hetool.getPatches())} patches, '
+              f'opened in {elapsed:.3f} s')
@@ -0,0 +1,77 @@
+from hetool.he.hecontroller import HeController
+from hetool.he.hemodel import HeModel
+from hetool.he.topologicalEntities.vertex import Vertex
+from hetool.he.topologicalEntities.edge import Edge
+from hetool.he.topologicalEntities.halfedge import HalfEdge
+from hetool.he.topologicalEntities.face import Face
+from hetool.he.topologicalEntities.loop import Loop
+from hetool.geometry.point import Point
+from hetool.geometry.segments.line import Line
+from hetool.geometry.patch import Patch
+import tracemalloc
+
+# MEMORY BENCHMARK
+# Reports the memory used by the objects that make up each vertex (Vertex and
+# Point), each edge (Edge, its two half-edges and a Line) and each face
+# (Face, its outer Loop and Patch), and the memory per half-edge of a model
+# built from a structured triangular mesh.
+
+COUNT = 20000  # number of entities created for each measurement
+
+
+# Returns the number of bytes allocated per item by the given function
+def bytesPerItem(_create, _count):
+    tracemalloc.start()
+    items = [_create(i) for i in range(0, _count)]
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # the list that holds the items is not taken into account
+    return (current - 8*len(items)) / _count
+
+
+def createVertex(_i):
+    return Vertex(Point(float(_i), 0.0))
+
+
+def createEdge(_i):
+    edge = Edge(Line(Point(float(_i), 0.0), Point(float(_i), 1.0)))
+    edge.he1 = HalfEdge(None, None, edge)
+    edge.he2 = HalfEdge(None, None, edge)
+    return edge
+
+
+def createFace(_i):
+    face = Face(None, None, None, None, Patch())
+    Loop(face)
+    return face
+
+
+# Returns the nodes and the elements of a structured triangular mesh
+def triangularMesh(_n):
+    nodes = [[float(i), float(j)] for j in range(0, _n+1) for i in range(0, _n+1)]
+    elements = []
+    for j in range(0, _n):
+        for i in range(0, _n):
+            a = j*(_n+1) + i
+            elements.append([a, a+1, a+_n+2])
+            elements.append([a, a+_n+2, a+_n+1])
+
+    return nodes, elements
+
+
+print(f'vertex: {bytesPerItem(createVertex, COUNT):.0f} bytes')
+print(f'edge: {bytesPerItem(createEdge, COUNT):.0f} bytes')
+print(f'face: {bytesPerItem(createFace, COUNT):.0f} bytes')
+
+nodes, elements = triangularMesh(60)
+tracemalloc.start()
+controller = HeController(HeModel())
+controller.buildFromMesh(nodes, elements)
+current, peak = tracemalloc.get_traced_memory()
+tracemalloc.stop()
+
+shell = controller.hemodel.shell
+num_hes = 2*len(shell.edges)
+print(f'model with {len(shell.vertices)} vertices, {len(shell.edges)} edges and '
+      f'{len(shell.faces)} faces: {current/num_hes:.0f} bytes per half-edge')
@@ -1,4 +1,4 @@
-from hetool.include.hetool import HeController, HeModel, HeView, Tesselation
+from hetool.include.hetool import HeController, HeModel, HeView
 import matplotlib.pyplot as plt
 import numpy
 import math
@@ -95,8 +95,7 @@ def printHEModel(viewer, controller):
             thecolor = "white"
         else:
             thecolor = "blue"
-        pts = patch.getPoints()
-        triangs = Tesselation.tessellate(pts)
+        triangs = patch.tessellate()
         for j in range(0, len(triangs)):
             xt = [triangs[j][0].getX(), triangs[j][1].getX(), triangs[j]
                   [2].getX(), triangs[j][0].getX()]
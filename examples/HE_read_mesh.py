@@ -1,29 +1,10 @@
-from hetool.include.hetool import HeController, HeModel, HeView, Tesselation
+from hetool.include.hetool import HeController, HeModel, HeView
 import matplotlib.pyplot as plt
 import numpy
 import math
 
 # From a node coordinate list and a connectivity list build a HE model
 
-def edge(elems, nodes, elem_ID, local_edge_ID):
-    # Find local node IDs
-    if local_edge_ID==0:
-        ini = 0
-        fin = 1
-    elif local_edge_ID==1:
-        ini = 1
-        fin = 2
-    else: # local edge 2
-        ini = 2
-        fin = 0
-
-    # Limiting edge nodes
-    n1 = nodes[elems[elem_ID][ini]]
-    n2 = nodes[elems[elem_ID][fin]]
-
-    # Return correctly formatted list [x1, y1, x2, y2]
-    return [ n1[0], n1[1], n2[0], n2[1]]
-
 def printHEModel(viewer, controller):
     plt.figure('Disk with slits')
 
@@ -34,8 +15,7 @@ def printHEModel(viewer, controller):
             thecolor = "white"
         else:
             thecolor = "blue"
-        pts = patch.getPoints()
-        triangs = Tesselation.tessellate(pts)
+        triangs = patch.tessellate()
         for j in range(0, len(triangs)):
             xt = [triangs[j][0].getX(), triangs[j][1].getX(), triangs[j]
                   [2].getX(), triangs[j][0].getX()]
@@ -114,28 +94,16 @@ def main():
         [10, 11, 15]]
     )
 
-    # Build up a model from adding every edge in the list
+    # Build up a model directly from the node and connectivity lists.
+    # The closed square in the center has no elements and becomes a hole.
 
     # Set up Model-View-Controler
     main_heModel = HeModel()
     main_heView = HeView(main_heModel)
     main_heCtrl = HeController(main_heModel)
-    tol = 1e-6
-    
-    # Loop over every element on the connectivity list
-    for each_elem in range(len(connectivity)):
-        # Add each one of the edges
-        curr_edge = edge(connectivity, nodes, each_elem, 0)
-        main_heCtrl.insertSegment(curr_edge, tol)
-        curr_edge = edge(connectivity, nodes, each_elem, 1)
-        main_heCtrl.insertSegment(curr_edge, tol)
-        curr_edge = edge(connectivity, nodes, each_elem, 2)
-        main_heCtrl.insertSegment(curr_edge, tol)
-    
-    # Remove closed square in the center
-    main_heCtrl.selectPick(1.5, 1.5, 0.01, False)
-    main_heCtrl.delSelectedEntities()
-    
+
+    main_heCtrl.buildFromMesh(nodes, connectivity)
+
     # Print the model
     printHEModel(main_heView, main_heCtrl)
 
@@ -1,4 +1,6 @@
 from hetool.geometry.point import Point
+from hetool.compgeom.segmenttree import SegmentTree
+from fractions import Fraction
 import math
 
 
@@ -6,6 +8,8 @@ class CompGeom:
 
     ABSTOL = 1e-7  # Absolute tolerance value
     PI = 3.1415926535897932384626433832975028841971693993751058
+    EPSILON = 2.0**-53  # unit roundoff of double precision
+    ORIENT_ERRBOUND = (3.0 + 16.0*EPSILON)*EPSILON  # Shewchuk's ccwerrboundA
 
     @staticmethod
     def orient2d(pa, pb, pc):
@@ -15,22 +19,50 @@ class CompGeom:
         bcy = pb[1] - pc[1]
         return acx * bcy - acy * bcx
 
+    # Return the exact sign (-1, 0 or 1) of the oriented twice area formed
+    # by three given points, from their coordinates.
+    # The floating-point determinant is used whenever its magnitude is
+    # larger than its error bound (J.R. Shewchuk - Adaptive Precision
+    # Floating-Point Arithmetic and Fast Robust Geometric Predicates, 1997).
+    # Only near-degenerate cases are computed with exact rational arithmetic.
+    @staticmethod
+    def orientation(_ax, _ay, _bx, _by, _cx, _cy):
+        acx = _ax - _cx
+        bcx = _bx - _cx
+        acy = _ay - _cy
+        bcy = _by - _cy
+        detleft = acx * bcy
+        detright = acy * bcx
+        det = detleft - detright
+
+        errbound = CompGeom.ORIENT_ERRBOUND * (abs(detleft) + abs(detright))
+        if det > errbound:
+            return 1
+        if -det > errbound:
+            return -1
+
+        # both products are exactly zero when one of their factors is
+        if (acx == 0.0 or bcy == 0.0) and (acy == 0.0 or bcx == 0.0):
+            return 0
+
+        det = ((Fraction(_ax) - Fraction(_cx)) * (Fraction(_by) - Fraction(_cy)) -
+               (Fraction(_ay) - Fraction(_cy)) * (Fraction(_bx) - Fraction(_cx)))
+        if det > 0:
+            return 1
+        if det < 0:
+            return -1
+        return 0
+
     # Return the sign (NEGATIVE, ZERO, or POSITIVE) of the oriented
     # twice area formed by three given points.
     @staticmethod
     def signOrient2d(_p1, _p2, _p3):
-
-        det = 0.0
-        pa = [_p1.getX(), _p1.getY()]
-        pb = [_p2.getX(), _p2.getY()]
-        pc = [_p3.getX(), _p3.getY()]
-
-        det = CompGeom.orient2d(pa, pb, pc)
-        if(det != 0.0):
-            if(det > 0.0):
-                return "POSITIVE"
-            else:
-                return "NEGATIVE"
+        sign = CompGeom.orientation(_p1.getX(), _p1.getY(), _p2.getX(),
+                                    _p2.getY(), _p3.getX(), _p3.getY())
+        if sign > 0:
+            return "POSITIVE"
+        if sign < 0:
+            return "NEGATIVE"
 
         return "ZERO"
 
@@ -49,21 +81,24 @@ class CompGeom:
     # points are collinear.
     @staticmethod
     def areCollinear(_p1,  _p2, _p3):
-        return CompGeom.signOrient2d(_p1, _p2, _p3) == 'ZERO'
+        return CompGeom.orientation(_p1.getX(), _p1.getY(), _p2.getX(),
+                                    _p2.getY(), _p3.getX(), _p3.getY()) == 0
 
     # Return a flag (true or false) stating whether the third given
     # point is on the left side of oriented segment formed by the
     # first given points.
     @staticmethod
     def isLeftSide(_p1, _p2, _p3):
-        return CompGeom.signOrient2d(_p1, _p2, _p3) == 'POSITIVE'
+        return CompGeom.orientation(_p1.getX(), _p1.getY(), _p2.getX(),
+                                    _p2.getY(), _p3.getX(), _p3.getY()) > 0
 
     # Return a flag (true or false) stating whether the third given
     # point is on the right side of oriented segment formed by the
     # first given points.
     @staticmethod
     def isRightSide(_p1, _p2, _p3):
-        return CompGeom.signOrient2d(_p1, _p2, _p3) == 'NEGATIVE'
+        return CompGeom.orientation(_p1.getX(), _p1.getY(), _p2.getX(),
+                                    _p2.getY(), _p3.getX(), _p3.getY()) < 0
 
     # Return the sign (NEGATIVE, ZERO, or POSITIVE) of the oriented
     # twice area formed by three given points.
@@ -79,6 +114,22 @@ class CompGeom:
             return "POSITIVE"
         return "NEGATIVE"
 
+    # Return the oriented twice area formed by three given points, from
+    # their coordinates (same as Point.area2d).
+    @staticmethod
+    def area2d(_x1, _y1, _x2, _y2, _x3, _y3):
+        return (_x2 - _x1)*(_y3 - _y1) - (_x3 - _x1)*(_y2 - _y1)
+
+    # Return the sign (-1, 0 or 1) of a given oriented twice area, which is
+    # zero when it is smaller than the tolerance ABSTOL (as in signArea2d).
+    @staticmethod
+    def toleranceSign(_area):
+        if abs(_area) < CompGeom.ABSTOL:
+            return 0
+        if _area > 0.0:
+            return 1
+        return -1
+
     # Return the signed value of the oriented twice area formed by
     # three given points.
     # This function uses conventional floating-point operations to
@@ -171,48 +222,56 @@ class CompGeom:
             return 'DO_NOT_INTERSECT', None, None, None
 
         # Get signs of oriented twice area for points p1-p2-p3 and for points p1-p2-p4
-        sign123 = CompGeom.signArea2d(_p1, _p2, _p3)
-        sign124 = CompGeom.signArea2d(_p1, _p2, _p4)
+        x1 = _p1.getX()
+        y1 = _p1.getY()
+        x2 = _p2.getX()
+        y2 = _p2.getY()
+        x3 = _p3.getX()
+        y3 = _p3.getY()
+        x4 = _p4.getX()
+        y4 = _p4.getY()
+        area123 = CompGeom.area2d(x1, y1, x2, y2, x3, y3)
+        area124 = CompGeom.area2d(x1, y1, x2, y2, x4, y4)
+        sign123 = CompGeom.toleranceSign(area123)
+        sign124 = CompGeom.toleranceSign(area124)
 
         # Check for collinear segments
-        if sign123 == 'ZERO' and sign124 == 'ZERO':
+        if sign123 == 0 and sign124 == 0:
             return 'COLLINEAR', None, None, None
 
         # Check for second segment on the same side of first segment
-        if ((sign123 == 'POSITIVE' and sign124 == 'POSITIVE') or
-                (sign123 == 'NEGATIVE' and sign124 == 'NEGATIVE')):
+        if sign123 * sign124 > 0:
             return 'DO_NOT_INTERSECT', None, None, None
 
         # Get signs of oriented twice area for points p3-p4-p1 and for points p3-p4-p2
-        sign341 = CompGeom.signArea2d(_p3, _p4, _p1)
-        sign342 = CompGeom.signArea2d(_p3, _p4, _p2)
+        area341 = CompGeom.area2d(x3, y3, x4, y4, x1, y1)
+        area342 = CompGeom.area2d(x3, y3, x4, y4, x2, y2)
+        sign341 = CompGeom.toleranceSign(area341)
+        sign342 = CompGeom.toleranceSign(area342)
 
         # Check for first segment on the same side of second segment
-        if ((sign341 == 'POSITIVE') and (sign342 == 'POSITIVE') or
-                (sign341 == 'NEGATIVE' and sign342 == 'NEGATIVE')):
+        if sign341 * sign342 > 0:
             return 'DO_NOT_INTERSECT', None, None, None
 
         # Check for one point of second segment touching first segment.
         # Also compute the intersection point and the parametric values
         # ('t12' and 't34' between 0 and 1) along the two segments.
         # In this case, 't34' is either equal to 0 or equal to 1.
-        if sign123 == 'ZERO' or sign124 == 'ZERO':
-            if sign123 == 'ZERO':
+        if sign123 == 0 or sign124 == 0:
+            if sign123 == 0:
                 t34 = 0.0
                 pi = _p3
-            elif sign124 == 'ZERO':
+            elif sign124 == 0:
                 t34 = 1.0
                 pi = _p4
 
-            if sign341 == 'ZERO':
+            if sign341 == 0:
                 t12 = 0.0
                 pi = _p1
-            elif sign342 == 'ZERO':
+            elif sign342 == 0:
                 t12 = 1.0
                 pi = _p2
             else:
-                area341 = CompGeom.valArea2d(_p3, _p4, _p1)
-                area342 = CompGeom.valArea2d(_p3, _p4, _p2)
                 t12 = area341 / (area341 - area342)
 
             return 'TOUCH', pi, t12, t34
@@ -221,23 +280,21 @@ class CompGeom:
         # Also compute the intersection point and the parametric values
         # ('t12' and 't34' between 0 and 1) along the two segments.
         # In this case, 't12' is either equal to 0 or equal to 1.
-        if sign341 == 'ZERO' or sign342 == 'ZERO':
-            if sign341 == 'ZERO':
+        if sign341 == 0 or sign342 == 0:
+            if sign341 == 0:
                 t12 = 0.0
                 pi = _p1
-            elif sign342 == 'ZERO':
+            elif sign342 == 0:
                 t12 = 1.0
                 pi = _p2
 
-            if sign123 == 'ZERO':
+            if sign123 == 0:
                 t34 = 0.0
                 pi = _p3
-            elif sign124 == 'ZERO':
+            elif sign124 == 0:
                 t34 = 1.0
                 pi = _p4
             else:
-                area123 = CompGeom.valArea2d(_p1, _p2, _p3)
-                area124 = CompGeom.valArea2d(_p1, _p2, _p4)
                 t34 = area123 / (area123 - area124)
 
             return 'TOUCH', pi, t12, t34
@@ -245,10 +302,6 @@ class CompGeom:
         # When get to this point, there is an intersection point of the
         # two segments. Compute parametric values of intersection point
         # along each segment.
-        area341 = CompGeom.valArea2d(_p3, _p4, _p1)
-        area342 = CompGeom.valArea2d(_p3, _p4, _p2)
-        area123 = CompGeom.valArea2d(_p1, _p2, _p3)
-        area124 = CompGeom.valArea2d(_p1, _p2, _p4)
         t12 = area341 / (area341 - area342)
         t34 = area123 / (area123 - area124)
 
@@ -309,6 +362,30 @@ class CompGeom:
             return True
         return False
 
+    # Returns the boundary integrals of an open chain of points which, summed
+    # over the closed boundary of a region (Green's theorem), give its area,
+    # its first moments of area (integrals of y and x) and its second moments
+    # of area (integrals of y*y, x*x and x*y), all about the origin.
+    @staticmethod
+    def boundMoments(_pts):
+        a = qx = qy = ixx = iyy = ixy = 0.0
+
+        for i in range(0, len(_pts)-1):
+            x1 = _pts[i].getX()
+            y1 = _pts[i].getY()
+            x2 = _pts[i+1].getX()
+            y2 = _pts[i+1].getY()
+            c = x1*y2 - x2*y1
+
+            a += c
+            qx += (y1 + y2)*c
+            qy += (x1 + x2)*c
+            ixx += (y1*y1 + y1*y2 + y2*y2)*c
+            iyy += (x1*x1 + x1*x2 + x2*x2)*c
+            ixy += (x1*y2 + 2.0*x1*y1 + 2.0*x2*y2 + x2*y1)*c
+
+        return a/2.0, qx/6.0, qy/6.0, ixx/12.0, iyy/12.0, ixy/24.0
+
     # This function returns a flag indicating whether the given point 'p'
     # is inside a polygon 'poly'.
     # The algorithm counts the number of intersections that a horizontal
@@ -663,7 +740,7 @@ class CompGeom:
         return False, pts, param1, param2
 
     @staticmethod
-    def splitSelfIntersected(_poly):
+    def splitSelfIntersected(_poly, _tree=None):
 
         # verifies for each pair of possible segments if they intersect, and
         # stores for both segments the parametric coordinate where intersection occurs
@@ -673,15 +750,37 @@ class CompGeom:
         intersecParams = []
         params = []
         pts = []
+
+        # lengths of the segments and the total length before each one of them
+        segLengths = []
+        segStarts = []
+        totalLength = 0.0
         for i in range(0, len(_poly)-1):
-            segONEPartialLength = Point.euclidiandistance(
-                _poly[i], _poly[i + 1])
-            segTWOTotalLength = segONETotalLength + segONEPartialLength
-            segTWOPartialLength = 0.0
+            segStarts.append(totalLength)
+            segLengths.append(Point.euclidiandistance(_poly[i], _poly[i + 1]))
+            totalLength += segLengths[i]
+
+        # only the pairs of segments in overlapping leaves of the bounding-box
+        # tree of the polyline are checked, when there are many of them. Thus,
+        # a simple polyline only checks each segment against its neighbors.
+        nSegs = len(_poly) - 1
+        candidates = None
+        if nSegs*(nSegs-1)/2 > SegmentTree.LEAF_SIZE*SegmentTree.LEAF_SIZE:
+            if _tree is None:
+                _tree = SegmentTree(_poly)
+            candidates = _tree.overlappingSegments(_tree, CompGeom.ABSTOL)
+
+        for i in range(0, len(_poly)-1):
+            segONEPartialLength = segLengths[i]
 
-            for j in range(i+1, len(_poly)-1):
-                segTWOPartialLength = Point.euclidiandistance(
-                    _poly[j], _poly[j + 1])
+            if candidates is None:
+                segsTWO = range(i+1, len(_poly)-1)
+            else:
+                segsTWO = [j for j in candidates.get(i, []) if j > i]
+
+            for j in segsTWO:
+                segTWOPartialLength = segLengths[j]
+                segTWOTotalLength = segStarts[j]
                 status, pi, t12, t34 = CompGeom.computeSegmentSegmentIntersection(_poly[i], _poly[i + 1],
                                                                                   _poly[j], _poly[j + 1])
 
@@ -1034,8 +1133,6 @@ class CompGeom:
                             [segTWOTotalLength + t34*segTWOPartialLength, pi])
                         iStatus = True
 
-                segTWOTotalLength += segTWOPartialLength
-
             segONETotalLength += segONEPartialLength
 
         # removes duplicate elements
@@ -1054,7 +1151,7 @@ class CompGeom:
         return iStatus, pts, params
 
     @staticmethod
-    def computePolyPolyIntersection(_poly1, _poly2):
+    def computePolyPolyIntersection(_poly1, _poly2, _tree1=None, _tree2=None):
 
         # verifies for each pair of possible segments if they intersect, and
         # stores for both segments the parametric coordinate where intersection occurs
@@ -1065,16 +1162,41 @@ class CompGeom:
         param2 = []
         pts = []
 
+        # lengths of the segments of the second polyline and the total
+        # length before each one of them
+        segTWOLengths = []
+        segTWOStarts = []
+        segTWOEnd = 0.0
+        for j in range(0, len(_poly2)-1):
+            segTWOStarts.append(segTWOEnd)
+            segTWOLengths.append(Point.euclidiandistance(_poly2[j], _poly2[j + 1]))
+            segTWOEnd += segTWOLengths[j]
+
+        # only the pairs of segments in overlapping leaves of the bounding-box
+        # trees of the polylines are checked, when there are many of them
+        nSegs1 = len(_poly1) - 1
+        nSegs2 = len(_poly2) - 1
+        candidates = None
+        if nSegs1*nSegs2 > SegmentTree.LEAF_SIZE*SegmentTree.LEAF_SIZE:
+            if _tree1 is None:
+                _tree1 = SegmentTree(_poly1)
+            if _tree2 is None:
+                _tree2 = SegmentTree(_poly2)
+            candidates = _tree1.overlappingSegments(_tree2, CompGeom.ABSTOL)
+
         for i in range(0, len(_poly1)-1):
             segONEPartialLength = Point.euclidiandistance(
                 _poly1[i], _poly1[i + 1])
-            segTWOPartialLength = 0.0
-            segTWOTotalLength = 0.0
 
-            for j in range(0, len(_poly2)-1):
+            if candidates is None:
+                segsTWO = range(0, len(_poly2)-1)
+            else:
+                segsTWO = candidates.get(i, [])
+
+            for j in segsTWO:
 
-                segTWOPartialLength = Point.euclidiandistance(
-                    _poly2[j], _poly2[j + 1])
+                segTWOPartialLength = segTWOLengths[j]
+                segTWOTotalLength = segTWOStarts[j]
                 status, pi, t12, t34 = CompGeom.computeSegmentSegmentIntersection(
                     _poly1[i], _poly1[i+1], _poly2[j], _poly2[j + 1])
 
@@ -1450,10 +1572,10 @@ class CompGeom:
                         [segONEInterAtParam, segTWOInterAtParam, pi])
                     iStatus = True
 
-                segTWOTotalLength += segTWOPartialLength
-
             segONETotalLength += segONEPartialLength
 
+        segTWOTotalLength = segTWOEnd
+
         # removes duplicate elements
         unique_intersecParams = []
         for item in intersecParams:
@@ -0,0 +1,184 @@
+import numpy as np
+from hetool.compgeom.compgeom import CompGeom
+
+
+# Batched versions of the CompGeom predicates. Instead of one triple of Point
+# objects, each function takes arrays of coordinates (or scalars, which are
+# broadcast) and evaluates all the triples at once with NumPy. Signs are
+# returned as integer arrays (-1 for NEGATIVE, 0 for ZERO and 1 for POSITIVE).
+# The arithmetic is the same as in CompGeom, so that the results agree with
+# the ones of the scalar functions.
+class CompGeomArray:
+
+    MAX_BLOCK = 1000000  # maximum number of point-edge pairs in a block
+
+    # Returns the x and y coordinates of a list of points as arrays
+    @staticmethod
+    def pointArrays(_pts):
+        x = np.fromiter((pt.getX() for pt in _pts), dtype=float, count=len(_pts))
+        y = np.fromiter((pt.getY() for pt in _pts), dtype=float, count=len(_pts))
+        return x, y
+
+    # Return the signed values of the oriented twice areas formed by the
+    # triples of points (same as CompGeom.valOrient2d)
+    @staticmethod
+    def orient2d(_x1, _y1, _x2, _y2, _x3, _y3):
+        acx = np.asarray(_x1, dtype=float) - _x3
+        bcx = np.asarray(_x2, dtype=float) - _x3
+        acy = np.asarray(_y1, dtype=float) - _y3
+        bcy = np.asarray(_y2, dtype=float) - _y3
+        return acx * bcy - acy * bcx
+
+    # Return the signs of the oriented twice areas formed by the triples of
+    # points. Unlike CompGeom.orientation, the signs of near-degenerate
+    # triples are not computed exactly.
+    @staticmethod
+    def signOrient2d(_x1, _y1, _x2, _y2, _x3, _y3):
+        det = CompGeomArray.orient2d(_x1, _y1, _x2, _y2, _x3, _y3)
+        return np.sign(det).astype(np.int8)
+
+    # Return flags stating whether the third points are on the left side of
+    # the oriented segments formed by the first points
+    @staticmethod
+    def isLeftSide(_x1, _y1, _x2, _y2, _x3, _y3):
+        return CompGeomArray.orient2d(_x1, _y1, _x2, _y2, _x3, _y3) > 0.0
+
+    # Return the oriented twice areas formed by the triples of points
+    # (same as Point.area2d)
+    @staticmethod
+    def area2d(_x1, _y1, _x2, _y2, _x3, _y3):
+        ax = np.asarray(_x2, dtype=float) - _x1
+        ay = np.asarray(_y2, dtype=float) - _y1
+        bx = np.asarray(_x3, dtype=float) - _x1
+        by = np.asarray(_y3, dtype=float) - _y1
+        return ax*by - bx*ay
+
+    # Return the signs of the oriented twice areas formed by the triples of
+    # points, which are zero within the absolute tolerance
+    # (same as CompGeom.signArea2d)
+    @staticmethod
+    def signArea2d(_x1, _y1, _x2, _y2, _x3, _y3):
+        det = CompGeomArray.area2d(_x1, _y1, _x2, _y2, _x3, _y3)
+        sign = np.sign(det).astype(np.int8)
+        sign[np.abs(det) < CompGeom.ABSTOL] = 0
+        return sign
+
+    # Return the distances, the coordinates of the closest points and their
+    # parameters on the segments 'p1'-'p2' to the points 'p'
+    # (same as CompGeom.getClosestPointSegment). Degenerate segments give
+    # NaN values.
+    @staticmethod
+    def getClosestPointSegment(_x1, _y1, _x2, _y2, _x, _y):
+        x1, y1, x2, y2, x, y = np.broadcast_arrays(
+            *[np.asarray(v, dtype=float) for v in (_x1, _y1, _x2, _y2, _x, _y)])
+
+        v12x = x2 - x1
+        v12y = y2 - y1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = (v12x*(x - x1) + v12y*(y - y1)) / (v12x*v12x + v12y*v12y)
+
+        atInit = (np.abs(t) < CompGeom.ABSTOL) | (t < 0.0)
+        atEnd = ~atInit & ((np.abs(t - 1.0) < CompGeom.ABSTOL) | (t > 1.0))
+
+        t = np.where(atInit, 0.0, np.where(atEnd, 1.0, t))
+        xc = np.where(atInit, x1, np.where(atEnd, x2, x1 + v12x*t))
+        yc = np.where(atInit, y1, np.where(atEnd, y2, y1 + v12y*t))
+
+        dist = np.sqrt((xc - x)*(xc - x) + (yc - y)*(yc - y))
+        return dist, xc, yc, t
+
+    # Return flags stating whether the points are inside the polygon given
+    # by the coordinates of its vertices (same as CompGeom.isPointInPolygon).
+    # The points are processed in blocks against all the edges at once.
+    @staticmethod
+    def isPointInPolygon(_polyX, _polyY, _x, _y):
+        x1 = np.asarray(_polyX, dtype=float)
+        y1 = np.asarray(_polyY, dtype=float)
+        x = np.asarray(_x, dtype=float).ravel()
+        y = np.asarray(_y, dtype=float).ravel()
+
+        # the horizontal edges are discarded
+        x2 = np.roll(x1, -1)
+        y2 = np.roll(y1, -1)
+        keep = y1 != y2
+        x1 = x1[keep, np.newaxis]
+        y1 = y1[keep, np.newaxis]
+        x2 = x2[keep, np.newaxis]
+        y2 = y2[keep, np.newaxis]
+
+        inside = np.zeros(len(x), dtype=bool)
+        if len(x1) == 0:
+            return inside
+
+        dx = x1 - x2
+        block = max(CompGeomArray.MAX_BLOCK // len(x1), 1)
+
+        for first in range(0, len(x), block):
+            px = x[np.newaxis, first:first+block]
+            py = y[np.newaxis, first:first+block]
+
+            # edges above, below or to the left of the point are discarded
+            valid = ~(((y1 > py) & (y2 > py)) | ((x1 < px) & (x2 < px)) |
+                      ((y1 < py) & (y2 < py)))
+
+            # x coordinate of the intersection of the ray with the edge
+            with np.errstate(divide='ignore', invalid='ignore'):
+                xc = np.where(dx != 0.0, x1 + (py - y1)*dx / (y1 - y2), x1)
+
+            crossing = np.where(
+                y1 == py, (x1 > px) & (y2 > py),
+                np.where(y2 == py, (x2 > px) & (y1 > py),
+                         ((x1 > px) & (x2 > px)) | (xc > px)))
+
+            ni = np.count_nonzero(valid & crossing, axis=0)
+            inside[first:first+block] = (ni % 2) > 0
+
+        return inside
+
+    # Returns, for each of the 'n' regions, the sums of the boundary
+    # integrals of the oriented line segments 'p1'-'p2' that belong to it
+    # (same as CompGeom.boundMoments): the areas, the first moments of area
+    # (integrals of y and x), the second moments of area (integrals of y*y,
+    # x*x and x*y) about the origin, and the sums of the segment lengths.
+    # The index of the region of each line segment is given by 'ids'.
+    @staticmethod
+    def boundMoments(_x1, _y1, _x2, _y2, _ids, _n):
+        x1 = np.asarray(_x1, dtype=float)
+        y1 = np.asarray(_y1, dtype=float)
+        x2 = np.asarray(_x2, dtype=float)
+        y2 = np.asarray(_y2, dtype=float)
+        ids = np.asarray(_ids, dtype=np.intp)
+        c = x1*y2 - x2*y1
+
+        def total(_values):
+            return np.asarray(np.bincount(ids, weights=_values, minlength=_n),
+                              dtype=float)
+
+        area = total(c) / 2.0
+        qx = total((y1 + y2)*c) / 6.0
+        qy = total((x1 + x2)*c) / 6.0
+        ixx = total((y1*y1 + y1*y2 + y2*y2)*c) / 12.0
+        iyy = total((x1*x1 + x1*x2 + x2*x2)*c) / 12.0
+        ixy = total((x1*y2 + 2.0*x1*y1 + 2.0*x2*y2 + x2*y1)*c) / 24.0
+        length = total(np.hypot(x2 - x1, y2 - y1))
+
+        return area, qx, qy, ixx, iyy, ixy, length
+
+    # Returns, for each of the 'n' regions bounded by the oriented line
+    # segments 'p1'-'p2', its area, its perimeter, the coordinates of its
+    # centroid and its second moments of area about the centroidal axes
+    # parallel to the x and y axes. Regions with no area give NaN values.
+    @staticmethod
+    def sectionProperties(_x1, _y1, _x2, _y2, _ids, _n):
+        area, qx, qy, ixx, iyy, ixy, length = CompGeomArray.boundMoments(
+            _x1, _y1, _x2, _y2, _ids, _n)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cx = qy / area
+            cy = qx / area
+
+        ixx = ixx - area*cy*cy
+        iyy = iyy - area*cx*cx
+        ixy = ixy - area*cx*cy
+
+        return area, length, cx, cy, ixx, iyy, ixy
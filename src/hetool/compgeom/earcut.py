@@ -0,0 +1,660 @@
+from array import array
+
+
+# Vertex of the circular doubly linked lists used by the ear clipper
+class EarcutNode:
+
+    def __init__(self, i, x, y):
+        self.i = i  # index of the vertex in the input
+        self.x = x
+        self.y = y
+        self.prev = None
+        self.next = None
+        self.z = 0  # z-order curve value
+        self.prevZ = None
+        self.nextZ = None
+        self.steiner = False
+
+
+# Ear clipping triangulation of polygons with holes, after the earcut
+# algorithm of Mapbox (https://github.com/mapbox/earcut).
+# The holes are bridged to the outer boundary, so that a single polygon is
+# clipped. For large polygons, the vertices are also linked in the order of a
+# z-order curve, so that each ear test only visits the vertices near the ear
+# instead of all the polygon vertices.
+class Earcut:
+
+    HASH_SIZE = 80  # number of vertices from which the z-order hash is used
+
+    # Returns the triangles of the polygon given by the coordinates of its
+    # vertices. Holes start at the given vertex indices. The triangles are
+    # returned as an array of vertex indices, three per triangle, in
+    # counter-clockwise order.
+    @staticmethod
+    def triangulate(_coords, _holeIndices=None):
+        triangles = array('i')
+        nPts = len(_coords) // 2
+
+        hasHoles = _holeIndices is not None and len(_holeIndices) > 0
+        outerLen = _holeIndices[0] if hasHoles else nPts
+        outerNode = Earcut.linkedList(_coords, 0, outerLen, True)
+
+        if outerNode is None or outerNode.next is outerNode.prev:
+            return triangles
+
+        if hasHoles:
+            outerNode = Earcut.eliminateHoles(_coords, _holeIndices, outerNode)
+
+        # the z-order hash is only worth it on large polygons
+        minX = minY = invSize = 0.0
+        if nPts > Earcut.HASH_SIZE:
+            xs = _coords[0:2*outerLen:2]
+            ys = _coords[1:2*outerLen:2]
+            minX = min(xs)
+            minY = min(ys)
+            invSize = max(max(xs) - minX, max(ys) - minY)
+            invSize = 32767 / invSize if invSize != 0 else 0.0
+
+        Earcut.earcutLinked(outerNode, triangles, minX, minY, invSize, 0)
+
+        return triangles
+
+    # Creates a circular linked list from the vertices in the given range,
+    # with the given orientation (counter-clockwise or clockwise)
+    @staticmethod
+    def linkedList(_coords, _start, _end, _ccw):
+        last = None
+
+        if _ccw == (Earcut.signedArea(_coords, _start, _end) > 0):
+            for i in range(_start, _end):
+                last = Earcut.insertNode(i, _coords[2*i], _coords[2*i+1], last)
+        else:
+            for i in range(_end - 1, _start - 1, -1):
+                last = Earcut.insertNode(i, _coords[2*i], _coords[2*i+1], last)
+
+        if last is not None and Earcut.equals(last, last.next):
+            Earcut.removeNode(last)
+            last = last.next
+
+        return last
+
+    # Removes duplicated and collinear vertices
+    @staticmethod
+    def filterPoints(_start, _end=None):
+        if _start is None:
+            return _start
+        if _end is None:
+            _end = _start
+
+        p = _start
+        while True:
+            again = False
+
+            if not p.steiner and (Earcut.equals(p, p.next) or
+                                  Earcut.area(p.prev, p, p.next) == 0):
+                Earcut.removeNode(p)
+                p = _end = p.prev
+                if p is p.next:
+                    break
+                again = True
+            else:
+                p = p.next
+
+            if not again and p is _end:
+                break
+
+        return _end
+
+    # Main ear clipping loop. When no more ears are found, the polygon is
+    # cleaned up (pass 1), its local self-intersections are cured (pass 2)
+    # and, finally, it is split in two
+    @staticmethod
+    def earcutLinked(_ear, _triangles, _minX, _minY, _invSize, _pass):
+        if _ear is None:
+            return
+
+        if _pass == 0 and _invSize:
+            Earcut.indexCurve(_ear, _minX, _minY, _invSize)
+
+        ear = _ear
+        stop = ear
+
+        while ear.prev is not ear.next:
+            prev = ear.prev
+            next = ear.next
+
+            if _invSize:
+                isEar = Earcut.isEarHashed(ear, _minX, _minY, _invSize)
+            else:
+                isEar = Earcut.isEar(ear)
+
+            if isEar:
+                _triangles.append(prev.i)
+                _triangles.append(ear.i)
+                _triangles.append(next.i)
+
+                Earcut.removeNode(ear)
+
+                ear = next.next
+                stop = next.next
+                continue
+
+            ear = next
+
+            if ear is stop:
+                if _pass == 0:
+                    Earcut.earcutLinked(Earcut.filterPoints(ear), _triangles,
+                                        _minX, _minY, _invSize, 1)
+                elif _pass == 1:
+                    ear = Earcut.cureLocalIntersections(
+                        Earcut.filterPoints(ear), _triangles)
+                    Earcut.earcutLinked(ear, _triangles, _minX, _minY,
+                                        _invSize, 2)
+                elif _pass == 2:
+                    Earcut.splitEarcut(ear, _triangles, _minX, _minY, _invSize)
+
+                break
+
+    # Checks whether a polygon vertex forms a valid ear with its neighbors
+    @staticmethod
+    def isEar(_ear):
+        a = _ear.prev
+        b = _ear
+        c = _ear.next
+
+        if Earcut.area(a, b, c) >= 0:
+            return False  # reflex, can't be an ear
+
+        x0 = min(a.x, b.x, c.x)
+        y0 = min(a.y, b.y, c.y)
+        x1 = max(a.x, b.x, c.x)
+        y1 = max(a.y, b.y, c.y)
+
+        # no other point of the polygon may lie inside the ear
+        p = c.next
+        while p is not a:
+            if (x0 <= p.x <= x1 and y0 <= p.y <= y1 and
+                    Earcut.pointInTriangle(a.x, a.y, b.x, b.y, c.x, c.y, p.x, p.y) and
+                    Earcut.area(p.prev, p, p.next) >= 0):
+                return False
+            p = p.next
+
+        return True
+
+    # Same as isEar, but only the points whose z-order values lie in the
+    # range of the ear's bounding box are checked
+    @staticmethod
+    def isEarHashed(_ear, _minX, _minY, _invSize):
+        a = _ear.prev
+        b = _ear
+        c = _ear.next
+
+        if Earcut.area(a, b, c) >= 0:
+            return False  # reflex, can't be an ear
+
+        x0 = min(a.x, b.x, c.x)
+        y0 = min(a.y, b.y, c.y)
+        x1 = max(a.x, b.x, c.x)
+        y1 = max(a.y, b.y, c.y)
+
+        minZ = Earcut.zOrder(x0, y0, _minX, _minY, _invSize)
+        maxZ = Earcut.zOrder(x1, y1, _minX, _minY, _invSize)
+
+        # looks for points in both directions of the z-order
+        p = _ear.prevZ
+        n = _ear.nextZ
+
+        while p is not None and p.z >= minZ and n is not None and n.z <= maxZ:
+            if Earcut.blocksEar(p, a, c, x0, y0, x1, y1):
+                return False
+            p = p.prevZ
+
+            if Earcut.blocksEar(n, a, c, x0, y0, x1, y1):
+                return False
+            n = n.nextZ
+
+        while p is not None and p.z >= minZ:
+            if Earcut.blocksEar(p, a, c, x0, y0, x1, y1):
+                return False
+            p = p.prevZ
+
+        while n is not None and n.z <= maxZ:
+            if Earcut.blocksEar(n, a, c, x0, y0, x1, y1):
+                return False
+            n = n.nextZ
+
+        return True
+
+    # Checks whether a reflex point lies inside the ear a-b-c
+    @staticmethod
+    def blocksEar(_p, _a, _c, _x0, _y0, _x1, _y1):
+        b = _a.next
+        return (_x0 <= _p.x <= _x1 and _y0 <= _p.y <= _y1 and
+                _p is not _a and _p is not _c and
+                Earcut.pointInTriangle(_a.x, _a.y, b.x, b.y, _c.x, _c.y, _p.x, _p.y) and
+                Earcut.area(_p.prev, _p, _p.next) >= 0)
+
+    # Goes through all polygon vertices and cuts off the ones that form
+    # small local self-intersections
+    @staticmethod
+    def cureLocalIntersections(_start, _triangles):
+        p = _start
+        while True:
+            a = p.prev
+            b = p.next.next
+
+            if (not Earcut.equals(a, b) and Earcut.intersects(a, p, p.next, b) and
+                    Earcut.locallyInside(a, b) and Earcut.locallyInside(b, a)):
+                _triangles.append(a.i)
+                _triangles.append(p.i)
+                _triangles.append(b.i)
+
+                Earcut.removeNode(p)
+                Earcut.removeNode(p.next)
+
+                p = _start = b
+
+            p = p.next
+            if p is _start:
+                break
+
+        return Earcut.filterPoints(p)
+
+    # Splits the polygon in two by a valid diagonal and triangulates them
+    @staticmethod
+    def splitEarcut(_start, _triangles, _minX, _minY, _invSize):
+        a = _start
+        while True:
+            b = a.next.next
+            while b is not a.prev:
+                if a.i != b.i and Earcut.isValidDiagonal(a, b):
+                    c = Earcut.splitPolygon(a, b)
+
+                    a = Earcut.filterPoints(a, a.next)
+                    c = Earcut.filterPoints(c, c.next)
+
+                    Earcut.earcutLinked(a, _triangles, _minX, _minY, _invSize, 0)
+                    Earcut.earcutLinked(c, _triangles, _minX, _minY, _invSize, 0)
+                    return
+
+                b = b.next
+
+            a = a.next
+            if a is _start:
+                break
+
+    # Links every hole into the outer loop, producing a single-ring polygon
+    # without holes
+    @staticmethod
+    def eliminateHoles(_coords, _holeIndices, _outerNode):
+        queue = []
+        nPts = len(_coords) // 2
+
+        for k in range(0, len(_holeIndices)):
+            start = _holeIndices[k]
+            end = _holeIndices[k + 1] if k < len(_holeIndices) - 1 else nPts
+            hole = Earcut.linkedList(_coords, start, end, False)
+            if hole is None:
+                continue
+            if hole is hole.next:
+                hole.steiner = True
+            queue.append(Earcut.getLeftmost(hole))
+
+        # the holes are bridged from left to right
+        queue.sort(key=lambda node: node.x)
+
+        for hole in queue:
+            _outerNode = Earcut.eliminateHole(hole, _outerNode)
+
+        return _outerNode
+
+    @staticmethod
+    def eliminateHole(_hole, _outerNode):
+        bridge = Earcut.findHoleBridge(_hole, _outerNode)
+        if bridge is None:
+            return _outerNode
+
+        bridgeReverse = Earcut.splitPolygon(bridge, _hole)
+
+        Earcut.filterPoints(bridgeReverse, bridgeReverse.next)
+        return Earcut.filterPoints(bridge, bridge.next)
+
+    # Finds a vertex of the outer polygon that can be connected to the
+    # leftmost vertex of a hole (David Eberly's algorithm)
+    @staticmethod
+    def findHoleBridge(_hole, _outerNode):
+        p = _outerNode
+        hx = _hole.x
+        hy = _hole.y
+        qx = float('-inf')
+        m = None
+
+        # finds a segment intersected by a ray from the hole's leftmost point
+        # to the left; segment's endpoint with lesser x will be the candidate
+        while True:
+            if hy <= p.y and hy >= p.next.y and p.next.y != p.y:
+                x = p.x + (hy - p.y) * (p.next.x - p.x) / (p.next.y - p.y)
+                if x <= hx and x > qx:
+                    qx = x
+                    m = p if p.x < p.next.x else p.next
+                    if x == hx:
+                        return m  # the hole touches the outer segment
+
+            p = p.next
+            if p is _outerNode:
+                break
+
+        if m is None:
+            return None
+
+        # looks for points inside the triangle of hole point, segment
+        # intersection and endpoint; if there are none, the endpoint is the
+        # bridge, otherwise the point of minimum angle with the ray is taken
+        stop = m
+        mx = m.x
+        my = m.y
+        tanMin = float('inf')
+
+        p = m
+        while True:
+            if (hx >= p.x and p.x >= mx and hx != p.x and
+                    Earcut.pointInTriangle(hx if hy < my else qx, hy, mx, my,
+                                           qx if hy < my else hx, hy, p.x, p.y)):
+                tan = abs(hy - p.y) / (hx - p.x)
+
+                if Earcut.locallyInside(p, _hole) and \
+                        (tan < tanMin or (tan == tanMin and
+                                          (p.x > m.x or (p.x == m.x and
+                                                         Earcut.sectorContainsSector(m, p))))):
+                    m = p
+                    tanMin = tan
+
+            p = p.next
+            if p is stop:
+                break
+
+        return m
+
+    # Checks whether the sector in vertex m contains the sector in vertex p
+    # in the same coordinates
+    @staticmethod
+    def sectorContainsSector(_m, _p):
+        return (Earcut.area(_m.prev, _m, _p.prev) < 0 and
+                Earcut.area(_p.next, _m, _m.next) < 0)
+
+    # Links the polygon vertices in z-order
+    @staticmethod
+    def indexCurve(_start, _minX, _minY, _invSize):
+        p = _start
+        while True:
+            if p.z == 0:
+                p.z = Earcut.zOrder(p.x, p.y, _minX, _minY, _invSize)
+            p.prevZ = p.prev
+            p.nextZ = p.next
+            p = p.next
+            if p is _start:
+                break
+
+        p.prevZ.nextZ = None
+        p.prevZ = None
+
+        Earcut.sortLinked(p)
+
+    # Sorts the z-order linked list (Simon Tatham's linked list merge sort)
+    @staticmethod
+    def sortLinked(_list):
+        inSize = 1
+
+        while True:
+            p = _list
+            _list = None
+            tail = None
+            numMerges = 0
+
+            while p is not None:
+                numMerges += 1
+                q = p
+                pSize = 0
+                for i in range(0, inSize):
+                    pSize += 1
+                    q = q.nextZ
+                    if q is None:
+                        break
+                qSize = inSize
+
+                while pSize > 0 or (qSize > 0 and q is not None):
+                    if pSize != 0 and (qSize == 0 or q is None or p.z <= q.z):
+                        e = p
+                        p = p.nextZ
+                        pSize -= 1
+                    else:
+                        e = q
+                        q = q.nextZ
+                        qSize -= 1
+
+                    if tail is not None:
+                        tail.nextZ = e
+                    else:
+                        _list = e
+
+                    e.prevZ = tail
+                    tail = e
+
+                p = q
+
+            tail.nextZ = None
+            inSize *= 2
+
+            if numMerges <= 1:
+                return _list
+
+    # Returns the z-order of a point, given the coordinates of the lower
+    # left corner of the polygon's bounding box and the inverse of its size
+    @staticmethod
+    def zOrder(_x, _y, _minX, _minY, _invSize):
+        # coordinates are transformed into non-negative 15-bit integers
+        x = int((_x - _minX) * _invSize)
+        y = int((_y - _minY) * _invSize)
+
+        x = (x | (x << 8)) & 0x00FF00FF
+        x = (x | (x << 4)) & 0x0F0F0F0F
+        x = (x | (x << 2)) & 0x33333333
+        x = (x | (x << 1)) & 0x55555555
+
+        y = (y | (y << 8)) & 0x00FF00FF
+        y = (y | (y << 4)) & 0x0F0F0F0F
+        y = (y | (y << 2)) & 0x33333333
+        y = (y | (y << 1)) & 0x55555555
+
+        return x | (y << 1)
+
+    # Finds the leftmost vertex of a polygon ring
+    @staticmethod
+    def getLeftmost(_start):
+        p = _start
+        leftmost = _start
+        while True:
+            if p.x < leftmost.x or (p.x == leftmost.x and p.y < leftmost.y):
+                leftmost = p
+            p = p.next
+            if p is _start:
+                break
+
+        return leftmost
+
+    # Checks whether a point lies within a convex triangle
+    @staticmethod
+    def pointInTriangle(_ax, _ay, _bx, _by, _cx, _cy, _px, _py):
+        return ((_cx - _px) * (_ay - _py) >= (_ax - _px) * (_cy - _py) and
+                (_ax - _px) * (_by - _py) >= (_bx - _px) * (_ay - _py) and
+                (_bx - _px) * (_cy - _py) >= (_cx - _px) * (_by - _py))
+
+    # Checks whether a diagonal between two polygon vertices is valid (lies
+    # in the polygon interior)
+    @staticmethod
+    def isValidDiagonal(_a, _b):
+        if _a.next.i == _b.i or _a.prev.i == _b.i or Earcut.intersectsPolygon(_a, _b):
+            return False
+
+        # locally visible, and does not create opposite-facing sectors
+        if (Earcut.locallyInside(_a, _b) and Earcut.locallyInside(_b, _a) and
+                Earcut.middleInside(_a, _b) and
+                (Earcut.area(_a.prev, _a, _b.prev) != 0 or
+                 Earcut.area(_a, _b.prev, _b) != 0)):
+            return True
+
+        # special zero-length case
+        return (Earcut.equals(_a, _b) and Earcut.area(_a.prev, _a, _a.next) > 0 and
+                Earcut.area(_b.prev, _b, _b.next) > 0)
+
+    # Signed area of a triangle, which is negative for counter-clockwise
+    # triangles
+    @staticmethod
+    def area(_p, _q, _r):
+        return (_q.y - _p.y) * (_r.x - _q.x) - (_q.x - _p.x) * (_r.y - _q.y)
+
+    @staticmethod
+    def equals(_p1, _p2):
+        return _p1.x == _p2.x and _p1.y == _p2.y
+
+    # Checks whether two segments intersect
+    @staticmethod
+    def intersects(_p1, _q1, _p2, _q2):
+        o1 = Earcut.sign(Earcut.area(_p1, _q1, _p2))
+        o2 = Earcut.sign(Earcut.area(_p1, _q1, _q2))
+        o3 = Earcut.sign(Earcut.area(_p2, _q2, _p1))
+        o4 = Earcut.sign(Earcut.area(_p2, _q2, _q1))
+
+        if o1 != o2 and o3 != o4:
+            return True  # general case
+
+        # collinear points lying on the other segment
+        if o1 == 0 and Earcut.onSegment(_p1, _p2, _q1):
+            return True
+        if o2 == 0 and Earcut.onSegment(_p1, _q2, _q1):
+            return True
+        if o3 == 0 and Earcut.onSegment(_p2, _p1, _q2):
+            return True
+        if o4 == 0 and Earcut.onSegment(_p2, _q1, _q2):
+            return True
+
+        return False
+
+    # For collinear points p, q and r, checks whether q lies on segment pr
+    @staticmethod
+    def onSegment(_p, _q, _r):
+        return (min(_p.x, _r.x) <= _q.x <= max(_p.x, _r.x) and
+                min(_p.y, _r.y) <= _q.y <= max(_p.y, _r.y))
+
+    @staticmethod
+    def sign(_num):
+        if _num > 0:
+            return 1
+        if _num < 0:
+            return -1
+        return 0
+
+    # Checks whether a polygon diagonal intersects any polygon segment
+    @staticmethod
+    def intersectsPolygon(_a, _b):
+        p = _a
+        while True:
+            if (p.i != _a.i and p.next.i != _a.i and p.i != _b.i and
+                    p.next.i != _b.i and Earcut.intersects(p, p.next, _a, _b)):
+                return True
+            p = p.next
+            if p is _a:
+                break
+
+        return False
+
+    # Checks whether a polygon diagonal is locally inside the polygon
+    @staticmethod
+    def locallyInside(_a, _b):
+        if Earcut.area(_a.prev, _a, _a.next) < 0:
+            return Earcut.area(_a, _b, _a.next) >= 0 and Earcut.area(_a, _a.prev, _b) >= 0
+
+        return Earcut.area(_a, _b, _a.prev) < 0 or Earcut.area(_a, _a.next, _b) < 0
+
+    # Checks whether the middle point of a polygon diagonal is inside the
+    # polygon
+    @staticmethod
+    def middleInside(_a, _b):
+        p = _a
+        inside = False
+        px = (_a.x + _b.x) / 2
+        py = (_a.y + _b.y) / 2
+
+        while True:
+            if (((p.y > py) != (p.next.y > py)) and p.next.y != p.y and
+                    (px < (p.next.x - p.x) * (py - p.y) / (p.next.y - p.y) + p.x)):
+                inside = not inside
+            p = p.next
+            if p is _a:
+                break
+
+        return inside
+
+    # Links two polygon vertices with a bridge. If the vertices belong to
+    # the same ring, it splits the polygon into two; if one belongs to the
+    # outer ring and another to a hole, it merges them into a single ring
+    @staticmethod
+    def splitPolygon(_a, _b):
+        a2 = EarcutNode(_a.i, _a.x, _a.y)
+        b2 = EarcutNode(_b.i, _b.x, _b.y)
+        an = _a.next
+        bp = _b.prev
+
+        _a.next = _b
+        _b.prev = _a
+
+        a2.next = an
+        an.prev = a2
+
+        b2.next = a2
+        a2.prev = b2
+
+        bp.next = b2
+        b2.prev = bp
+
+        return b2
+
+    # Creates a node and links it with the previous one in a circular
+    # doubly linked list
+    @staticmethod
+    def insertNode(_i, _x, _y, _last):
+        p = EarcutNode(_i, _x, _y)
+
+        if _last is None:
+            p.prev = p
+            p.next = p
+        else:
+            p.next = _last.next
+            p.prev = _last
+            _last.next.prev = p
+            _last.next = p
+
+        return p
+
+    @staticmethod
+    def removeNode(_p):
+        _p.next.prev = _p.prev
+        _p.prev.next = _p.next
+
+        if _p.prevZ is not None:
+            _p.prevZ.nextZ = _p.nextZ
+
+        if _p.nextZ is not None:
+            _p.nextZ.prevZ = _p.prevZ
+
+    # Twice the signed area of a ring, which is positive for
+    # counter-clockwise rings
+    @staticmethod
+    def signedArea(_coords, _start, _end):
+        total = 0.0
+        j = _end - 1
+        for i in range(_start, _end):
+            total += (_coords[2*j] - _coords[2*i]) * (_coords[2*i+1] + _coords[2*j+1])
+            j = i
+
+        return total
@@ -0,0 +1,84 @@
+# Bounding-box hierarchy over the line segments of a polyline.
+# Consecutive line segments are grouped in leaves of LEAF_SIZE segments and
+# the boxes of each level are merged two by two up to a single root box, so
+# that the tree is built in linear time. Since consecutive line segments are
+# close to each other, the boxes of the upper levels remain tight.
+class SegmentTree:
+
+    LEAF_SIZE = 8  # number of line segments in each leaf
+
+    def __init__(self, _pts):
+        self.nSegs = max(len(_pts) - 1, 0)
+        self.levels = []  # boxes [xmin, xmax, ymin, ymax] of each level
+
+        leaves = []
+        for first in range(0, self.nSegs, SegmentTree.LEAF_SIZE):
+            last = min(first + SegmentTree.LEAF_SIZE, self.nSegs)
+            xs = [pt.getX() for pt in _pts[first:last+1]]
+            ys = [pt.getY() for pt in _pts[first:last+1]]
+            leaves.append([min(xs), max(xs), min(ys), max(ys)])
+
+        if len(leaves) == 0:
+            return
+
+        self.levels.append(leaves)
+        while len(self.levels[-1]) > 1:
+            children = self.levels[-1]
+            parents = []
+            for k in range(0, len(children), 2):
+                box = children[k]
+                if k + 1 < len(children):
+                    other = children[k + 1]
+                    box = [min(box[0], other[0]), max(box[1], other[1]),
+                           min(box[2], other[2]), max(box[3], other[3])]
+                parents.append(box)
+            self.levels.append(parents)
+
+    def getBoundBox(self):
+        if len(self.levels) == 0:
+            return None
+
+        box = self.levels[-1][0]
+        return box[0], box[1], box[2], box[3]
+
+    # Returns, for each line segment of this tree, the sorted list of line
+    # segments of the other tree that lie in leaves whose boxes overlap its
+    # leaf (with the given tolerance). Pairs of line segments that are not
+    # returned are farther apart than the tolerance.
+    def overlappingSegments(self, _other, _tol):
+        pairs = {}
+
+        if len(self.levels) == 0 or len(_other.levels) == 0:
+            return pairs
+
+        stack = [(len(self.levels) - 1, 0, len(_other.levels) - 1, 0)]
+        while len(stack) > 0:
+            l1, k1, l2, k2 = stack.pop()
+            box1 = self.levels[l1][k1]
+            box2 = _other.levels[l2][k2]
+
+            if box1[1] + _tol < box2[0] or box2[1] < box1[0] - _tol:
+                continue
+            if box1[3] + _tol < box2[2] or box2[3] < box1[2] - _tol:
+                continue
+
+            if l1 == 0 and l2 == 0:
+                segs2 = range(k2*SegmentTree.LEAF_SIZE,
+                              min((k2 + 1)*SegmentTree.LEAF_SIZE, _other.nSegs))
+                for i in range(k1*SegmentTree.LEAF_SIZE,
+                               min((k1 + 1)*SegmentTree.LEAF_SIZE, self.nSegs)):
+                    pairs.setdefault(i, []).extend(segs2)
+            elif l1 >= l2:
+                # descends the tree whose node is at the higher level
+                for k in (2*k1, 2*k1 + 1):
+                    if k < len(self.levels[l1 - 1]):
+                        stack.append((l1 - 1, k, l2, k2))
+            else:
+                for k in (2*k2, 2*k2 + 1):
+                    if k < len(_other.levels[l2 - 1]):
+                        stack.append((l1, k1, l2 - 1, k))
+
+        for segs in pairs.values():
+            segs.sort()
+
+        return pairs
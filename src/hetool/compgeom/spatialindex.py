@@ -0,0 +1,181 @@
+import math
+
+
+# Dynamic spatial index of axis-aligned bounding boxes based on a uniform grid.
+# Each item is stored in every grid cell covered by its bounding box, so that
+# window queries only visit the cells that overlap the given window. The cell
+# size is tuned from the stored boxes and the grid is rebuilt whenever the
+# number of items doubles (or shrinks to a quarter), which keeps insertions and
+# removals in amortized constant time.
+# Items are returned in insertion order, which is the same order of the lists
+# kept by the model.
+class SpatialIndex:
+
+    MAX_CELLS = 64  # items covering more cells than this are stored apart
+    MIN_ITEMS = 16  # number of items below which the grid is not re-tuned
+
+    def __init__(self):
+        self.cellSize = None
+        self.cells = {}
+        self.items = {}  # item -> [xmin, xmax, ymin, ymax, insertion order]
+        self.largeItems = {}
+        self.tunedFor = 0
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, _item):
+        return _item in self.items
+
+    def clear(self):
+        self.cellSize = None
+        self.cells = {}
+        self.items = {}
+        self.largeItems = {}
+        self.tunedFor = 0
+        self.counter = 0
+
+    def insert(self, _item, _xmin, _xmax, _ymin, _ymax):
+        if _item in self.items:
+            self.remove(_item)
+
+        self.counter += 1
+        box = [_xmin, _xmax, _ymin, _ymax, self.counter]
+        self.items[_item] = box
+
+        if self.cellSize is None or len(self.items) > 2*self.tunedFor:
+            self.rebuild()
+        else:
+            self.insertInCells(_item, box)
+
+    def remove(self, _item):
+        box = self.items.pop(_item, None)
+        if box is None:
+            return
+
+        if _item in self.largeItems:
+            del self.largeItems[_item]
+        else:
+            i0, i1, j0, j1 = self.cellRange(box[0], box[1], box[2], box[3])
+            for i in range(i0, i1+1):
+                for j in range(j0, j1+1):
+                    cell = self.cells[(i, j)]
+                    del cell[_item]
+                    if len(cell) == 0:
+                        del self.cells[(i, j)]
+
+        if self.tunedFor > SpatialIndex.MIN_ITEMS and len(self.items) < self.tunedFor/4:
+            self.rebuild()
+
+    def getBox(self, _item):
+        box = self.items[_item]
+        return box[0], box[1], box[2], box[3]
+
+    # Returns the bounding box of all stored boxes, or None if there are none
+    def getBoundBox(self):
+        if len(self.items) == 0:
+            return None
+
+        xmin = ymin = math.inf
+        xmax = ymax = -math.inf
+        for box in self.items.values():
+            xmin = min(xmin, box[0])
+            xmax = max(xmax, box[1])
+            ymin = min(ymin, box[2])
+            ymax = max(ymax, box[3])
+
+        return xmin, xmax, ymin, ymax
+
+    # Returns the items whose bounding boxes overlap the given window
+    # (boundaries included), in insertion order.
+    def query(self, _xmin, _xmax, _ymin, _ymax):
+        if len(self.items) == 0:
+            return []
+
+        i0, i1, j0, j1 = self.cellRange(_xmin, _xmax, _ymin, _ymax)
+
+        # when the window covers more cells than there are occupied ones,
+        # it is cheaper to test every stored box
+        if (i1-i0+1)*(j1-j0+1) > len(self.cells):
+            found = []
+            for item, box in self.items.items():
+                if not (box[1] < _xmin or box[0] > _xmax or
+                        box[3] < _ymin or box[2] > _ymax):
+                    found.append(item)
+            return found
+
+        found = {}
+        for i in range(i0, i1+1):
+            for j in range(j0, j1+1):
+                cell = self.cells.get((i, j))
+                if cell is None:
+                    continue
+
+                for item, box in cell.items():
+                    if item in found:
+                        continue
+                    if not (box[1] < _xmin or box[0] > _xmax or
+                            box[3] < _ymin or box[2] > _ymax):
+                        found[item] = box[4]
+
+        for item, box in self.largeItems.items():
+            if not (box[1] < _xmin or box[0] > _xmax or
+                    box[3] < _ymin or box[2] > _ymax):
+                found[item] = box[4]
+
+        return sorted(found, key=found.get)
+
+    def cellRange(self, _xmin, _xmax, _ymin, _ymax):
+        size = self.cellSize
+        return (math.floor(_xmin/size), math.floor(_xmax/size),
+                math.floor(_ymin/size), math.floor(_ymax/size))
+
+    def insertInCells(self, _item, _box):
+        i0, i1, j0, j1 = self.cellRange(_box[0], _box[1], _box[2], _box[3])
+
+        if (i1-i0+1)*(j1-j0+1) > SpatialIndex.MAX_CELLS:
+            self.largeItems[_item] = _box
+            return
+
+        for i in range(i0, i1+1):
+            for j in range(j0, j1+1):
+                cell = self.cells.get((i, j))
+                if cell is None:
+                    cell = {}
+                    self.cells[(i, j)] = cell
+                cell[_item] = _box
+
+    # Chooses a new cell size from the stored boxes and redistributes them.
+    # The cell size is the largest between the mean box extent and the size
+    # of a square cell that would hold one item if they were evenly spread
+    # over the region that contains them.
+    def rebuild(self):
+        n = len(self.items)
+        xmin = ymin = math.inf
+        xmax = ymax = -math.inf
+        extent = 0.0
+
+        for box in self.items.values():
+            xmin = min(xmin, box[0])
+            xmax = max(xmax, box[1])
+            ymin = min(ymin, box[2])
+            ymax = max(ymax, box[3])
+            extent += max(box[1]-box[0], box[3]-box[2])
+
+        size = 0.0
+        if n > 0:
+            size = max(extent/n, math.sqrt((xmax-xmin)*(ymax-ymin)/n))
+            if size == 0.0:
+                size = max(xmax-xmin, ymax-ymin)/n
+
+        if size == 0.0 or not math.isfinite(size):
+            size = 1.0
+
+        self.cellSize = size
+        self.tunedFor = max(n, SpatialIndex.MIN_ITEMS)
+        self.cells = {}
+        self.largeItems = {}
+
+        for item, box in self.items.items():
+            self.insertInCells(item, box)
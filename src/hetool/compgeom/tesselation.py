@@ -1,4 +1,5 @@
 from hetool.compgeom.compgeom import CompGeom
+from hetool.compgeom.earcut import Earcut
 from hetool.geometry.point import Point
 
 
@@ -85,19 +86,45 @@ class Tesselation:
                 return False
         return True
 
+    # Returns the triangles of the polygon with the given boundary points and
+    # holes as an array of point indices, three per triangle. The indices
+    # refer to the boundary points followed by the points of each hole.
     @staticmethod
-    def tessellate(_pts):
-        indices = Tesselation.triangleParing(_pts)
+    def triangulate(_pts, _holes=None):
+        coords = []
+        holeIndices = []
+
+        for pt in _pts:
+            coords.append(pt.getX())
+            coords.append(pt.getY())
+
+        if _holes is not None:
+            for hole in _holes:
+                holeIndices.append(len(coords) // 2)
+                for pt in hole:
+                    coords.append(pt.getX())
+                    coords.append(pt.getY())
+
+        return Earcut.triangulate(coords, holeIndices)
+
+    @staticmethod
+    def tessellate(_pts, _holes=None):
+        pts = list(_pts)
+        if _holes is not None:
+            for hole in _holes:
+                pts.extend(hole)
+
+        indices = Tesselation.triangulate(_pts, _holes)
         triangs = []
 
-        for j in range(0, len(indices)):
+        for j in range(0, len(indices), 3):
             triangle = []
-            triangle.append(Point(_pts[indices[j][0]].getX(),
-                                  _pts[indices[j][0]].getY()))
-            triangle.append(Point(_pts[indices[j][1]].getX(),
-                                  _pts[indices[j][1]].getY()))
-            triangle.append(Point(_pts[indices[j][2]].getX(),
-                                  _pts[indices[j][2]].getY()))
+            triangle.append(Point(pts[indices[j]].getX(),
+                                  pts[indices[j]].getY()))
+            triangle.append(Point(pts[indices[j+1]].getX(),
+                                  pts[indices[j+1]].getY()))
+            triangle.append(Point(pts[indices[j+2]].getX(),
+                                  pts[indices[j+2]].getY()))
             triangs.append(triangle)
 
         return triangs
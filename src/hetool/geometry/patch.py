@@ -1,9 +1,12 @@
 from hetool.geometry.point import Point
 from hetool.compgeom.tesselation import Tesselation
-from hetool.compgeom.compgeom import CompGeom
 
 
 class Patch:
+    __slots__ = ('pts', 'segments', 'segmentOrients', 'mesh', 'selected', 'selection',
+                 'holes', 'holesOrients', 'internalSegments', 'internalSegmentsOrients',
+                 'isDeleted', 'face', 'attributes', 'triangPts', 'triangIndices',
+                 'triangs', 'moments', 'perimeter', 'boundBox')
 
     def __init__(self):
         self.pts = []  # boundary points
@@ -12,6 +15,7 @@ class Patch:
         self.segmentOrients = []
         self.mesh = None
         self.selected = False
+        self.selection = None  # selected patches of the model that contains it
         self.holes = []  # vector of region holes
         self.holesOrients = []
         self.internalSegments = []
@@ -19,6 +23,12 @@ class Patch:
         self.isDeleted = False
         self.face = None
         self.attributes = []
+        self.triangPts = None  # boundary points followed by the hole points
+        self.triangIndices = None  # point indices of the triangles
+        self.triangs = None  # triangles given by their points
+        self.moments = None  # area, first and second moments of area
+        self.perimeter = None
+        self.boundBox = None  # bounding box of the boundary points
 
     def __del__(self):
         if self.mesh:
@@ -36,6 +46,12 @@ class Patch:
     def setSelected(self, _select):
         self.selected = _select
 
+        if self.selection is not None:
+            if _select:
+                self.selection.append(self)
+            else:
+                self.selection.discard(self)
+
     def isSelected(self):
         return self.selected
 
@@ -45,8 +61,13 @@ class Patch:
     def getMesh(self):
         return self.mesh
 
+    # Returns the bounding box of the boundary points, which is kept until
+    # the boundary changes
     def getBoundBox(self):
 
+        if self.boundBox is not None:
+            return self.boundBox
+
         if len(self.pts) == 0:
             return
 
@@ -64,22 +85,100 @@ class Patch:
             ymin = min(ymin, self.pts[j].getY())
             ymax = max(ymax, self.pts[j].getY())
 
-        return xmin, xmax, ymin, ymax
+        self.boundBox = (xmin, xmax, ymin, ymax)
+        return self.boundBox
 
     def setBoundary(self, _boundarysegments, _isOriented):
         self.segments = _boundarysegments.copy()
         self.segmentOrients = _isOriented.copy()
-        self.pts = self.boundaryPolygon()
+        pts = self.boundaryPolygon()
+
+        if self.hasGeometryCache() and not Patch.samePolygon(self.pts, pts):
+            self.clearGeometryCache()
+
+        self.pts = pts
+        self.boundBox = None
 
     def setHoles(self, _holessegments, _isOriented):
+        oldHoles = None
+        if self.hasGeometryCache():
+            oldHoles = self.boundaryHole()
+
         self.holes = _holessegments
         self.holesOrients = _isOriented
 
+        if oldHoles is not None:
+            newHoles = self.boundaryHole()
+            if len(oldHoles) != len(newHoles):
+                self.clearGeometryCache()
+            else:
+                for i in range(0, len(newHoles)):
+                    if not Patch.samePolygon(oldHoles[i], newHoles[i]):
+                        self.clearGeometryCache()
+                        break
+
+    # Checks whether two polygons have the same points in the same order
+    @staticmethod
+    def samePolygon(_pts1, _pts2):
+        if len(_pts1) != len(_pts2):
+            return False
+
+        for i in range(0, len(_pts1)):
+            if _pts1[i].getX() != _pts2[i].getX() or \
+                    _pts1[i].getY() != _pts2[i].getY():
+                return False
+
+        return True
+
+    def hasGeometryCache(self):
+        return self.triangPts is not None or self.moments is not None
+
+    def clearGeometryCache(self):
+        self.triangPts = None
+        self.triangIndices = None
+        self.triangs = None
+        self.moments = None
+        self.perimeter = None
+
+    # Returns the triangulation of the patch region, which excludes its holes,
+    # as the list of boundary and hole points and the array of point indices
+    # of the triangles (three per triangle). It is computed on first use and
+    # kept until the boundary or the holes of the patch change.
+    def getTriangulation(self):
+        if self.triangPts is None:
+            holes = self.boundaryHole()
+            self.triangIndices = Tesselation.triangulate(self.pts, holes)
+            self.triangPts = list(self.pts)
+            for hole in holes:
+                self.triangPts.extend(hole)
+
+        return self.triangPts, self.triangIndices
+
+    # Returns the triangles of the patch region, each one given by a list of
+    # three points. The points are shared with the patch boundary and holes.
+    def tessellate(self):
+        if self.triangs is None:
+            pts, indices = self.getTriangulation()
+            self.triangs = []
+            for j in range(0, len(indices), 3):
+                self.triangs.append(
+                    [pts[indices[j]], pts[indices[j+1]], pts[indices[j+2]]])
+
+        return self.triangs
+
     def setInternalSegments(self, _internalSegments, _isOriented):
         self.internalSegments = _internalSegments
         self.internalSegmentsOrients = _isOriented
 
     def isPointInside(self, _pt):
+        # points outside the bounding box are discarded without ray casting
+        bound_box = self.getBoundBox()
+        if bound_box is not None:
+            x = _pt.getX()
+            y = _pt.getY()
+            if x < bound_box[0] or x > bound_box[1] or y < bound_box[2] or y > bound_box[3]:
+                return False
+
         numIntersec = 0
         for i in range(0, len(self.segments)):
             numIntersec += self.segments[i].ray(_pt)
@@ -148,31 +247,56 @@ class Patch:
 
         return polygons
 
+    # Computes the area, the first and second moments of area (about the
+    # origin) and the perimeter of the patch region from the boundary
+    # integrals of the segments of its boundary and holes. Since the holes
+    # are traversed clockwise, their contributions are subtracted.
+    def updateMoments(self):
+        moments = [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+        perimeter = 0.0
+
+        loops = [(self.segments, self.segmentOrients)]
+        for i in range(0, len(self.holes)):
+            loops.append((self.holes[i], self.holesOrients[i]))
+
+        for segments, orients in loops:
+            for i in range(0, len(segments)):
+                segMoments = segments[i].boundMoments()
+                sign = 1.0 if orients[i] else -1.0
+                for k in range(0, 6):
+                    moments[k] += sign*segMoments[k]
+                perimeter += segments[i].length(0, 1)
+
+        self.moments = moments
+        self.perimeter = perimeter
+
+    # Returns the area, the first moments of area (integrals of y and x) and
+    # the second moments of area (integrals of y*y, x*x and x*y) about the
+    # origin. They are kept until the boundary or the holes of the patch change.
+    def getMoments(self):
+        if self.moments is None:
+            self.updateMoments()
+
+        return tuple(self.moments)
+
     def Area(self):
-        Area = 0
-        pts = self.pts
-        triangs = Tesselation.triangleParing(pts)
-        for j in range(0, len(triangs)):
-            a = Point(pts[triangs[j][0]].getX(),
-                      pts[triangs[j][0]].getY())
-            b = Point(pts[triangs[j][1]].getX(),
-                      pts[triangs[j][1]].getY())
-            c = Point(pts[triangs[j][2]].getX(),
-                      pts[triangs[j][2]].getY())
-
-            Area += (a.getX()*b.getY() - a.getY()*b.getX()
-                     + a.getY()*c.getX() - a.getX()*c.getY()
-                     + b.getX()*c.getY() - c.getX()*b.getY()) / 2.0
-
-        internalFaces = self.face.internalFaces()
-        if len(internalFaces) > 0:
-            for face in internalFaces:
-                Area -= face.patch.Area()
-                adjacentFaces = face.adjacentFaces()
-                for adjface in adjacentFaces:
-                    if adjface not in internalFaces and adjface != self.face:
-                        pts = adjface.patch.getPoints()
-                        if CompGeom.isPointInPolygon(self.pts, pts[0]):
-                            Area -= adjface.patch.Area()
-
-        return Area
+        return self.getMoments()[0]
+
+    # Returns the total length of the boundary and the holes of the patch
+    def getPerimeter(self):
+        if self.perimeter is None:
+            self.updateMoments()
+
+        return self.perimeter
+
+    def getCentroid(self):
+        area, qx, qy, ixx, iyy, ixy = self.getMoments()
+        return Point(qy/area, qx/area)
+
+    # Returns the second moments of area about the axes through the centroid
+    # that are parallel to the x and y axes
+    def getCentroidalMoments(self):
+        area, qx, qy, ixx, iyy, ixy = self.getMoments()
+        cx = qy/area
+        cy = qx/area
+        return ixx - area*cy*cy, iyy - area*cx*cx, ixy - area*cx*cy
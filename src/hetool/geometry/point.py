@@ -2,11 +2,13 @@ import math
 
 
 class Point():
+    __slots__ = ('x', 'y', 'selected', 'selection', 'vertex', 'attributes')
 
     def __init__(self, _x=None, _y=None):
         self.x = _x
         self.y = _y
         self.selected = False
+        self.selection = None  # selected points of the model that contains it
         self.vertex = None
         self.attributes = []
 
@@ -29,6 +31,12 @@ class Point():
     def setSelected(self, _select):
         self.selected = _select
 
+        if self.selection is not None:
+            if _select:
+                self.selection.append(self)
+            else:
+                self.selection.discard(self)
+
     def isSelected(self):
         return self.selected
 
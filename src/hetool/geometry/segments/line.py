@@ -5,8 +5,10 @@ import math
 
 
 class Line(Segment):
+    __slots__ = ('pt1', 'pt2', 'nPts', 'edge', 'attributes')
 
     def __init__(self, _pt1=None, _pt2=None):
+        Segment.__init__(self)
         self.pt1 = _pt1
         self.pt2 = _pt2
         self.nPts = 0
@@ -125,6 +127,9 @@ class Line(Segment):
     def getYend(self):
         return self.pt2.getY()
 
+    def boundMoments(self):
+        return CompGeom.boundMoments([self.pt1, self.pt2])
+
     def boundIntegral(self):
         return (self.pt1.getX()*self.pt2.getY() - self.pt2.getX()*self.pt1.getY())*0.5
 
@@ -203,7 +208,8 @@ class Line(Segment):
             return CompGeom.computeLineIntersection(self.pt1, self.pt2, poly[0], poly[1])
         elif _segment.getType() == 'POLYLINE':
             pts = self.getPoints()
-            return CompGeom.computePolyPolyIntersection(pts, poly)
+            return CompGeom.computePolyPolyIntersection(
+                pts, poly, None, _segment.getSegmentTree())
 
     def isEqual(self, _segment, _tol):
 
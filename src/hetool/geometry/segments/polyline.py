@@ -2,21 +2,82 @@ from hetool.geometry.point import Point
 from hetool.geometry.segments.segment import Segment
 from hetool.geometry.segments.line import Line
 from hetool.compgeom.compgeom import CompGeom
+from hetool.compgeom.segmenttree import SegmentTree
 import math
+import bisect
 
 
 class Polyline(Segment):
+    __slots__ = ('pts', 'nPts', 'edge', 'attributes', 'segLengths', 'arcLengths',
+                 'segmentTree', 'boundBox')
+
     def __init__(self, _pts=None):
+        Segment.__init__(self)
         self.pts = _pts
         if self.pts is None:
             self.pts = []
         self.nPts = 0
         self.edge = None
         self.attributes = []
+        self.segLengths = None  # lengths of the line segments
+        self.arcLengths = None  # cumulative lengths at each point
+        self.segmentTree = None  # bounding-box tree of the line segments
+        self.boundBox = None
 
     def addPoint(self, _x, _y):
         self.pts.append(Point(_x, _y))
         self.nPts += 1
+        self.arcLengths = None
+        self.segmentTree = None
+        self.boundBox = None
+
+    # Computes the lengths of the line segments and the cumulative arc-length
+    # at each point. They are kept until the points of the polyline change.
+    def updateArcLengths(self):
+        pts = self.pts
+        self.segLengths = []
+        self.arcLengths = [0.0]
+        L = 0.0
+
+        for i in range(1, len(pts)):
+            d = math.sqrt((pts[i].getX()-pts[i-1].getX())*(pts[i].getX()-pts[i-1].getX()) + (
+                pts[i].getY()-pts[i-1].getY()) * (pts[i].getY()-pts[i-1].getY()))
+            L += d
+            self.segLengths.append(d)
+            self.arcLengths.append(L)
+
+    def getArcLengths(self):
+        if self.arcLengths is None:
+            self.updateArcLengths()
+
+        return self.arcLengths
+
+    # Returns the bounding-box tree of the line segments, which is built on
+    # first use and kept until the points of the polyline change
+    def getSegmentTree(self):
+        if self.segmentTree is None:
+            self.segmentTree = SegmentTree(self.pts)
+
+        return self.segmentTree
+
+    # Returns the indices of the points of the line segment that contains the
+    # given arc-length, and the local parameter on that line segment
+    def locateArcLength(self, _s):
+        arcLengths = self.getArcLengths()
+        n = len(arcLengths)
+
+        if n < 2:
+            return 0, 0, 1.0
+
+        # first point whose cumulative length reaches the given one
+        next_id = bisect.bisect_left(arcLengths, _s, 1)
+        if next_id == n:
+            return n - 2, n - 1, 1.0
+
+        prev_id = next_id - 1
+        loc_t = (_s - arcLengths[prev_id]) / self.segLengths[prev_id]
+
+        return prev_id, next_id, loc_t
 
     def getNumberOfPoints(self):
         return self.nPts
@@ -29,26 +90,8 @@ class Polyline(Segment):
         if _t >= 1.0:
             return Point(self.pts[-1].getX(), self.pts[-1].getY())
 
-        length = self.length(0, 1)
-        s = _t*length
-        loc_t = 1.0
-        prev_id = 0
-        next_id = 0
-        length = 0
-
-        for i in range(1, len(self.pts)):
-            prev_id = i - 1
-            next_id = i
-            dist = math.sqrt((self.pts[i].getX() - self.pts[i - 1].getX()) *
-                             (self.pts[i].getX() - self.pts[i - 1].getX()) +
-                             (self.pts[i].getY() - self.pts[i - 1].getY()) *
-                             (self.pts[i].getY() - self.pts[i - 1].getY()))
-
-            if (length + dist) >= s:
-                loc_t = (s - length) / dist
-                break
-
-            length += dist
+        s = _t*self.length(0, 1)
+        prev_id, next_id, loc_t = self.locateArcLength(s)
 
         x = self.pts[prev_id].getX() + loc_t * \
             (self.pts[next_id].getX() - self.pts[prev_id].getX())
@@ -79,9 +122,15 @@ class Polyline(Segment):
 
     def setInitPoint(self, _pt):
         self.pts[0] = _pt
+        self.arcLengths = None
+        self.segmentTree = None
+        self.boundBox = None
 
     def setEndPoint(self, _pt):
         self.pts[-1] = _pt
+        self.arcLengths = None
+        self.segmentTree = None
+        self.boundBox = None
 
     def closestPoint(self, _x, _y):
 
@@ -103,19 +152,14 @@ class Polyline(Segment):
 
         return xOn, yOn, dmin
 
+    # The bounding box is kept until the points of the polyline change
     def getBoundBox(self):
-        x = []
-        y = []
-        for point in self.pts:
-            x.append(point.getX())
-            y.append(point.getY())
+        if self.boundBox is None:
+            x = [point.getX() for point in self.pts]
+            y = [point.getY() for point in self.pts]
+            self.boundBox = (min(x), max(x), min(y), max(y))
 
-        xmin = min(x)
-        xmax = max(x)
-        ymin = min(y)
-        ymax = max(y)
-
-        return xmin, xmax, ymin, ymax
+        return self.boundBox
 
     def getType(self):
         return 'POLYLINE'
@@ -135,6 +179,9 @@ class Polyline(Segment):
     def getYend(self):
         return self.pts[-1].getY()
 
+    def boundMoments(self):
+        return CompGeom.boundMoments(self.pts)
+
     def boundIntegral(self):
         area = 0
 
@@ -160,31 +207,8 @@ class Polyline(Segment):
             tan = Point.normalize(tan)
             return tan
 
-        length = 0.0
-
-        for j in range(1, len(self.pts)):
-            length += math.sqrt((self.pts[j].getX()-self.pts[j-1].getX())
-                                * (self.pts[j].getX()-self.pts[j-1].getX()) +
-                                (self.pts[j].getY()-self.pts[j-1].getY()) *
-                                (self.pts[j].getY()-self.pts[j-1].getY()))
-
-        s = _t*length
-        prev_id = 0
-        next_id = 0
-
-        for i in range(1, len(self.pts)):
-            prev_id = i - 1
-            next_id = i
-
-            d = math.sqrt((self.pts[i].getX()-self.pts[i-1].getX())
-                          * (self.pts[i].getX()-self.pts[i-1].getX()) +
-                          (self.pts[i].getY()-self.pts[i-1].getY()) *
-                          (self.pts[i].getY()-self.pts[i-1].getY()))
-
-            if length + d >= s:
-                break
-
-            length += d
+        s = _t*self.length(0, 1)
+        prev_id, next_id, loc_t = self.locateArcLength(s)
 
         tan = self.pts[next_id] - self.pts[prev_id]
         tan = Point.normalize(tan)
@@ -192,20 +216,16 @@ class Polyline(Segment):
         return tan
 
     def selfIntersect(self):
-        flag, pts, params = CompGeom.splitSelfIntersected(self.getPoints())
+        flag, pts, params = CompGeom.splitSelfIntersected(
+            self.getPoints(), self.getSegmentTree())
         return flag, pts, params
 
     def clone(self):
-        myClone = Polyline(self.pts)
+        myClone = Polyline(list(self.pts))
         return myClone
 
     def length(self, _t0, _t1):
-        L = 0.0
-        pts = self.getPoints()
-        for i in range(1, len(pts)):
-            L += math.sqrt((pts[i].getX()-pts[i-1].getX())*(pts[i].getX()-pts[i-1].getX()) + (
-                pts[i].getY()-pts[i-1].getY()) * (pts[i].getY()-pts[i-1].getY()))
-
+        L = self.getArcLengths()[-1]
         return L*(_t1-_t0)
 
     def splitSegment(self, _t, _pt):
@@ -219,23 +239,9 @@ class Polyline(Segment):
             _segment2 = None
             return _segment1, _segment2
 
-        L = self.length(0, 1)
-        s = _t*L
-        loc_t = 1.0
-        prev_id = 0
-        next_id = 0
-        L = 0.0
+        s = _t*self.length(0, 1)
+        prev_id, next_id, loc_t = self.locateArcLength(s)
         pts = self.getPoints()
-        for j in range(1, len(pts)):
-            prev_id = j - 1
-            next_id = j
-            d = math.sqrt((pts[j].getX()-pts[j-1].getX())*(pts[j].getX()-pts[j-1].getX()) + (
-                pts[j].getY()-pts[j-1].getY()) * (pts[j].getY()-pts[j-1].getY()))
-
-            if (L+d) >= s:
-                loc_t = (s-L)/d
-                break
-            L += d
 
         segment1_pts = []
         segment2_pts = []
@@ -376,8 +382,8 @@ class Polyline(Segment):
 
     def intersectPoint(self, _pt, _tol):
 
-        partialLength = 0
-        totalLength = self.length(0, 1)
+        arcLengths = self.getArcLengths()
+        totalLength = arcLengths[-1]
         interStatus = False
         param = None
 
@@ -389,19 +395,14 @@ class Polyline(Segment):
             p2 = Point(self.pts[i].getX(), self.pts[i].getY())
 
             dist, pi, t = CompGeom.getClosestPointSegment(p1, p2, _pt)
-            length = math.sqrt(((self.pts[i].getX() - self.pts[i-1].getX()) *
-                                (self.pts[i].getX() - self.pts[i-1].getX())) +
-                               ((self.pts[i].getY() - self.pts[i-1].getY()) *
-                                (self.pts[i].getY() - self.pts[i-1].getY())))
+            length = self.segLengths[i-1]
 
             # skip init intersections at each segment (no repeated intersections)
             if dist <= _tol and t*length > _tol:
-                param = ((partialLength + t*length) / totalLength)
+                param = ((arcLengths[i-1] + t*length) / totalLength)
                 interStatus = True
                 break
 
-            partialLength += length
-
         return interStatus, param, pi
 
     def intersectSegment(self, _segment):
@@ -411,9 +412,14 @@ class Polyline(Segment):
         param2 = []
         pts = []
 
-        if _segment.getType() == 'LINE' or _segment.getType() == 'POLYLINE':
+        if _segment.getType() == 'LINE':
+            poly = _segment.getPoints()
+            return CompGeom.computePolyPolyIntersection(
+                self.pts, poly, self.getSegmentTree())
+        elif _segment.getType() == 'POLYLINE':
             poly = _segment.getPoints()
-            return CompGeom.computePolyPolyIntersection(self.pts, poly)
+            return CompGeom.computePolyPolyIntersection(
+                self.pts, poly, self.getSegmentTree(), _segment.getSegmentTree())
         else:
             # for each segment, create a line and intersect each line with the given segment
             totalLength = 0.0
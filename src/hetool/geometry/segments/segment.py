@@ -1,7 +1,11 @@
 class Segment:
-    selected = False
+    __slots__ = ('selected', 'selection', 'nsudv')
     PARAM_TOL = 1e-7
-    nsudv = None
+
+    def __init__(self):
+        self.selected = False
+        self.selection = None  # selected segments of the model that contains it
+        self.nsudv = None
 
     def setNumberOfSubdivisions(self, _number):
         self.nsudv = _number
@@ -12,5 +16,11 @@ class Segment:
     def setSelected(self, _select):
         self.selected = _select
 
+        if self.selection is not None:
+            if _select:
+                self.selection.append(self)
+            else:
+                self.selection.discard(self)
+
     def isSelected(self):
         return self.selected
@@ -34,6 +34,9 @@ class MigrateLoops:
 
             out_loop.next = loop
 
+        self.origin.shell.setDirtyFace(self.origin)
+        self.destination.shell.setDirtyFace(self.destination)
+
     def unexecute(self):
         inverse = MigrateLoops(self.destination, self.origin, self.loops)
         inverse.execute()
@@ -65,6 +68,10 @@ class Flip:
         self.edge.he1 = self.edge.he2
         self.edge.he2 = temp
 
+        # the orientation of the edge on its faces has changed
+        for he in (self.edge.he1, self.edge.he2):
+            he.loop.face.shell.setDirtyFace(he.loop.face)
+
     def unexecute(self):
         self.execute()
 
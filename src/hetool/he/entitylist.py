@@ -0,0 +1,59 @@
+# Insertion-ordered collection of the entities of a model (vertices, edges,
+# faces, points and segments). It is used like a list, but the items are
+# stored in a dictionary keyed by their identities, so that removals and
+# membership tests take constant time while the iteration order stays the
+# order of insertion. The identity is used as the key because some entities
+# (e.g. points) compare equal by their coordinates.
+class EntityList:
+    __slots__ = ('items',)
+
+    def __init__(self, _items=()):
+        self.items = {}
+        for item in _items:
+            self.items[id(item)] = item
+
+    def append(self, _item):
+        self.items[id(_item)] = _item
+
+    def remove(self, _item):
+        if self.items.pop(id(_item), None) is None:
+            print('ERROR: entity not in the list')
+            raise ValueError
+
+    def discard(self, _item):
+        self.items.pop(id(_item), None)
+
+    def clear(self):
+        self.items.clear()
+
+    def copy(self):
+        return EntityList(self.items.values())
+
+    def first(self):
+        return next(iter(self.items.values()))
+
+    def last(self):
+        return next(reversed(self.items.values()))
+
+    def __contains__(self, _item):
+        return id(_item) in self.items
+
+    def __iter__(self):
+        return iter(self.items.values())
+
+    def __reversed__(self):
+        return reversed(self.items.values())
+
+    def __len__(self):
+        return len(self.items)
+
+    # Indexing is supported for compatibility with lists. The first and the
+    # last items are found directly; any other index (or slice) builds a list,
+    # so iterating is preferred over indexing in loops.
+    def __getitem__(self, _index):
+        if _index == 0 and len(self.items) > 0:
+            return self.first()
+        elif _index == -1 and len(self.items) > 0:
+            return self.last()
+
+        return list(self.items.values())[_index]
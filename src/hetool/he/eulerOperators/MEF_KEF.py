@@ -62,6 +62,9 @@ class MEF():
         nhe1.loop = newloop
         nhe2.loop.he = nhe2
 
+        self.face_on.shell.setDirtyFace(self.face_on)
+        self.face_on.shell.setDirtyFace(self.face)
+
     def unexecute(self):
 
         kef = KEF(self.edge, self.face)
@@ -136,6 +139,8 @@ class KEF():
         face_to_delete.delete()
         loop_to_delete.delete()
 
+        self.face_on.shell.setDirtyFace(self.face_on)
+
         if he1.prev.next != he1:
             del he1
         if he2.prev.next != he2:
@@ -53,6 +53,8 @@ class MEKR:
 
         l2.delete()
 
+        self.face_on.shell.setDirtyFace(self.face_on)
+
     def unexecute(self):
         kemr = KEMR(self.edge, self.edge.he1.vertex)
         kemr.execute()
@@ -134,6 +136,8 @@ class KEMR:
 
         self.edge.delete()
 
+        self.face_on.shell.setDirtyFace(self.face_on)
+
     def unexecute(self):
         mekr = MEKR(None, self.v_begin, self.v_end,
                     self.v_begin_next, self.v_end_next, self.face_on, self.edge)
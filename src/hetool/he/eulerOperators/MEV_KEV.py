@@ -31,6 +31,8 @@ class MEV:
         self.vertex.he = he.prev
         he.vertex.he = he
 
+        self.face_on.shell.setDirtyFace(self.face_on)
+
     def unexecute(self):
         kev = KEV(self.edge, self.vertex)
         kev.execute()
@@ -96,6 +98,8 @@ class KEV:
         self.vertex.delete()
         self.edge.delete()
 
+        self.face_on.shell.setDirtyFace(self.face_on)
+
     def unexecute(self):
 
         mev = MEV(None, None, self.v_begin, self.v_next,
@@ -42,6 +42,8 @@ class MVFS:
         he.prev = he
         he.next = he
 
+        shell.setDirtyFace(self.face)
+
     def unexecute(self):
         kvfs = KVFS(self.vertex, self.face)
         kvfs.execute()
@@ -28,6 +28,8 @@ class MVR:
         newhe.next = newhe
         self.vertex.he = newhe
 
+        self.face_on.shell.setDirtyFace(self.face_on)
+
     def unexecute(self):
         kvr = KVR(self.vertex, self.face_on)
         kvr.execute()
@@ -53,6 +55,8 @@ class KVR:
 
         del he
 
+        self.face_on.shell.setDirtyFace(self.face_on)
+
     def unexecute(self):
         mvr = MVR(None, self.face_on, self.vertex)
         mvr.execute()
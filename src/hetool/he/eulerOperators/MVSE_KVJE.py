@@ -39,6 +39,9 @@ class MVSE:
 
         self.split_edge.delete()
 
+        he1.loop.face.shell.setDirtyFace(he1.loop.face)
+        he2.loop.face.shell.setDirtyFace(he2.loop.face)
+
     def unexecute(self):
         kvje = KVJE(None, self.vertex, self.edge1, self.edge2, self.split_edge)
         kvje.execute()
@@ -104,6 +107,10 @@ class KVJE:
         self.vertex.delete()
         self.edge1.delete()
         self.edge2.delete()
+
+        old_he1.loop.face.shell.setDirtyFace(old_he1.loop.face)
+        old_he2.loop.face.shell.setDirtyFace(old_he2.loop.face)
+
         del he1
         del he2
 
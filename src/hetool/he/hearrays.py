@@ -0,0 +1,537 @@
+import numpy as np
+from hetool.geometry.patch import Patch
+from hetool.he.topologicalEntities.vertex import Vertex
+from hetool.he.topologicalEntities.edge import Edge
+from hetool.he.topologicalEntities.halfedge import HalfEdge
+from hetool.he.topologicalEntities.loop import Loop
+from hetool.he.topologicalEntities.face import Face
+from hetool.he.topologicalEntities.shell import Shell
+
+
+# Half-edge topology stored as a struct of arrays. Half-edges, edges, loops,
+# faces and vertices are integer indices into NumPy arrays, and -1 stands for
+# none. The geometry (points, segments and patches) is kept as the usual
+# objects, referred to by the vertex, edge and face indices.
+# Deleted entities are marked as not alive and their indices are reused by
+# the next entities of the same kind (free-lists), so that the indices of
+# the other entities do not change; compact() renumbers them contiguously.
+# Whole-model queries are vectorized over the arrays, and the entities can
+# also be visited through thin proxies with the attributes of the
+# topological entities (he.next, he.vertex, vertex.he, loop.face, ...).
+class HeArrays:
+
+    INITIAL_CAPACITY = 16
+
+    # arrays of each kind of entity and their initial values
+    FIELDS = {
+        'he': [('heNext', -1), ('hePrev', -1), ('heTwin', -1), ('heVertex', -1),
+               ('heEdge', -1), ('heLoop', -1)],
+        'edge': [('edgeHe', -1)],
+        'loop': [('loopHe', -1), ('loopFace', -1), ('loopNext', -1),
+                 ('loopClosed', 0)],
+        'face': [('faceLoop', -1)],
+        'vertex': [('vertexHe', -1)]
+    }
+
+    def __init__(self):
+        self.size = {}  # number of slots in use (alive or free) of each kind
+        self.free = {}  # free-list of each kind
+        self.alive = {}  # flags stating whether each slot is in use
+
+        for kind in HeArrays.FIELDS:
+            self.size[kind] = 0
+            self.free[kind] = []
+            self.alive[kind] = np.zeros(HeArrays.INITIAL_CAPACITY, dtype=bool)
+            for name, value in HeArrays.FIELDS[kind]:
+                setattr(self, name, np.full(HeArrays.INITIAL_CAPACITY, value,
+                                            dtype=np.int32))
+
+        self.vertexXY = np.zeros((HeArrays.INITIAL_CAPACITY, 2), dtype=float)
+        self.vertexPoint = []
+        self.edgeSegment = []
+        self.facePatch = []
+
+    # Returns a free index of the given kind of entity, growing its arrays
+    # when there is none
+    def allocate(self, _kind):
+        alive = self.alive[_kind]
+
+        if len(self.free[_kind]) > 0:
+            index = self.free[_kind].pop()
+        else:
+            index = self.size[_kind]
+            if index == len(alive):
+                self.grow(_kind, 2*len(alive))
+                alive = self.alive[_kind]
+            self.size[_kind] += 1
+
+            if _kind == 'vertex':
+                self.vertexPoint.append(None)
+            elif _kind == 'edge':
+                self.edgeSegment.append(None)
+            elif _kind == 'face':
+                self.facePatch.append(None)
+
+        alive[index] = True
+        return index
+
+    # Frees the index of an entity, which may be reused by allocate
+    def release(self, _kind, _index):
+        if not self.alive[_kind][_index]:
+            print('ERROR: entity already released')
+            raise ValueError
+
+        self.alive[_kind][_index] = False
+        for name, value in HeArrays.FIELDS[_kind]:
+            getattr(self, name)[_index] = value
+
+        if _kind == 'vertex':
+            self.vertexPoint[_index] = None
+        elif _kind == 'edge':
+            self.edgeSegment[_index] = None
+        elif _kind == 'face':
+            self.facePatch[_index] = None
+
+        self.free[_kind].append(_index)
+
+    def grow(self, _kind, _capacity):
+        old = len(self.alive[_kind])
+        alive = np.zeros(_capacity, dtype=bool)
+        alive[:old] = self.alive[_kind]
+        self.alive[_kind] = alive
+
+        for name, value in HeArrays.FIELDS[_kind]:
+            values = np.full(_capacity, value, dtype=np.int32)
+            values[:old] = getattr(self, name)
+            setattr(self, name, values)
+
+        if _kind == 'vertex':
+            xy = np.zeros((_capacity, 2), dtype=float)
+            xy[:old] = self.vertexXY
+            self.vertexXY = xy
+
+    def newVertex(self, _point):
+        v = self.allocate('vertex')
+        self.vertexPoint[v] = _point
+        self.vertexXY[v] = (_point.getX(), _point.getY())
+        return v
+
+    def newEdge(self, _segment):
+        e = self.allocate('edge')
+        self.edgeSegment[e] = _segment
+        return e
+
+    def newFace(self, _patch):
+        f = self.allocate('face')
+        self.facePatch[f] = _patch
+        return f
+
+    def newLoop(self, _face):
+        loop = self.allocate('loop')
+        self.loopFace[loop] = _face
+        return loop
+
+    def newHalfEdge(self, _vertex, _loop):
+        he = self.allocate('he')
+        self.heVertex[he] = _vertex
+        self.heLoop[he] = _loop
+        self.heNext[he] = he
+        self.hePrev[he] = he
+        self.heTwin[he] = he
+        return he
+
+    # Indices of the entities of the given kind that are in use
+    def indices(self, _kind):
+        return np.flatnonzero(self.alive[_kind][:self.size[_kind]])
+
+    def numberOf(self, _kind):
+        return self.size[_kind] - len(self.free[_kind])
+
+    # Builds the arrays from the object-based structure of a shell. The
+    # entities are numbered in the order of the shell lists, loops face by
+    # face (outer loop first) and half-edges loop by loop.
+    @staticmethod
+    def fromShell(_shell):
+        arrays = HeArrays()
+
+        vertex_index = {}
+        for vertex in _shell.vertices:
+            vertex_index[vertex] = arrays.newVertex(vertex.point)
+
+        edge_index = {}
+        for edge in _shell.edges:
+            edge_index[edge] = arrays.newEdge(edge.segment)
+
+        he_index = {}
+        for face in _shell.faces:
+            f = arrays.newFace(face.patch)
+            loop = face.loop
+            prev_l = -1
+
+            while loop is not None:
+                l = arrays.newLoop(f)
+                arrays.loopClosed[l] = loop.isClosed
+                if prev_l < 0:
+                    arrays.faceLoop[f] = l
+                else:
+                    arrays.loopNext[prev_l] = l
+                prev_l = l
+
+                he_begin = loop.he
+                if he_begin is not None:
+                    he = he_begin
+                    while True:
+                        h = arrays.newHalfEdge(vertex_index[he.vertex], l)
+                        he_index[he] = h
+                        if he.edge is not None:
+                            arrays.heEdge[h] = edge_index[he.edge]
+
+                        he = he.next
+                        if he == he_begin:
+                            break
+
+                    arrays.loopHe[l] = he_index[he_begin]
+
+                loop = loop.next
+
+        for he, h in he_index.items():
+            arrays.heNext[h] = he_index[he.next]
+            arrays.hePrev[h] = he_index[he.prev]
+            arrays.heTwin[h] = he_index[he.mate()]
+
+        for vertex, v in vertex_index.items():
+            if vertex.he is not None:
+                arrays.vertexHe[v] = he_index[vertex.he]
+
+        for edge, e in edge_index.items():
+            arrays.edgeHe[e] = he_index[edge.he1]
+
+        return arrays
+
+    # Builds an object-based shell with the topology of the arrays. The
+    # geometric objects are shared with the arrays.
+    def toShell(self):
+        shell = Shell()
+
+        vertices = {}
+        for v in self.indices('vertex'):
+            vertex = Vertex(self.vertexPoint[v])
+            vertex.point.vertex = vertex
+            vertices[v] = vertex
+
+        edges = {}
+        for e in self.indices('edge'):
+            edge = Edge(self.edgeSegment[e])
+            edge.segment.edge = edge
+            edges[e] = edge
+
+        faces = {}
+        for f in self.indices('face'):
+            face = Face(shell)
+            face.patch = self.facePatch[f]
+            if face.patch is None:
+                face.patch = Patch()
+            faces[f] = face
+
+        loops = {}
+        for f, face in faces.items():
+            l = self.faceLoop[f]
+            prev_loop = None
+            while l >= 0:
+                loop = Loop()
+                loop.face = face
+                loop.isClosed = bool(self.loopClosed[l])
+                if prev_loop is None:
+                    face.loop = loop
+                else:
+                    loop.prev = prev_loop
+                    prev_loop.next = loop
+                    face.intLoops.append(loop)
+                loops[l] = loop
+                prev_loop = loop
+                l = self.loopNext[l]
+
+        hes = {}
+        for h in self.indices('he'):
+            he = HalfEdge(vertices[self.heVertex[h]], loops[self.heLoop[h]])
+            if self.heEdge[h] >= 0:
+                he.edge = edges[self.heEdge[h]]
+            hes[h] = he
+
+        for h, he in hes.items():
+            he.next = hes[self.heNext[h]]
+            he.prev = hes[self.hePrev[h]]
+
+        for l, loop in loops.items():
+            if self.loopHe[l] >= 0:
+                loop.he = hes[self.loopHe[l]]
+
+        for v, vertex in vertices.items():
+            if self.vertexHe[v] >= 0:
+                vertex.he = hes[self.vertexHe[v]]
+
+        for e, edge in edges.items():
+            edge.he1 = hes[self.edgeHe[e]]
+            edge.he2 = hes[self.heTwin[self.edgeHe[e]]]
+
+        for vertex in vertices.values():
+            shell.insertVertex(vertex)
+        for edge in edges.values():
+            shell.insertEdge(edge)
+        prev_face = None
+        for face in faces.values():
+            shell.insertFace(face)
+            face.patch.face = face
+            if prev_face is not None:
+                face.prev = prev_face
+                prev_face.next = face
+            prev_face = face
+
+        if len(shell.faces) > 0:
+            shell.face = shell.faces.first()
+        shell.renumberIDS()
+
+        return shell
+
+    # Renumbers the entities of each kind contiguously, in the order of their
+    # current indices, and empties the free-lists
+    def compact(self):
+        maps = {}
+        for kind in HeArrays.FIELDS:
+            keep = self.indices(kind)
+            new_index = np.full(self.size[kind] + 1, -1, dtype=np.int32)
+            new_index[keep] = np.arange(len(keep), dtype=np.int32)
+            maps[kind] = (keep, new_index)
+
+        # references to other entities are mapped (-1 is kept as -1, since
+        # the last item of each map is -1)
+        references = {
+            'heNext': 'he', 'hePrev': 'he', 'heTwin': 'he', 'heVertex': 'vertex',
+            'heEdge': 'edge', 'heLoop': 'loop', 'edgeHe': 'he', 'loopHe': 'he',
+            'loopFace': 'face', 'loopNext': 'loop', 'faceLoop': 'loop',
+            'vertexHe': 'he'
+        }
+
+        for kind in HeArrays.FIELDS:
+            keep = maps[kind][0]
+            for name, value in HeArrays.FIELDS[kind]:
+                values = getattr(self, name)[keep]
+                if name in references:
+                    values = maps[references[name]][1][values]
+                setattr(self, name, values.astype(np.int32))
+
+            self.alive[kind] = np.ones(len(keep), dtype=bool)
+            self.size[kind] = len(keep)
+            self.free[kind] = []
+
+        keep = maps['vertex'][0]
+        self.vertexXY = self.vertexXY[keep]
+        self.vertexPoint = [self.vertexPoint[v] for v in keep]
+        self.edgeSegment = [self.edgeSegment[e] for e in maps['edge'][0]]
+        self.facePatch = [self.facePatch[f] for f in maps['face'][0]]
+
+        for kind in HeArrays.FIELDS:
+            if self.size[kind] < HeArrays.INITIAL_CAPACITY:
+                self.grow(kind, HeArrays.INITIAL_CAPACITY)
+
+        return maps
+
+    # Returns the number of edges incident to each vertex
+    def vertexDegrees(self):
+        hes = self.indices('he')
+        hes = hes[self.heEdge[hes] >= 0]
+        return np.bincount(self.heVertex[hes], minlength=self.size['vertex'])
+
+    # Returns the number of half-edges of each loop
+    def loopSizes(self):
+        hes = self.indices('he')
+        return np.bincount(self.heLoop[hes], minlength=self.size['loop'])
+
+    # Returns the faces on the left of the given half-edges
+    def heFaces(self, _hes):
+        return self.loopFace[self.heLoop[_hes]]
+
+    # Returns the pairs of faces on both sides of each edge
+    def edgeFaces(self):
+        edges = self.indices('edge')
+        he1 = self.edgeHe[edges]
+        return self.heFaces(he1), self.heFaces(self.heTwin[he1])
+
+    # Returns the half-edges of a loop in their next order
+    def loopHalfEdges(self, _loop):
+        hes = []
+        he_begin = self.loopHe[_loop]
+        if he_begin < 0:
+            return hes
+
+        he = he_begin
+        while True:
+            hes.append(he)
+            he = self.heNext[he]
+            if he == he_begin:
+                break
+
+        return hes
+
+    # Returns the vertices of the outer loop of a face
+    # (same order as Face.incidentVertices)
+    def faceVertices(self, _face):
+        return self.heVertex[self.loopHalfEdges(self.faceLoop[_face])]
+
+    # Returns the edges incident to a vertex (same order as
+    # Vertex.incidentEdges)
+    def vertexEdges(self, _vertex):
+        edges = []
+        he_begin = self.vertexHe[_vertex]
+        if he_begin < 0 or self.heEdge[he_begin] < 0:
+            return edges
+
+        he = he_begin
+        while True:
+            if self.heEdge[he] not in edges:
+                edges.append(self.heEdge[he])
+            he = self.heNext[self.heTwin[he]]
+            if he == he_begin:
+                break
+
+        return edges
+
+    def halfEdge(self, _index):
+        if _index < 0:
+            return None
+        return ArrayHalfEdge(self, _index)
+
+    def vertex(self, _index):
+        if _index < 0:
+            return None
+        return ArrayVertex(self, _index)
+
+    def edge(self, _index):
+        if _index < 0:
+            return None
+        return ArrayEdge(self, _index)
+
+    def loop(self, _index):
+        if _index < 0:
+            return None
+        return ArrayLoop(self, _index)
+
+    def face(self, _index):
+        if _index < 0:
+            return None
+        return ArrayFace(self, _index)
+
+
+# Thin proxies of the entities of HeArrays. They only hold the arrays and an
+# index, and provide the attributes of the topological entities, so that
+# traversal code written for the object-based structure can visit the
+# arrays. Two proxies are equal when they refer to the same entity.
+class ArrayEntity:
+    __slots__ = ('arrays', 'index')
+
+    def __init__(self, _arrays, _index):
+        self.arrays = _arrays
+        self.index = int(_index)
+
+    def __eq__(self, _other):
+        return type(self) is type(_other) and self.arrays is _other.arrays \
+            and self.index == _other.index
+
+    def __ne__(self, _other):
+        return not self.__eq__(_other)
+
+    def __hash__(self):
+        return hash((id(self.arrays), self.index))
+
+
+class ArrayHalfEdge(ArrayEntity):
+    __slots__ = ()
+
+    @property
+    def next(self):
+        return self.arrays.halfEdge(self.arrays.heNext[self.index])
+
+    @property
+    def prev(self):
+        return self.arrays.halfEdge(self.arrays.hePrev[self.index])
+
+    @property
+    def vertex(self):
+        return self.arrays.vertex(self.arrays.heVertex[self.index])
+
+    @property
+    def edge(self):
+        return self.arrays.edge(self.arrays.heEdge[self.index])
+
+    @property
+    def loop(self):
+        return self.arrays.loop(self.arrays.heLoop[self.index])
+
+    def mate(self):
+        return self.arrays.halfEdge(self.arrays.heTwin[self.index])
+
+
+class ArrayVertex(ArrayEntity):
+    __slots__ = ()
+
+    @property
+    def he(self):
+        return self.arrays.halfEdge(self.arrays.vertexHe[self.index])
+
+    @property
+    def point(self):
+        return self.arrays.vertexPoint[self.index]
+
+    def incidentEdges(self):
+        return [self.arrays.edge(e) for e in self.arrays.vertexEdges(self.index)]
+
+
+class ArrayEdge(ArrayEntity):
+    __slots__ = ()
+
+    @property
+    def he1(self):
+        return self.arrays.halfEdge(self.arrays.edgeHe[self.index])
+
+    @property
+    def he2(self):
+        return self.arrays.halfEdge(self.arrays.heTwin[self.arrays.edgeHe[self.index]])
+
+    @property
+    def segment(self):
+        return self.arrays.edgeSegment[self.index]
+
+
+class ArrayLoop(ArrayEntity):
+    __slots__ = ()
+
+    @property
+    def he(self):
+        return self.arrays.halfEdge(self.arrays.loopHe[self.index])
+
+    @property
+    def face(self):
+        return self.arrays.face(self.arrays.loopFace[self.index])
+
+    @property
+    def next(self):
+        return self.arrays.loop(self.arrays.loopNext[self.index])
+
+    @property
+    def isClosed(self):
+        return bool(self.arrays.loopClosed[self.index])
+
+
+class ArrayFace(ArrayEntity):
+    __slots__ = ()
+
+    @property
+    def loop(self):
+        return self.arrays.loop(self.arrays.faceLoop[self.index])
+
+    @property
+    def patch(self):
+        return self.arrays.facePatch[self.index]
+
+    def incidentVertices(self):
+        return [self.arrays.vertex(v) for v in self.arrays.faceVertices(self.index)]
@@ -5,6 +5,13 @@ from hetool.he.eulerOperators.MVR_KVR import MVR, KVR
 from hetool.he.eulerOperators.MEV_KEV import MEV
 from hetool.he.eulerOperators.MVSE_KVJE import MVSE, KVJE
 from hetool.he.auxoperations import *
+from hetool.he.topologicalEntities.shell import Shell
+from hetool.he.topologicalEntities.face import Face
+from hetool.he.topologicalEntities.loop import Loop
+from hetool.he.topologicalEntities.halfedge import HalfEdge
+from hetool.he.topologicalEntities.edge import Edge
+from hetool.he.topologicalEntities.vertex import Vertex
+from hetool.geometry.patch import Patch
 from hetool.geometry.point import Point
 from hetool.geometry.segments.polyline import Polyline
 from hetool.he.undoredo import UndoRedo
@@ -56,15 +63,13 @@ class HeController:
 
     def addPoint(self, _pt, _tol):
         # check whether there is already a point with the same coordinates
-        for point in self.hemodel.points:
-            tol = Point(_tol, _tol)
-            if Point.equal(_pt, point, tol):
-                # in this case there is already a vertex with the same coordinates
-                return
+        if self.hemodel.findVertex(_pt, _tol) is not None:
+            # in this case there is already a vertex with the same coordinates
+            return
 
         # if there isn't one, check whether the point intersects an edge in model
         intersec = False
-        edges = self.hemodel.shell.edges
+        edges = self.hemodel.edgesNearPoint(_pt, _tol)
         for edge in edges:
             intersec, param, pi = edge.segment.intersectPoint(_pt, _tol)
 
@@ -113,6 +118,38 @@ class HeController:
         self.undoredo.end()
         self.update()
 
+    # Inserts a set of segments in a single command, with a single undo entry.
+    # Each segment is stitched to the model as in insertSegment, and only the
+    # edges whose bounding boxes overlap it are intersected with it, so the
+    # segments inserted earlier in the batch are found through the spatial
+    # index of the model.
+    def insertSegments(self, _segments, _tol):
+        self.undoredo.begin()
+
+        for segment in _segments:
+            if type(segment) == list:
+                pts = []
+                for i in range(0, len(segment) - 1, 2):
+                    pts.append(Point(segment[i], segment[i+1]))
+                segment = Polyline(pts)
+
+            status, pts, params = segment.selfIntersect()
+            if status:
+                # if there are self-intersections, split the segment in segments
+                incoming_segments = segment.split(params, pts)
+            else:
+                incoming_segments = [segment]
+
+            for incoming_segment in incoming_segments:
+                if incoming_segment is not None:
+                    self.addSegment(incoming_segment, _tol)
+
+                    # refresh the faces changed by the segment, since the
+                    # location of the next points relies on their patches
+                    self.update()
+
+        self.undoredo.end()
+
     def addSegment(self, _segment, _tol):
         segmentPts = _segment.getPoints()
         init_pt = segmentPts[0]
@@ -150,17 +187,26 @@ class HeController:
         if self.hemodel.isEmpty():
             return
 
-        faces = self.hemodel.shell.faces
-        for i in range(1, len(faces)):
-            faces[i].updateBoundary()
-            faces[i].updateHoles()
+        # only the faces changed by the topological operators since the
+        # last update are refreshed
+        faces = self.hemodel.shell.popDirtyFaces()
+        for face in faces:
+            # skip faces that have been killed
+            if face.loop is None:
+                continue
+
+            if face == self.hemodel.infinityFace:
+                # update internal loops of infinite Face
+                loop = face.loop.next
+                face.intLoops.clear()
+                while loop is not None:
+                    face.intLoops.append(loop)
+                    loop = loop.next
+            else:
+                face.updateBoundary()
+                face.updateHoles()
 
-        # update internal loops of infinite Face
-        loop = faces[0].loop.next
-        faces[0].intLoops.clear()
-        while loop is not None:
-            faces[0].intLoops.append(loop)
-            loop = loop.next
+        self.hemodel.updateContainment(faces)
 
         self.isChanged = True
 
@@ -512,6 +558,7 @@ class HeController:
 
         selectedEdges = self.hemodel.selectedEdges()
         selectedVertices = self.hemodel.selectedVertices()
+        selectedVerticesSet = set(selectedVertices)
 
         incidentVertices = []
         for edge in selectedEdges:
@@ -522,7 +569,7 @@ class HeController:
         incidentVertices = list(set(incidentVertices))  # removes duplicates
 
         for vertex in incidentVertices:
-            if vertex not in selectedVertices:
+            if vertex not in selectedVerticesSet:
                 self.killVertex(vertex)
 
         for vertex in selectedVertices:
@@ -537,7 +584,7 @@ class HeController:
                     self.killEdge(edge)
 
                     for incidentVertex in vertices:
-                        if incidentVertex not in selectedVertices:
+                        if incidentVertex not in selectedVerticesSet:
                             self.killVertex(incidentVertex)
 
                 self.killVertex(vertex)
@@ -1042,7 +1089,6 @@ class HeController:
         split_params = []
         split_pts = []
         points = []
-        tol = Point(_tol, _tol)
 
         for split_nodes in _incoming_segment_split_map:
             split_params.append(split_nodes[0])
@@ -1076,17 +1122,13 @@ class HeController:
 
             # The list of vertices of the hemodel is checked, verifying if the
             # init_point and end_point are already exists in the model
-            init_vertex = None
-            end_vertex = None
-            vertices = self.hemodel.shell.vertices
-            for vertex in vertices:
-                if Point.equal(vertex.point, init_point, tol):
-                    init_vertex = vertex
-                    init_point = init_vertex.point
+            init_vertex = self.hemodel.findVertex(init_point, _tol)
+            if init_vertex is not None:
+                init_point = init_vertex.point
 
-                if Point.equal(vertex.point, end_point, tol):
-                    end_vertex = vertex
-                    end_point = end_vertex.point
+            end_vertex = self.hemodel.findVertex(end_point, _tol)
+            if end_vertex is not None:
+                end_point = end_vertex.point
 
             make_segment = True
             if seg.length(0, 1) <= _tol:
@@ -1207,167 +1249,159 @@ class HeController:
         self.undoredo.redo()
 
         lastCommand = self.undoredo.lastCommand()
-        for i in range(len(lastCommand)-1, -1, -1):
-            lastCommand[i].execute()
+        for comand in reversed(lastCommand):
+            comand.execute()
 
         self.update()
 
+    # Only the entities whose bounding boxes lie within the tolerance of the
+    # picked point (found through the spatial indexes of the model) are tested
     def selectPick(self, _x,  _y,  _tol,  _shiftkey):
 
         if self.hemodel.isEmpty():
             return
 
+        p = Point(_x, _y)
+
         # select point
         ispointSelected = False
-        id_target = -1
+        target = None
         dmin = _tol
-        points = self.hemodel.getPoints()
         if self.select_point:
-            for i in range(0, len(points)):
-                dist = Point.euclidiandistance(Point(_x, _y), points[i])
+            vertices = self.hemodel.verticesCrossingWindow(
+                _x - _tol, _x + _tol, _y - _tol, _y + _tol)
+            for vertex in vertices:
+                dist = Point.euclidiandistance(p, vertex.point)
                 if dist < dmin:
                     dmin = dist
-                    id_target = i
+                    target = vertex.point
 
             # Revert selection of picked point
-            if id_target > -1:
+            if target is not None:
                 ispointSelected = True
-                if points[id_target].isSelected():
-                    points[id_target].setSelected(False)
+                if target.isSelected():
+                    target.setSelected(False)
                 else:
-                    points[id_target].setSelected(True)
+                    target.setSelected(True)
 
         if not _shiftkey:
             # If shift key is not pressed, unselect all points except
             # the picked one (if there was one selected)
-            for i in range(0, len(points)):
-                if i != id_target:
-                    points[i].setSelected(False)
+            for point in list(self.hemodel.selectedPoints):
+                if point is not target:
+                    point.setSelected(False)
 
         # select segment
         issegmentselected = False
-        id_target = -1
+        target = None
         dmin = _tol
-        segments = self.hemodel.getSegments()
         if self.select_segment and not ispointSelected:
-            for i in range(0, len(segments)):
+            edges = self.hemodel.edgesNearPoint(p, _tol)
+            for edge in edges:
                 # Compute distance between given point and segment and
                 # update minimum distance
-                xC, yC, d = segments[i].closestPoint(_x, _y)
+                xC, yC, d = edge.segment.closestPoint(_x, _y)
                 if d < dmin:
                     dmin = d
-                    id_target = i
+                    target = edge.segment
 
             # Revert selection of picked segment
-            if id_target > -1:
+            if target is not None:
                 issegmentselected = True
-                if segments[id_target].isSelected():
-                    segments[id_target].setSelected(False)
+                if target.isSelected():
+                    target.setSelected(False)
                 else:
-                    segments[id_target].setSelected(True)
+                    target.setSelected(True)
 
         if not _shiftkey:
             # If shift key is not pressed, unselect all segments except
             # the picked one (if there was one selected)
-            for i in range(0, len(segments)):
-                if i != id_target:
-                    segments[i].setSelected(False)
+            for segment in list(self.hemodel.selectedSegments):
+                if segment is not target:
+                    segment.setSelected(False)
 
-        patches = self.hemodel.getPatches()
         if self.select_patch and not ispointSelected and not issegmentselected:
             # Check whether point is inside a patch
-            p = Point(_x, _y)
+            faces = self.hemodel.facesContainingPoint(p)
+            targets = [face.patch for face in faces]
 
-            for i in range(0, len(patches)):
-                if patches[i].isPointInside(p):
-                    if patches[i].isSelected():
-                        patches[i].setSelected(False)
-                    else:
-                        patches[i].setSelected(True)
+            if not _shiftkey:
+                # unselect the patches that do not contain the point
+                for patch in list(self.hemodel.selectedPatches):
+                    if patch not in targets:
+                        patch.setSelected(False)
+
+            for patch in targets:
+                if patch.isSelected():
+                    patch.setSelected(False)
                 else:
-                    if not _shiftkey:
-                        patches[i].setSelected(False)
+                    patch.setSelected(True)
         elif not _shiftkey:
-            for i in range(0, len(patches)):
-                patches[i].setSelected(False)
+            for patch in list(self.hemodel.selectedPatches):
+                patch.setSelected(False)
 
+    # Only the entities whose bounding boxes overlap the fence (found through
+    # the spatial indexes of the model) are tested
     def selectFence(self, _xmin, _xmax, _ymin, _ymax, _shiftkey):
 
         if self.hemodel.isEmpty():
             return
 
-        segments = self.hemodel.getSegments()
         if self.select_segment:
-            # select segments
-            for i in range(0, len(segments)):
-                xmin_c, xmax_c, ymin_c, ymax_c = segments[i].getBoundBox(
-                )
-                if ((xmin_c < _xmin) or (xmax_c > _xmax) or
-                        (ymin_c < _ymin) or (ymax_c > _ymax)):
-                    inFence = False
-                else:
-                    inFence = True
-
-                if inFence:
-                    # Select segment inside fence
-                    segments[i].setSelected(True)
-                else:
-                    if not _shiftkey:
-                        segments[i].setSelected(False)
+            # select segments inside fence
+            edges = self.hemodel.edgesInWindow(_xmin, _xmax, _ymin, _ymax)
+            targets = dict.fromkeys(edge.segment for edge in edges)
+
+            # If shift key is not pressed, unselect segments outside fence
+            if not _shiftkey:
+                for segment in list(self.hemodel.selectedSegments):
+                    if segment not in targets:
+                        segment.setSelected(False)
+
+            for segment in targets:
+                segment.setSelected(True)
         elif not _shiftkey:
-            for i in range(0, len(segments)):
-                segments[i].setSelected(False)
+            for segment in list(self.hemodel.selectedSegments):
+                segment.setSelected(False)
 
-        points = self.hemodel.getPoints()
         if self.select_point:
-            # select points
-            for i in range(0, len(points)):
-                x = points[i].getX()
-                y = points[i].getY()
-
-                if ((x < _xmin) or (x > _xmax) or
-                        (y < _ymin) or (y > _ymax)):
-                    inFence = False
-                else:
-                    inFence = True
-
-                if inFence:
-                    # Select segment inside fence
-                    points[i].setSelected(True)
-                else:
-                    if not _shiftkey:
-                        points[i].setSelected(False)
+            # select points inside fence
+            vertices = self.hemodel.verticesCrossingWindow(_xmin, _xmax, _ymin, _ymax)
+            targets = dict.fromkeys(vertices)
+
+            # If shift key is not pressed, unselect points outside fence
+            if not _shiftkey:
+                for point in list(self.hemodel.selectedPoints):
+                    if point.vertex not in targets:
+                        point.setSelected(False)
+
+            for vertex in targets:
+                vertex.point.setSelected(True)
         elif not _shiftkey:
-            for i in range(0, len(points)):
-                points[i].setSelected(False)
+            for point in list(self.hemodel.selectedPoints):
+                point.setSelected(False)
 
-        patches = self.hemodel.getPatches()
         if self.select_patch:
-            # select patches
-            for i in range(0, len(patches)):
-                xmin_r, xmax_r, ymin_r, ymax_r = patches[i].getBoundBox(
-                )
-                if((xmin_r < _xmin) or (xmax_r > _xmax) or
-                        (ymin_r < _ymin) or (ymax_r > _ymax)):
-                    inFence = False
-                else:
-                    inFence = True
-
-                if inFence:
-                    # Select patch inside fence
-                    patches[i].setSelected(True)
-                else:
-                    # If shift key is not pressed, unselect patch outside fence
-                    if not _shiftkey:
-                        patches[i].setSelected(False)
+            # select patches inside fence
+            faces = self.hemodel.facesInWindow(_xmin, _xmax, _ymin, _ymax)
+            targets = dict.fromkeys(face.patch for face in faces)
+
+            # If shift key is not pressed, unselect patches outside fence
+            if not _shiftkey:
+                for patch in list(self.hemodel.selectedPatches):
+                    if patch not in targets:
+                        patch.setSelected(False)
+
+            for patch in targets:
+                patch.setSelected(True)
         elif not _shiftkey:
-            for i in range(0, len(patches)):
-                patches[i].setSelected(False)
+            for patch in list(self.hemodel.selectedPatches):
+                patch.setSelected(False)
 
     def unSelectAll(self):
-        points = self.hemodel.getPoints()
-        segments = self.hemodel.getSegments()
-        patches = self.hemodel.getPatches()
+        points = list(self.hemodel.selectedPoints)
+        segments = list(self.hemodel.selectedSegments)
+        patches = list(self.hemodel.selectedPatches)
 
         for point in points:
             point.setSelected(False)
@@ -1387,7 +1421,7 @@ class HeController:
     def changePatchSelect(self, _select):
         self.select_patch = _select
 
-    def saveFile(self, _filename):
+    def saveFile(self, _filename, _compact=False):
 
         self.file = _filename
 
@@ -1395,7 +1429,7 @@ class HeController:
         self.hemodel.shell.renumberIDS()
 
         shell = self.hemodel.shell
-        HeFile.saveFile(shell, self.attManager.getAttributes(), _filename)
+        HeFile.saveFile(shell, self.attManager.getAttributes(), _filename, _compact)
         self.isChanged = False
 
     def openFile(self, _filename):
@@ -1406,67 +1440,268 @@ class HeController:
         self.undoredo.clear()
         self.hemodel.clearAll()
 
-        shell = faces[0]['face'].shell
+        shell = faces[0].shell
         self.hemodel.insertShell(shell)
         self.attManager.attributes = attributes
 
-        for vertex_dict in vertices:
-            self.hemodel.insertVertex(vertex_dict['vertex'])
+        for vertex in vertices:
+            self.hemodel.insertVertex(vertex)
 
-        for edge_dict in edges:
-            self.hemodel.insertEdge(edge_dict['edge'])
+        for edge in edges:
+            self.hemodel.insertEdge(edge)
 
-        for face_dict in faces:
-            self.hemodel.insertFace(face_dict['face'])
+        for face in faces:
+            self.hemodel.insertFace(face)
 
         self.update()
         self.isChanged = False
 
+    # Builds the model directly from a mesh given by an array of node
+    # coordinates and an array of element connectivities (node indices).
+    # Each element becomes a face and the edges shared by two elements are
+    # found by their sorted pair of nodes, so no geometric intersection is
+    # performed. The mesh must be conforming and manifold at its edges.
+    # Regions enclosed by the mesh and not covered by elements become holes.
+    def buildFromMesh(self, _nodes, _elements):
+
+        shell = Shell()
+        infinityFace = Face(shell)
+        infinityFace.patch = Patch()
+        Loop(infinityFace)  # virtual outer loop of the infinite face
+        shell.face = infinityFace
+
+        vertices = []
+        edges = []
+        faces = [infinityFace]
+        node_vertex = {}  # node index -> vertex
+        node_hes = {}  # (begin node, end node) -> half-edge
+
+        # creates the element faces
+        for element in _elements:
+            nodes = [int(node) for node in element]
+
+            # ensure a counterclockwise orientation of the element
+            area = 0.0
+            for i in range(0, len(nodes)):
+                p1 = _nodes[nodes[i-1]]
+                p2 = _nodes[nodes[i]]
+                area += float(p1[0]) * float(p2[1]) - float(p2[0]) * float(p1[1])
+
+            if area == 0.0 or len(set(nodes)) != len(nodes):
+                print('ERROR: degenerated element in the mesh')
+                raise ValueError
+
+            if area < 0.0:
+                nodes.reverse()
+
+            face = Face(shell)
+            face.patch = Patch()
+            loop = Loop(face)
+            loop.isClosed = True
+            faces.append(face)
+
+            element_hes = []
+            for i in range(0, len(nodes)):
+                begin_node = nodes[i]
+                end_node = nodes[(i+1) % len(nodes)]
+
+                for node in (begin_node, end_node):
+                    if node not in node_vertex:
+                        pt = _nodes[node]
+                        vertex = Vertex(Point(float(pt[0]), float(pt[1])))
+                        node_vertex[node] = vertex
+                        vertices.append(vertex)
+
+                if (begin_node, end_node) in node_hes:
+                    print('ERROR: the mesh is not manifold or its elements are not consistently oriented')
+                    raise ValueError
+
+                he = HalfEdge(node_vertex[begin_node], loop)
+                node_hes[(begin_node, end_node)] = he
+
+                if he.vertex.he is None:
+                    he.vertex.he = he
+
+                mate = node_hes.get((end_node, begin_node))
+                if mate is None:
+                    edge = Edge(Polyline([node_vertex[begin_node].point,
+                                          node_vertex[end_node].point]))
+                    edge.he1 = he
+                    edges.append(edge)
+                else:
+                    edge = mate.edge
+                    edge.he2 = he
+
+                he.edge = edge
+                element_hes.append(he)
+
+            for i in range(0, len(element_hes)):
+                element_hes[i].prev = element_hes[i-1]
+                element_hes[i-1].next = element_hes[i]
+
+            loop.he = element_hes[0]
+
+        # creates the mate half-edges of the mesh boundary edges
+        boundary_hes = []
+        vertex_boundary_hes = {}  # vertex -> boundary half-edges leaving it
+        for edge in edges:
+            if edge.he2 is None:
+                he = HalfEdge(edge.he1.next.vertex)
+                he.edge = edge
+                edge.he2 = he
+                boundary_hes.append(he)
+                vertex_boundary_hes.setdefault(he.vertex, []).append(he)
+
+        # links the boundary half-edges. If the mesh touches itself at the
+        # end vertex of a boundary half-edge, its next half-edge is the first
+        # boundary half-edge found rotating clockwise around that vertex.
+        for he in boundary_hes:
+            vertex = he.edge.he1.vertex
+            candidates = vertex_boundary_hes[vertex]
+
+            if len(candidates) == 1:
+                he_next = candidates[0]
+            else:
+                pt = vertex.point
+                angle = math.atan2(he.vertex.point.getY() - pt.getY(),
+                                   he.vertex.point.getX() - pt.getX())
+                he_next = None
+                min_rotation = None
+                for candidate in candidates:
+                    end_pt = candidate.edge.he1.vertex.point
+                    rotation = (angle - math.atan2(end_pt.getY() - pt.getY(),
+                                                   end_pt.getX() - pt.getX())) % (2.0 * math.pi)
+                    if min_rotation is None or rotation < min_rotation:
+                        he_next = candidate
+                        min_rotation = rotation
+
+            he.next = he_next
+            he_next.prev = he
+
+        # traces the boundary loops. Counterclockwise loops enclose regions
+        # without elements, which become holes. Clockwise loops are outer
+        # boundaries that lie on the infinite face or inside a hole.
+        hole_faces = []
+        outer_loops = []
+        visited = set()
+        for he_begin in boundary_hes:
+            if he_begin in visited:
+                continue
+
+            loop_hes = []
+            pts = []
+            he = he_begin
+            while he not in visited:
+                visited.add(he)
+                loop_hes.append(he)
+                pts.append(he.vertex.point)
+                he = he.next
+
+            area = 0.0
+            for i in range(0, len(pts)):
+                area += pts[i-1].getX() * pts[i].getY() - pts[i].getX() * pts[i-1].getY()
+
+            if area > 0.0:
+                face = Face(shell)
+                face.patch = Patch()
+                face.patch.isDeleted = True
+                loop = Loop(face)
+                loop.isClosed = True
+                loop.he = he_begin
+                for he in loop_hes:
+                    he.loop = loop
+
+                faces.append(face)
+                hole_faces.append([face, pts, area])
+            else:
+                outer_loops.append([he_begin, loop_hes])
+
+        for he_begin, loop_hes in outer_loops:
+            # find the smallest hole that contains the boundary, if any
+            face_on = infinityFace
+            face_on_area = None
+            pt = he_begin.vertex.point
+            for face, pts, area in hole_faces:
+                if face_on_area is not None and area >= face_on_area:
+                    continue
+
+                if CompGeom.isPointInPolygon(pts, pt):
+                    face_on = face
+                    face_on_area = area
+
+            loop = Loop(face_on)
+            loop.he = he_begin
+            for he in loop_hes:
+                he.loop = loop
+
+        # set face prev/next
+        for i in range(1, len(faces)):
+            faces[i].prev = faces[i-1]
+            faces[i-1].next = faces[i]
+
+        # replace the current model by the new one
+        self.undoredo.clear()
+        self.hemodel.clearAll()
+
+        if len(vertices) == 0:
+            return
+
+        self.hemodel.insertShell(shell)
+
+        for vertex in vertices:
+            self.hemodel.insertVertex(vertex)
+
+        for edge in edges:
+            self.hemodel.insertEdge(edge)
+
+        for face in faces:
+            self.hemodel.insertFace(face)
+
+        self.update()
+
     def setAttribute(self, _name):
 
         attribute = self.attManager.getAttributeByName(_name)
         self.undoredo.begin()
 
         if attribute['applyOnVertex']:
-            points = self.hemodel.getPoints()
+            points = list(self.hemodel.selectedPoints)
 
             for pt in points:
-                if pt.isSelected():
-                    pt.setSelected(False)
-                    setAtt = SetAttribute(pt, attribute)
-                    setAtt.execute()
-                    self.undoredo.insertOperation(setAtt)
+                pt.setSelected(False)
+                setAtt = SetAttribute(pt, attribute)
+                setAtt.execute()
+                self.undoredo.insertOperation(setAtt)
 
         if attribute['applyOnEdge']:
-            segments = self.hemodel.getSegments()
+            segments = list(self.hemodel.selectedSegments)
 
             for seg in segments:
-                if seg.isSelected():
-                    seg.setSelected(False)
-                    setAtt = SetAttribute(seg, attribute)
-                    setAtt.execute()
-                    self.undoredo.insertOperation(setAtt)
-
-                    # change the support conditions of the segment points
-                    if attribute['type'] == 'Support Conditions':
-                        seg_vertices = seg.edge.incidentVertices()
-                        if attribute not in seg_vertices[0].point.attributes:
-                            setAtt = SetAttribute(
-                                seg_vertices[0].point, attribute)
-                            setAtt.execute()
-                            self.undoredo.insertOperation(setAtt)
+                seg.setSelected(False)
+                setAtt = SetAttribute(seg, attribute)
+                setAtt.execute()
+                self.undoredo.insertOperation(setAtt)
 
-                        if attribute not in seg_vertices[1].point.attributes:
-                            setAtt = SetAttribute(
-                                seg_vertices[-1].point, attribute)
-                            setAtt.execute()
-                            self.undoredo.insertOperation(setAtt)
+                # change the support conditions of the segment points
+                if attribute['type'] == 'Support Conditions':
+                    seg_vertices = seg.edge.incidentVertices()
+                    if attribute not in seg_vertices[0].point.attributes:
+                        setAtt = SetAttribute(
+                            seg_vertices[0].point, attribute)
+                        setAtt.execute()
+                        self.undoredo.insertOperation(setAtt)
+
+                    if attribute not in seg_vertices[1].point.attributes:
+                        setAtt = SetAttribute(
+                            seg_vertices[-1].point, attribute)
+                        setAtt.execute()
+                        self.undoredo.insertOperation(setAtt)
 
         if attribute['applyOnFace']:
-            patches = self.hemodel.getPatches()
+            patches = list(self.hemodel.selectedPatches)
 
             for patch in patches:
-                if patch.isSelected() and not patch.isDeleted:
+                if not patch.isDeleted:
                     patch.setSelected(False)
                     setAtt = SetAttribute(patch, attribute)
                     setAtt.execute()
@@ -1481,57 +1716,55 @@ class HeController:
         self.undoredo.begin()
 
         if attribute['applyOnVertex']:
-            points = self.hemodel.getPoints()
+            points = list(self.hemodel.selectedPoints)
 
             for pt in points:
-                if pt.isSelected():
-                    pt.setSelected(False)
-                    if attribute in pt.attributes:
-                        unsetAtt = UnSetAttribute(pt, attribute)
-                        unsetAtt.execute()
-                        self.undoredo.insertOperation(unsetAtt)
+                pt.setSelected(False)
+                if attribute in pt.attributes:
+                    unsetAtt = UnSetAttribute(pt, attribute)
+                    unsetAtt.execute()
+                    self.undoredo.insertOperation(unsetAtt)
 
         if attribute['applyOnEdge']:
-            segments = self.hemodel.getSegments()
+            segments = list(self.hemodel.selectedSegments)
 
             for seg in segments:
-                if seg.isSelected():
-                    seg.setSelected(False)
-                    if attribute in seg.attributes:
-                        unsetAtt = UnSetAttribute(seg, attribute)
-                        unsetAtt.execute()
-                        self.undoredo.insertOperation(unsetAtt)
+                seg.setSelected(False)
+                if attribute in seg.attributes:
+                    unsetAtt = UnSetAttribute(seg, attribute)
+                    unsetAtt.execute()
+                    self.undoredo.insertOperation(unsetAtt)
 
-                        # update mesh
-                        if attribute['type'] == 'Number of Subdivisions':
-                            face1 = seg.edge.he1.loop.face
-                            face2 = seg.edge.he2.loop.face
+                    # update mesh
+                    if attribute['type'] == 'Number of Subdivisions':
+                        face1 = seg.edge.he1.loop.face
+                        face2 = seg.edge.he2.loop.face
 
-                            if face1.patch.mesh is not None:
-                                self.delMesh(face1)
+                        if face1.patch.mesh is not None:
+                            self.delMesh(face1)
 
-                            if face2.patch.mesh is not None:
-                                self.delMesh(face2)
+                        if face2.patch.mesh is not None:
+                            self.delMesh(face2)
 
-                        # change the support conditions of the segment points
-                        elif attribute['type'] == 'Support Conditions':
-                            seg_vertices = seg.edge.incidentVertices()
-                            if attribute in seg_vertices[0].point.attributes:
-                                unsetAtt = UnSetAttribute(
-                                    seg_vertices[0].point, attribute)
-                                unsetAtt.execute()
-                                self.undoredo.insertOperation(unsetAtt)
+                    # change the support conditions of the segment points
+                    elif attribute['type'] == 'Support Conditions':
+                        seg_vertices = seg.edge.incidentVertices()
+                        if attribute in seg_vertices[0].point.attributes:
+                            unsetAtt = UnSetAttribute(
+                                seg_vertices[0].point, attribute)
+                            unsetAtt.execute()
+                            self.undoredo.insertOperation(unsetAtt)
 
-                            if attribute in seg_vertices[1].point.attributes:
-                                unsetAtt = UnSetAttribute(
-                                    seg_vertices[-1].point, attribute)
-                                unsetAtt.execute()
-                                self.undoredo.insertOperation(unsetAtt)
+                        if attribute in seg_vertices[1].point.attributes:
+                            unsetAtt = UnSetAttribute(
+                                seg_vertices[-1].point, attribute)
+                            unsetAtt.execute()
+                            self.undoredo.insertOperation(unsetAtt)
 
         if attribute['applyOnFace']:
-            patches = self.hemodel.getPatches()
+            patches = list(self.hemodel.selectedPatches)
             for patch in patches:
-                if patch.isSelected() and not patch.isDeleted:
+                if not patch.isDeleted:
                     patch.setSelected(False)
                     if attribute in patch.attributes:
                         unsetAtt = UnSetAttribute(patch, attribute)
@@ -1589,28 +1822,26 @@ class HeController:
         }
 
         self.undoredo.begin()
-        segments = self.hemodel.getSegments()
+        segments = list(self.hemodel.selectedSegments)
 
         for seg in segments:
-            if seg.isSelected():
-
-                setNumber = SetNumberOfSubdivisions(seg, nsudv_dict)
-                setNumber.execute()
-                self.undoredo.insertOperation(setNumber)
+            setNumber = SetNumberOfSubdivisions(seg, nsudv_dict)
+            setNumber.execute()
+            self.undoredo.insertOperation(setNumber)
 
-                setAtt = SetAttribute(seg, nsudv_dict)
-                setAtt.execute()
-                self.undoredo.insertOperation(setAtt)
+            setAtt = SetAttribute(seg, nsudv_dict)
+            setAtt.execute()
+            self.undoredo.insertOperation(setAtt)
 
-                # update mesh
-                face1 = seg.edge.he1.loop.face
-                face2 = seg.edge.he2.loop.face
+            # update mesh
+            face1 = seg.edge.he1.loop.face
+            face2 = seg.edge.he2.loop.face
 
-                if face1.patch.mesh is not None:
-                    self.delMesh(face1)
+            if face1.patch.mesh is not None:
+                self.delMesh(face1)
 
-                if face2.patch.mesh is not None:
-                    self.delMesh(face2)
+            if face2.patch.mesh is not None:
+                self.delMesh(face2)
 
         self.undoredo.end()
         self.isChanged = True
@@ -8,455 +8,847 @@ from hetool.he.topologicalEntities.edge import Edge
 from hetool.he.topologicalEntities.loop import Loop
 from hetool.he.topologicalEntities.halfedge import HalfEdge
 from hetool.he.topologicalEntities.shell import Shell
+from hetool.he.jsonstream import JsonStreamReader
+from array import array
+import gzip
 import json
+import struct
+import sys
 
 
 class HeFile():
 
-    @staticmethod
-    def saveFile(_shell, _attributes, _filename):
+    BINARY_MAGIC = b'HEB1'
+    SEGMENT_TYPES = ['LINE', 'POLYLINE']
 
-        # get topological entities
-        vertices = _shell.vertices
-        edges = _shell.edges
-        faces = _shell.faces
+    # Saves the model in the JSON format. The document is written section by
+    # section, one entity at a time, so that the whole model is never held
+    # as Python dicts. Files whose names end with '.gz' are compressed with
+    # gzip, and compact files (without indentation) can be requested.
+    @staticmethod
+    def saveFile(_shell, _attributes, _filename, _compact=False):
 
         # create/ open a file
         split_name = _filename.split('.')
-        if split_name[-1] == 'json':
+        if split_name[-1] == 'heb':
+            HeFile.saveBinaryFile(_shell, _attributes, _filename)
+            return
+        elif split_name[-1] == 'gz':
+            file = gzip.open(f"{_filename}", "wt")
+        elif split_name[-1] == 'json':
             file = open(f"{_filename}", "w")
         else:
             file = open(f"{_filename}.json", "w")
 
-        # saves the vertices
-        vertices_list = []
-        for vertex in vertices:
+        if _compact:
+            indent = None
+        else:
+            indent = 4
+
+        with file:
+            HeFile.writeObject(file, [
+                ('type', 'SHELL', False),
+                ('vertices', map(HeFile.vertexDict, _shell.vertices), True),
+                ('edges', map(HeFile.edgeDict, _shell.edges), True),
+                ('faces', map(HeFile.faceDict, _shell.faces), True),
+                ('attributes_list', _attributes, False)
+            ], indent)
+
+    # Writes a JSON object given by its (key, value, isStreamed) entries,
+    # with the same layout as json.dump. The items of the streamed values
+    # are encoded and written one by one.
+    @staticmethod
+    def writeObject(_file, _entries, _indent):
+        if _indent is None:
+            separators = (',', ':')
+            newline = ''
+            item_newline = ''
+        else:
+            separators = (',', ': ')
+            newline = '\n' + ' ' * _indent
+            item_newline = newline + ' ' * _indent
+
+        _file.write('{')
+        for k in range(0, len(_entries)):
+            key, value, isStreamed = _entries[k]
+            if k > 0:
+                _file.write(',')
+            _file.write(newline + json.dumps(key) + separators[1])
+
+            if not isStreamed:
+                text = json.dumps(value, indent=_indent, separators=separators)
+                _file.write(text.replace('\n', newline))
+                continue
+
+            _file.write('[')
+            isEmpty = True
+            for item in value:
+                if not isEmpty:
+                    _file.write(',')
+                text = json.dumps(item, indent=_indent, separators=separators)
+                _file.write(item_newline + text.replace('\n', item_newline))
+                isEmpty = False
+
+            if not isEmpty:
+                _file.write(newline)
+            _file.write(']')
+
+        if len(_entries) > 0:
+            _file.write(newline[0:1])
+        _file.write('}')
 
-            attributes = vertex.point.attributes
-            att_list = []
-            for att in attributes:
-                att_list.append(att['name'])
+    @staticmethod
+    def vertexDict(_vertex):
+        attributes = _vertex.point.attributes
+        att_list = []
+        for att in attributes:
+            att_list.append(att['name'])
+
+        attributes_dict = {
+            "att_names": att_list
+        }
 
-            attributes_dict = {
-                "att_names": att_list
-            }
+        if _vertex.prev is None:
+            prev_ID = None
+        else:
+            prev_ID = _vertex.prev.ID
 
-            if vertex.prev is None:
-                prev_ID = None
-            else:
-                prev_ID = vertex.prev.ID
+        if _vertex.next is None:
+            next_ID = None
+        else:
+            next_ID = _vertex.next.ID
+
+        vertex_dict = {
+            'type': 'VERTEX',
+            'ID': _vertex.ID,
+            'prev_ID': prev_ID,
+            'next_ID': next_ID,
+            'he_ID': _vertex.he.ID,
+            'point': (_vertex.point.getX(), _vertex.point.getY()),
+            'attributes': attributes_dict
+        }
 
-            if vertex.next is None:
-                next_ID = None
-            else:
-                next_ID = vertex.next.ID
-
-            vertex_dict = {
-                'type': 'VERTEX',
-                'ID': vertex.ID,
-                'prev_ID': prev_ID,
-                'next_ID': next_ID,
-                'he_ID': vertex.he.ID,
-                'point': (vertex.point.getX(), vertex.point.getY()),
-                'attributes': attributes_dict
-            }
-            vertices_list.append(vertex_dict)
-
-        # saves the edges
-        edges_list = []
-        for edge in edges:
-
-            edge_pts = edge.segment.getPoints()
-            pts = []
-            for pt in edge_pts:
-                pts.append([pt.getX(), pt.getY()])
-
-            attributes = edge.segment.attributes.copy()
-            if edge.segment.nsudv is not None:
-                attributes.remove(edge.segment.nsudv)
-            att_list = []
-            for att in attributes:
-                att_list.append(att['name'])
-
-            attributes_dict = {
-                "nsudv": edge.segment.nsudv,
-                "att_names": att_list
-            }
-
-            if edge.prev is None:
-                prev_ID = None
-            else:
-                prev_ID = edge.prev.ID
+        return vertex_dict
 
-            if edge.next is None:
-                next_ID = None
-            else:
-                next_ID = edge.next.ID
-
-            edge_dict = {
-                'type': 'EDGE',
-                'ID': edge.ID,
-                'prev_ID': prev_ID,
-                'next_ID': next_ID,
-                'he1_ID': edge.he1.ID,
-                'he2_ID': edge.he2.ID,
-                'segment_type': f'{edge.segment.getType()}',
-                'points': pts,
-                'attributes': attributes_dict
-            }
-
-            edges_list.append(edge_dict)
-
-        faces_list = []
-        for face in faces:
-
-            if face.loop.next is None:
-                next_ID = None
-            else:
-                next_ID = face.loop.next.ID
+    @staticmethod
+    def edgeDict(_edge):
+        edge_pts = _edge.segment.getPoints()
+        pts = []
+        for pt in edge_pts:
+            pts.append([pt.getX(), pt.getY()])
+
+        attributes = _edge.segment.attributes.copy()
+        if _edge.segment.nsudv is not None:
+            attributes.remove(_edge.segment.nsudv)
+        att_list = []
+        for att in attributes:
+            att_list.append(att['name'])
+
+        attributes_dict = {
+            "nsudv": _edge.segment.nsudv,
+            "att_names": att_list
+        }
 
-            # saves the external loop
-            he = face.loop.he
-            he_begin = he
+        if _edge.prev is None:
+            prev_ID = None
+        else:
+            prev_ID = _edge.prev.ID
 
-            if he is None:
-                he_list = None
-            else:
-                he_list = []
-                while True:
-
-                    he_dict = {
-                        'type': 'HALF-EDGE',
-                        'ID': he.ID,
-                        'prev_ID': he.prev.ID,
-                        'next_ID': he.next.ID,
-                        'vertex_ID': he.vertex.ID,
-                        'edge_ID': he.edge.ID,
-                        'loop_ID': he.loop.ID
-                    }
-
-                    he_list.append(he_dict)
-                    he = he.next
-
-                    if he == he_begin:
-                        break
-
-            loop_dict = {
-                'type': 'LOOP',
-                'ID': face.loop.ID,
-                'prev_ID': None,
-                'next_ID': next_ID,
-                'face_ID': face.ID,
-                'he_loop': he_list,
-                'isClosed': face.loop.isClosed
-
-            }
-
-            # saves the internal loops
-            intLoops = []
-            intLoop = face.loop.next
-            while intLoop is not None:
-
-                he = intLoop.he
-                he_begin = he
-
-                he_list = []
-                while True:
-
-                    if he.edge is None:
-                        edge_ID = None
-                    else:
-                        edge_ID = he.edge.ID
-
-                    he_dict = {
-                        'type': 'HALF-EDGE',
-                        'ID': he.ID,
-                        'prev_ID': he.prev.ID,
-                        'next_ID': he.next.ID,
-                        'vertex_ID': he.vertex.ID,
-                        'edge_ID': edge_ID,
-                        'loop_ID': he.loop.ID
-                    }
-
-                    he_list.append(he_dict)
-                    he = he.next
-
-                    if he == he_begin:
-                        break
-
-                if intLoop.next is None:
-                    next_ID = None
-                else:
-                    next_ID = intLoop.next.ID
-
-                intLoop_dict = {
-                    'type': 'LOOP',
-                    'ID': intLoop.ID,
-                    'prev_ID': intLoop.prev.ID,
-                    'next_ID': next_ID,
-                    'face_ID': face.ID,
-                    'he_loop': he_list,
-                    'isClosed': intLoop.isClosed
-                }
-
-                intLoops.append(intLoop_dict)
-                intLoop = intLoop.next
-
-            attributes = face.patch.attributes.copy()
-            if face.patch.mesh is not None:
-                mesh_dict = face.patch.mesh.mesh_dict
-                attributes.remove(mesh_dict)
-            else:
-                mesh_dict = None
+        if _edge.next is None:
+            next_ID = None
+        else:
+            next_ID = _edge.next.ID
+
+        edge_dict = {
+            'type': 'EDGE',
+            'ID': _edge.ID,
+            'prev_ID': prev_ID,
+            'next_ID': next_ID,
+            'he1_ID': _edge.he1.ID,
+            'he2_ID': _edge.he2.ID,
+            'segment_type': f'{_edge.segment.getType()}',
+            'points': pts,
+            'attributes': attributes_dict
+        }
 
-            att_list = []
-            for att in attributes:
-                att_list.append(att['name'])
+        return edge_dict
 
-            attributes_dict = {
-                'isDeleted': face.patch.isDeleted,
-                'mesh': mesh_dict,
-                "att_names": att_list
-            }
+    @staticmethod
+    def heDict(_he):
+        if _he.edge is None:
+            edge_ID = None
+        else:
+            edge_ID = _he.edge.ID
+
+        he_dict = {
+            'type': 'HALF-EDGE',
+            'ID': _he.ID,
+            'prev_ID': _he.prev.ID,
+            'next_ID': _he.next.ID,
+            'vertex_ID': _he.vertex.ID,
+            'edge_ID': edge_ID,
+            'loop_ID': _he.loop.ID
+        }
 
-            if face.prev is None:
-                prev_ID = None
-            else:
-                prev_ID = face.prev.ID
+        return he_dict
 
-            if face.next is None:
-                next_ID = None
-            else:
-                next_ID = face.next.ID
+    @staticmethod
+    def loopDict(_loop, _face):
+        if _loop.prev is None:
+            prev_ID = None
+        else:
+            prev_ID = _loop.prev.ID
 
-            face_dict = {
-                'type': 'FACE',
-                'ID': face.ID,
-                'prev_ID': prev_ID,
-                'next_ID': next_ID,
-                'loop': loop_dict,
-                'intLoops': intLoops,
-                'attributes': attributes_dict
-            }
+        if _loop.next is None:
+            next_ID = None
+        else:
+            next_ID = _loop.next.ID
 
-            faces_list.append(face_dict)
+        he = _loop.he
+        he_begin = he
 
-        shell = {
-            'type': 'SHELL',
-            'vertices': vertices_list,
-            'edges': edges_list,
-            'faces': faces_list,
-            'attributes_list': _attributes
+        if he is None:
+            he_list = None
+        else:
+            he_list = []
+            while True:
+                he_list.append(HeFile.heDict(he))
+                he = he.next
+
+                if he == he_begin:
+                    break
+
+        loop_dict = {
+            'type': 'LOOP',
+            'ID': _loop.ID,
+            'prev_ID': prev_ID,
+            'next_ID': next_ID,
+            'face_ID': _face.ID,
+            'he_loop': he_list,
+            'isClosed': _loop.isClosed
+        }
+
+        return loop_dict
+
+    @staticmethod
+    def faceDict(_face):
+
+        # saves the external loop
+        loop_dict = HeFile.loopDict(_face.loop, _face)
+
+        # saves the internal loops
+        intLoops = []
+        intLoop = _face.loop.next
+        while intLoop is not None:
+            intLoops.append(HeFile.loopDict(intLoop, _face))
+            intLoop = intLoop.next
+
+        attributes = _face.patch.attributes.copy()
+        if _face.patch.mesh is not None:
+            mesh_dict = _face.patch.mesh.mesh_dict
+            attributes.remove(mesh_dict)
+        else:
+            mesh_dict = None
+
+        att_list = []
+        for att in attributes:
+            att_list.append(att['name'])
+
+        attributes_dict = {
+            'isDeleted': _face.patch.isDeleted,
+            'mesh': mesh_dict,
+            "att_names": att_list
+        }
+
+        if _face.prev is None:
+            prev_ID = None
+        else:
+            prev_ID = _face.prev.ID
+
+        if _face.next is None:
+            next_ID = None
+        else:
+            next_ID = _face.next.ID
+
+        face_dict = {
+            'type': 'FACE',
+            'ID': _face.ID,
+            'prev_ID': prev_ID,
+            'next_ID': next_ID,
+            'loop': loop_dict,
+            'intLoops': intLoops,
+            'attributes': attributes_dict
         }
 
-        json.dump(shell, file, indent=4)
-        file.close()
+        return face_dict
 
+    # Loads a model saved in the JSON format (optionally compressed with
+    # gzip). The sections of the file are read one entity at a time, so that
+    # only the model and the references between its entities are kept.
     @ staticmethod
     def loadFile(_file):
-        with open(_file, 'r') as file:
-            input = json.load(file)
+        if _file.split('.')[-1] == 'heb':
+            return HeFile.loadBinaryFile(_file)
 
-        vertices = input['vertices']
-        edges = input['edges']
-        faces = input['faces']
-        attributes = input['attributes_list']
+        with open(_file, 'rb') as file:
+            isCompressed = file.read(2) == b'\x1f\x8b'
+
+        if isCompressed:
+            file = gzip.open(_file, 'rt')
+        else:
+            file = open(_file, 'r')
 
         # creates the shell
         shell = Shell()
+        vertices = []
+        edges = []
+        faces = []
+        attributes = []
+        vertex_map = {}  # vertex ID -> [vertex, ID of its he]
+        edge_map = {}  # edge ID -> [edge, ID of its he1]
+        att_names = []  # [entity attributes, names, nsudv] to be resolved
+        face_dicts = []  # faces read before the vertices or the edges
+        sections = {}  # keys already read
+
+        with file:
+            reader = JsonStreamReader(file)
+            for key in reader.keys():
+                if key == 'vertices':
+                    for vertex_dict in reader.items():
+                        vertices.append(HeFile.loadVertex(
+                            vertex_dict, vertex_map, att_names))
+
+                elif key == 'edges':
+                    for edge_dict in reader.items():
+                        edges.append(HeFile.loadEdge(
+                            edge_dict, edge_map, att_names))
+
+                elif key == 'faces':
+                    for face_dict in reader.items():
+                        if 'vertices' in sections and 'edges' in sections:
+                            faces.append(HeFile.loadFace(
+                                face_dict, shell, vertex_map, edge_map, att_names))
+                        else:
+                            face_dicts.append(face_dict)
+
+                elif key == 'attributes_list':
+                    attributes = reader.readValue()
 
-        # creates the edges
-        for edge_dict in edges:
-            edge = Edge()
-            edge.ID = edge_dict['ID']
+                else:
+                    reader.readValue()
 
-            # creates a key for the edge
-            edge_dict['edge'] = edge
+                sections[key] = None
 
-            # set edge segment
-            edge_pts = edge_dict['points']
-            pts = []
-            for pt in edge_pts:
-                pts.append(Point(pt[0], pt[1]))
+        for face_dict in face_dicts:
+            faces.append(HeFile.loadFace(
+                face_dict, shell, vertex_map, edge_map, att_names))
 
-            type = edge_dict['segment_type']
+        # attributes by name
+        att_map = {}
+        for attribute in attributes:
+            att_map.setdefault(attribute['name'], []).append(attribute)
 
-            if type == 'LINE':
-                segment = Line(pts[0], pts[1])
-            elif type == 'POLYLINE':
-                segment = Polyline(pts)
+        # set entity attributes
+        for entity_atts, names, nsudv in att_names:
+            for att_name in names:
+                entity_atts.extend(att_map.get(att_name, []))
+
+            if nsudv is not None:
+                entity_atts.append(nsudv)
+
+        # set shell face
+        shell.face = faces[0]
+
+        # set face prev/next
+        for i in range(1, len(faces)):
+            faces[i].prev = faces[i-1]
+            faces[i-1].next = faces[i]
+
+        return vertices, edges, faces, attributes
+
+    @staticmethod
+    def loadVertex(_vertex_dict, _vertex_map, _att_names):
+        vertex = Vertex()
+        vertex.ID = _vertex_dict['ID']
+
+        # set the point
+        pt = _vertex_dict['point']
+        vertex.point = Point(pt[0], pt[1])
+
+        # creates a key for the vertex
+        _vertex_map.setdefault(vertex.ID, [vertex, _vertex_dict['he_ID']])
+
+        # point attributes are set after the attribute list is read
+        names = _vertex_dict['attributes']['att_names']
+        if len(names) > 0:
+            _att_names.append([vertex.point.attributes, names, None])
+
+        return vertex
+
+    @staticmethod
+    def loadEdge(_edge_dict, _edge_map, _att_names):
+        edge = Edge()
+        edge.ID = _edge_dict['ID']
+
+        # set edge segment
+        edge_pts = _edge_dict['points']
+        pts = []
+        for pt in edge_pts:
+            pts.append(Point(pt[0], pt[1]))
+
+        type = _edge_dict['segment_type']
+
+        if type == 'LINE':
+            segment = Line(pts[0], pts[1])
+        elif type == 'POLYLINE':
+            segment = Polyline(pts)
+
+        edge.segment = segment
+
+        # creates a key for the edge
+        _edge_map.setdefault(edge.ID, [edge, _edge_dict['he1_ID']])
+
+        # segment attributes are set after the attribute list is read
+        names = _edge_dict['attributes']['att_names']
+        nsudv = _edge_dict['attributes']['nsudv']
+        if nsudv is not None:
+            segment.setNumberOfSubdivisions(nsudv)
+
+        if len(names) > 0 or nsudv is not None:
+            _att_names.append([segment.attributes, names, nsudv])
+
+        return edge
+
+    @staticmethod
+    def loadFace(_face_dict, _shell, _vertex_map, _edge_map, _att_names):
+        face = Face(_shell)
+        face.patch = Patch()
+        face.ID = _face_dict['ID']
+
+        # patch attributes are set after the attribute list is read
+        names = _face_dict['attributes']['att_names']
+        if len(names) > 0:
+            _att_names.append([face.patch.attributes, names, None])
+
+        # creates the outer loop
+        loop = HeFile.loadLoop(_face_dict['loop'], _vertex_map, _edge_map)
+        loop.face = face
+        face.loop = loop
+
+        # creates internal loops
+        for intLoop_dict in _face_dict['intLoops']:
+            intLoop = HeFile.loadLoop(intLoop_dict, _vertex_map, _edge_map)
+            intLoop.face = face
+
+            # set loop.prev/next
+            intLoop.prev = loop
+            loop.next = intLoop
+            loop = intLoop
+
+        # set attributes
+        attributes_dict = _face_dict['attributes']
+        face.patch.isDeleted = attributes_dict['isDeleted']
+
+        return face
+
+    @staticmethod
+    def loadLoop(_loop_dict, _vertex_map, _edge_map):
+        loop = Loop()
+        loop.ID = _loop_dict['ID']
+        loop.isClosed = _loop_dict['isClosed']
+
+        # creates the half-edges
+        he_dicts = _loop_dict['he_loop']
+        if he_dicts is None:
+            return loop
+
+        hes = []
+        for he_dict in he_dicts:
+            he = HalfEdge()
+            he.ID = he_dict['ID']
+            he.loop = loop
+            HeFile.resolveHalfEdge(he, he_dict, _vertex_map, _edge_map)
+            hes.append(he)
+
+        # set he.prev/next
+        hes[0].prev = hes[-1]
+        hes[-1].next = hes[0]
+        for i in range(1, len(hes)):
+            hes[i].prev = hes[i-1]
+            hes[i-1].next = hes[i]
+
+        # set loop.he
+        loop.he = hes[0]
+
+        return loop
+
+    # Saves the model in the binary format. The file starts with the magic
+    # bytes, the length of a JSON header (4-byte little-endian integer) and
+    # the header itself. The header holds the attribute table, the data that
+    # is not numeric and, for each array, its type ('float64' or 'int32'),
+    # offset and number of items. The arrays follow the header, starting at
+    # the first multiple of 8 bytes, in little-endian order and aligned to 8
+    # bytes, so that they can be read directly, e.g. with numpy.frombuffer
+    # over a memory map of the file. Their offsets are given from the start
+    # of the arrays.
+    # Entities are referred to by their indices in the arrays (-1 for none):
+    # loops are stored face by face (the outer loop first) and half-edges
+    # loop by loop (in their next order).
+    @staticmethod
+    def saveBinaryFile(_shell, _attributes, _filename):
+        vertices = list(_shell.vertices)
+        edges = list(_shell.edges)
+        faces = list(_shell.faces)
+
+        att_index = {}
+        for i in range(0, len(_attributes)):
+            att_index.setdefault(_attributes[i]['name'], i)
+
+        vertex_index = {}
+        for i in range(0, len(vertices)):
+            vertex_index[vertices[i]] = i
+
+        edge_index = {}
+        for i in range(0, len(edges)):
+            edge_index[edges[i]] = i
+
+        # numbers the loops and the half-edges
+        loops = []
+        loop_face = array('i')
+        for i in range(0, len(faces)):
+            loop = faces[i].loop
+            while loop is not None:
+                loops.append(loop)
+                loop_face.append(i)
+                loop = loop.next
+
+        hes = []
+        he_loop = array('i')
+        loop_he = array('i')
+        for i in range(0, len(loops)):
+            he_begin = loops[i].he
+            if he_begin is None:
+                loop_he.append(-1)
+                continue
+
+            loop_he.append(len(hes))
+            he = he_begin
+            while True:
+                hes.append(he)
+                he_loop.append(i)
+                he = he.next
+                if he == he_begin:
+                    break
+
+        he_index = {}
+        for i in range(0, len(hes)):
+            he_index[hes[i]] = i
+
+        arrays = {}
+
+        # vertices
+        vertex_xy = array('d')
+        vertex_att_ptr = array('i', [0])
+        vertex_att = array('i')
+        for vertex in vertices:
+            vertex_xy.append(vertex.point.getX())
+            vertex_xy.append(vertex.point.getY())
+            HeFile.packAttributes(vertex.point.attributes, att_index,
+                                  vertex_att_ptr, vertex_att)
+
+        arrays['vertex_id'] = array('i', [vertex.ID for vertex in vertices])
+        arrays['vertex_xy'] = vertex_xy
+        arrays['vertex_he'] = array('i', [he_index[vertex.he] for vertex in vertices])
+        arrays['vertex_att_ptr'] = vertex_att_ptr
+        arrays['vertex_att'] = vertex_att
+
+        # edges
+        edge_type = array('i')
+        edge_pts_ptr = array('i', [0])
+        edge_xy = array('d')
+        edge_att_ptr = array('i', [0])
+        edge_att = array('i')
+        nsudv = {}
+        for i in range(0, len(edges)):
+            segment = edges[i].segment
+            edge_type.append(HeFile.SEGMENT_TYPES.index(segment.getType()))
+            for pt in segment.getPoints():
+                edge_xy.append(pt.getX())
+                edge_xy.append(pt.getY())
+            edge_pts_ptr.append(len(edge_xy) // 2)
+
+            attributes = segment.attributes.copy()
+            if segment.nsudv is not None:
+                attributes.remove(segment.nsudv)
+                nsudv[str(i)] = segment.nsudv
+            HeFile.packAttributes(attributes, att_index, edge_att_ptr, edge_att)
+
+        arrays['edge_id'] = array('i', [edge.ID for edge in edges])
+        arrays['edge_type'] = edge_type
+        arrays['edge_he1'] = array('i', [he_index[edge.he1] for edge in edges])
+        arrays['edge_he2'] = array('i', [he_index[edge.he2] for edge in edges])
+        arrays['edge_pts_ptr'] = edge_pts_ptr
+        arrays['edge_xy'] = edge_xy
+        arrays['edge_att_ptr'] = edge_att_ptr
+        arrays['edge_att'] = edge_att
+
+        # half-edges
+        he_edge = array('i')
+        for he in hes:
+            if he.edge is None:
+                he_edge.append(-1)
+            else:
+                he_edge.append(edge_index[he.edge])
+
+        arrays['he_id'] = array('i', [he.ID for he in hes])
+        arrays['he_vertex'] = array('i', [vertex_index[he.vertex] for he in hes])
+        arrays['he_edge'] = he_edge
+        arrays['he_next'] = array('i', [he_index[he.next] for he in hes])
+        arrays['he_loop'] = he_loop
+
+        # loops
+        arrays['loop_id'] = array('i', [loop.ID for loop in loops])
+        arrays['loop_face'] = loop_face
+        arrays['loop_he'] = loop_he
+        arrays['loop_closed'] = array('i', [int(loop.isClosed) for loop in loops])
+
+        # faces
+        face_att_ptr = array('i', [0])
+        face_att = array('i')
+        meshes = {}
+        for i in range(0, len(faces)):
+            attributes = faces[i].patch.attributes.copy()
+            if faces[i].patch.mesh is not None:
+                mesh_dict = faces[i].patch.mesh.mesh_dict
+                attributes.remove(mesh_dict)
+                meshes[str(i)] = mesh_dict
+            HeFile.packAttributes(attributes, att_index, face_att_ptr, face_att)
 
-            edge.segment = segment
+        arrays['face_id'] = array('i', [face.ID for face in faces])
+        arrays['face_deleted'] = array('i', [int(face.patch.isDeleted) for face in faces])
+        arrays['face_att_ptr'] = face_att_ptr
+        arrays['face_att'] = face_att
 
-            # set segment attributes
-            att_names = edge_dict['attributes']['att_names']
-            for att_name in att_names:
-                for attribute in attributes:
-                    if att_name == attribute['name']:
-                        segment.attributes.append(attribute)
+        table = {}
+        offset = 0
+        for name in arrays:
+            table[name] = [HeFile.binaryType(arrays[name]), offset, len(arrays[name])]
+            offset += HeFile.alignedSize(arrays[name].itemsize * len(arrays[name]))
+
+        header = {
+            'type': 'SHELL',
+            'version': 1,
+            'arrays': table,
+            'nsudv': nsudv,
+            'meshes': meshes,
+            'attributes_list': _attributes
+        }
+        header_bytes = json.dumps(header).encode('utf-8')
+        start = HeFile.alignedSize(8 + len(header_bytes))
+
+        with open(_filename, 'wb') as file:
+            file.write(HeFile.BINARY_MAGIC)
+            file.write(struct.pack('<I', len(header_bytes)))
+            file.write(header_bytes)
+            file.write(b' ' * (start - 8 - len(header_bytes)))
+
+            for name in arrays:
+                values = arrays[name]
+                if sys.byteorder != 'little':
+                    values = array(values.typecode, values)
+                    values.byteswap()
+                data = values.tobytes()
+                file.write(data)
+                file.write(bytes(HeFile.alignedSize(len(data)) - len(data)))
+
+    # Loads a model saved in the binary format. It returns the same data as
+    # loadFile.
+    @staticmethod
+    def loadBinaryFile(_file):
+        with open(_file, 'rb') as file:
+            data = file.read()
+
+        if data[0:4] != HeFile.BINARY_MAGIC:
+            print('ERROR: the file is not in the binary model format')
+            raise ValueError
+
+        header_size = struct.unpack('<I', data[4:8])[0]
+        header = json.loads(data[8:8+header_size].decode('utf-8'))
+        attributes = header['attributes_list']
+        start = HeFile.alignedSize(8 + header_size)
+
+        view = memoryview(data)
+        arrays = {}
+        for name, (type, offset, count) in header['arrays'].items():
+            values = array('d' if type == 'float64' else 'i')
+            offset += start
+            values.frombytes(view[offset:offset + values.itemsize*count])
+            if sys.byteorder != 'little':
+                values.byteswap()
+            arrays[name] = values
 
-            if edge_dict['attributes']['nsudv'] is not None:
-                segment.setNumberOfSubdivisions(
-                    edge_dict['attributes']['nsudv'])
-                segment.attributes.append(edge_dict['attributes']['nsudv'])
+        shell = Shell()
 
         # creates the vertices
-        for vertex_dict in vertices:
-            vertex = Vertex()
-            vertex.ID = vertex_dict['ID']
+        vertex_id = arrays['vertex_id']
+        vertex_xy = arrays['vertex_xy']
+        vertex_att_ptr = arrays['vertex_att_ptr']
+        vertex_att = arrays['vertex_att']
+        vertices = []
+        for i in range(0, len(vertex_id)):
+            vertex = Vertex(Point(vertex_xy[2*i], vertex_xy[2*i+1]))
+            vertex.ID = vertex_id[i]
+            for k in range(vertex_att_ptr[i], vertex_att_ptr[i+1]):
+                vertex.point.attributes.append(attributes[vertex_att[k]])
+            vertices.append(vertex)
+
+        # creates the edges
+        edge_id = arrays['edge_id']
+        edge_type = arrays['edge_type']
+        edge_pts_ptr = arrays['edge_pts_ptr']
+        edge_xy = arrays['edge_xy']
+        edge_att_ptr = arrays['edge_att_ptr']
+        edge_att = arrays['edge_att']
+        nsudv = header['nsudv']
+        edges = []
+        for i in range(0, len(edge_id)):
+            pts = []
+            for k in range(edge_pts_ptr[i], edge_pts_ptr[i+1]):
+                pts.append(Point(edge_xy[2*k], edge_xy[2*k+1]))
+
+            if HeFile.SEGMENT_TYPES[edge_type[i]] == 'LINE':
+                segment = Line(pts[0], pts[1])
+            else:
+                segment = Polyline(pts)
 
-            # creates a key for the vertex
-            vertex_dict['vertex'] = vertex
+            for k in range(edge_att_ptr[i], edge_att_ptr[i+1]):
+                segment.attributes.append(attributes[edge_att[k]])
 
-            # set the point
-            pt = vertex_dict['point']
-            vertex.point = Point(pt[0], pt[1])
+            if str(i) in nsudv:
+                segment.setNumberOfSubdivisions(nsudv[str(i)])
+                segment.attributes.append(nsudv[str(i)])
 
-            # set point attributes
-            att_names = vertex_dict['attributes']['att_names']
-            for att_name in att_names:
-                for attribute in attributes:
-                    if att_name == attribute['name']:
-                        vertex.point.attributes.append(attribute)
+            edge = Edge(segment)
+            edge.ID = edge_id[i]
+            edges.append(edge)
 
         # creates the faces
-        for face_dict in faces:
+        face_id = arrays['face_id']
+        face_deleted = arrays['face_deleted']
+        face_att_ptr = arrays['face_att_ptr']
+        face_att = arrays['face_att']
+        faces = []
+        for i in range(0, len(face_id)):
             face = Face(shell)
             face.patch = Patch()
-            face.ID = face_dict['ID']
-
-            # set patch attributes
-            att_names = face_dict['attributes']['att_names']
-            for att_name in att_names:
-                for attribute in attributes:
-                    if att_name == attribute['name']:
-                        face.patch.attributes.append(attribute)
-
-            # creates a key for the face
-            face_dict['face'] = face
-
-            # creates the outer loop
-            loop_dict = face_dict['loop']
-            loop = Loop(face)
-            loop.ID = loop_dict['ID']
-            loop.isClosed = loop_dict['isClosed']
-
-            # creates the half-edges
-            he_dicts = loop_dict['he_loop']
-            if he_dicts is not None:
-                for he_dict in he_dicts:
-                    he = HalfEdge()
-                    he.ID = he_dict['ID']
-                    he.loop = loop
-
-                    # creates a key for the he
-                    he_dict['he'] = he
-
-                    # set he.vertex and vertex.he
-                    for vertex_dict in vertices:
-                        if he_dict['vertex_ID'] == vertex_dict['ID']:
-                            he.vertex = vertex_dict['vertex']
-
-                            if vertex_dict['he_ID'] == he.ID:
-                                he.vertex.he = he
-
-                            break
-
-                    # set he.edge and edge.he(1 or 2)
-                    for edge_dict in edges:
-                        if he_dict['edge_ID'] == edge_dict['ID']:
-                            he.edge = edge_dict['edge']
-
-                            if edge_dict['he1_ID'] == he.ID:
-                                he.edge.he1 = he
-                                he.edge.segment.setInitPoint(he.vertex.point)
-                            else:
-                                he.edge.he2 = he
-                                he.edge.segment.setEndPoint(he.vertex.point)
-
-                            break
-
-                # set he.prev/next
-                he_dicts[0]['he'].prev = he_dicts[-1]['he']
-                he_dicts[-1]['he'].next = he_dicts[0]['he']
-                for i in range(1, len(he_dicts)):
-                    he_dicts[i]['he'].prev = he_dicts[i-1]['he']
-                    he_dicts[i-1]['he'].next = he_dicts[i]['he']
-
-                # set loop.he
-                loop.he = he_dicts[0]['he']
-
-            # creates internal loops
-            intLoops_list = []
-            intLoops_dict = face_dict['intLoops']
-            for intLoop_dict in intLoops_dict:
-                intLoop = Loop()
-                intLoop.face = face
-                intLoop.ID = intLoop_dict['ID']
-                intLoop.isClosed = intLoop_dict['isClosed']
-                intLoops_list.append(intLoop)
-
-                # creates the half-edges
-                he_dicts = intLoop_dict['he_loop']
-                for he_dict in he_dicts:
-                    he = HalfEdge()
-                    he.ID = he_dict['ID']
-                    he.loop = intLoop
-
-                    # creates a key for the he
-                    he_dict['he'] = he
-
-                    # set he.vertex and vertex.he
-                    for vertex_dict in vertices:
-                        if he_dict['vertex_ID'] == vertex_dict['ID']:
-                            he.vertex = vertex_dict['vertex']
-
-                            if vertex_dict['he_ID'] == he.ID:
-                                he.vertex.he = he
-
-                            break
-
-                    # set he.edge and edge.he(1 or 2)
-                    for edge_dict in edges:
-                        if he_dict['edge_ID'] == edge_dict['ID']:
-                            he.edge = edge_dict['edge']
-
-                            if edge_dict['he1_ID'] == he.ID:
-                                he.edge.he1 = he
-                                he.edge.segment.setInitPoint(he.vertex.point)
-                            else:
-                                he.edge.he2 = he
-                                he.edge.segment.setEndPoint(he.vertex.point)
-
-                # set he.prev/next
-                he_dicts[0]['he'].prev = he_dicts[-1]['he']
-                he_dicts[-1]['he'].next = he_dicts[0]['he']
-                for i in range(1, len(he_dicts)):
-                    he_dicts[i]['he'].prev = he_dicts[i-1]['he']
-                    he_dicts[i-1]['he'].next = he_dicts[i]['he']
-
-                # set loop.he
-                intLoop.he = he_dicts[0]['he']
+            face.ID = face_id[i]
+            face.patch.isDeleted = bool(face_deleted[i])
+            for k in range(face_att_ptr[i], face_att_ptr[i+1]):
+                face.patch.attributes.append(attributes[face_att[k]])
+
+            if i > 0:
+                face.prev = faces[i-1]
+                faces[i-1].next = face
+            faces.append(face)
+
+        # creates the loops, the first one of each face being its outer loop
+        loop_id = arrays['loop_id']
+        loop_face = arrays['loop_face']
+        loop_closed = arrays['loop_closed']
+        loops = []
+        for i in range(0, len(loop_id)):
+            face = faces[loop_face[i]]
+            loop = Loop()
+            loop.face = face
+            loop.ID = loop_id[i]
+            loop.isClosed = bool(loop_closed[i])
+
+            if face.loop is None:
+                face.loop = loop
+            else:
+                loop.prev = loops[-1]
+                loops[-1].next = loop
+            loops.append(loop)
+
+        # creates the half-edges
+        he_id = arrays['he_id']
+        he_vertex = arrays['he_vertex']
+        he_edge = arrays['he_edge']
+        he_loop = arrays['he_loop']
+        hes = []
+        for i in range(0, len(he_id)):
+            he = HalfEdge(vertices[he_vertex[i]], loops[he_loop[i]])
+            he.ID = he_id[i]
+            if he_edge[i] >= 0:
+                he.edge = edges[he_edge[i]]
+            hes.append(he)
+
+        he_next = arrays['he_next']
+        for i in range(0, len(hes)):
+            hes[i].next = hes[he_next[i]]
+            hes[he_next[i]].prev = hes[i]
+
+        loop_he = arrays['loop_he']
+        for i in range(0, len(loops)):
+            if loop_he[i] >= 0:
+                loops[i].he = hes[loop_he[i]]
+
+        vertex_he = arrays['vertex_he']
+        for i in range(0, len(vertices)):
+            vertices[i].he = hes[vertex_he[i]]
+
+        edge_he1 = arrays['edge_he1']
+        edge_he2 = arrays['edge_he2']
+        for i in range(0, len(edges)):
+            edge = edges[i]
+            edge.he1 = hes[edge_he1[i]]
+            edge.he2 = hes[edge_he2[i]]
+            edge.segment.setInitPoint(edge.he1.vertex.point)
+            edge.segment.setEndPoint(edge.he2.vertex.point)
+
+        shell.face = faces[0]
 
-            # set loop.prev/next
-            if len(intLoops_list) > 0:
-                intLoops_list[0].prev = loop
-                loop.next = intLoops_list[0]
+        return vertices, edges, faces, attributes
 
-            for i in range(1, len(intLoops_list)):
-                intLoops_list[i].prev = intLoops_list[i-1]
-                intLoops_list[i-1].next = intLoops_list[i]
+    # Sets the vertex and the edge of a loaded half-edge from their IDs, and
+    # the half-edge of the vertex and of the edge when it refers to it
+    @staticmethod
+    def resolveHalfEdge(_he, _he_dict, _vertex_map, _edge_map):
 
-            # set attributes
-            attributes_dict = face_dict['attributes']
-            face.patch.isDeleted = attributes_dict['isDeleted']
+        # set he.vertex and vertex.he
+        vertex_ref = _vertex_map.get(_he_dict['vertex_ID'])
+        if vertex_ref is not None:
+            _he.vertex = vertex_ref[0]
 
-        # set shell face
-        shell.face = faces[0]['face']
+            if vertex_ref[1] == _he.ID:
+                _he.vertex.he = _he
 
-        # set face prev/next
-        for i in range(1, len(faces)):
-            faces[i]['face'].prev = faces[i-1]['face']
-            faces[i-1]['face'].next = faces[i]['face']
+        # set he.edge and edge.he(1 or 2)
+        edge_ref = _edge_map.get(_he_dict['edge_ID'])
+        if edge_ref is not None:
+            _he.edge = edge_ref[0]
 
-        return vertices, edges, faces, attributes
+            if edge_ref[1] == _he.ID:
+                _he.edge.he1 = _he
+                _he.edge.segment.setInitPoint(_he.vertex.point)
+            else:
+                _he.edge.he2 = _he
+                _he.edge.segment.setEndPoint(_he.vertex.point)
+
+    # Appends the indices of the given attributes in the attribute table
+    @staticmethod
+    def packAttributes(_attributes, _att_index, _att_ptr, _att):
+        for att in _attributes:
+            if att['name'] in _att_index:
+                _att.append(_att_index[att['name']])
+        _att_ptr.append(len(_att))
+
+    @staticmethod
+    def binaryType(_values):
+        if _values.typecode == 'd':
+            return 'float64'
+        return 'int32'
+
+    @staticmethod
+    def alignedSize(_size):
+        return (_size + 7) // 8 * 8
@@ -1,4 +1,6 @@
-from hetool.compgeom.compgeom import CompGeom
+import math
+from hetool.compgeom.spatialindex import SpatialIndex
+from hetool.he.entitylist import EntityList
 from hetool.geometry.point import Point
 from hetool.geometry.segments.polyline import Polyline
 
@@ -8,10 +10,21 @@ class HeModel:
     def __init__(self):
         self.shell = None
         self.infinityFace = None
-        self.segments = []
-        self.points = []
+        self.segments = EntityList()
+        self.points = EntityList()
         self.patches = []
+        self.selectedPoints = EntityList()
+        self.selectedSegments = EntityList()
+        self.selectedPatches = EntityList()
         self.updateSortPatches = False
+        self.boundBox = None  # bounding box of the points and segments
+        self.updateBoundBox = False
+        self.vertexIndex = SpatialIndex()
+        self.edgeIndex = SpatialIndex()
+        self.faceIndex = SpatialIndex()
+        self.faceParents = {}  # face -> face in whose hole it lies
+        self.faceChildren = {}  # face -> faces that lie in its holes
+        self.orphanFaces = {}  # faces whose parents have been removed
 
     def insertShell(self, _shell):
         self.shell = _shell
@@ -20,11 +33,20 @@ class HeModel:
         self.shell.insertVertex(_vertex)
         self.points.append(_vertex.point)
         _vertex.point.vertex = _vertex
+        HeModel.trackSelection(_vertex.point, self.selectedPoints)
+        x = _vertex.point.getX()
+        y = _vertex.point.getY()
+        self.vertexIndex.insert(_vertex, x, x, y, y)
+        self.extendBoundBox(x, x, y, y)
 
     def insertEdge(self, _edge):
         self.shell.insertEdge(_edge)
         self.segments.append(_edge.segment)
         _edge.segment.edge = _edge
+        HeModel.trackSelection(_edge.segment, self.selectedSegments)
+        xmin, xmax, ymin, ymax = _edge.segment.getBoundBox()
+        self.edgeIndex.insert(_edge, xmin, xmax, ymin, ymax)
+        self.extendBoundBox(xmin, xmax, ymin, ymax)
 
     def insertFace(self, _face):
 
@@ -33,12 +55,17 @@ class HeModel:
 
         self.shell.insertFace(_face)
         _face.patch.face = _face
+        HeModel.trackSelection(_face.patch, self.selectedPatches)
         self.updateSortPatches = True
 
     def removeVertex(self, _vertex):
         _vertex.point.vertex = None
         self.shell.removeVertex(_vertex)
         self.points.remove(_vertex.point)
+        HeModel.untrackSelection(_vertex.point)
+        xmin, xmax, ymin, ymax = self.vertexIndex.getBox(_vertex)
+        self.vertexIndex.remove(_vertex)
+        self.shrinkBoundBox(xmin, xmax, ymin, ymax)
 
     def removeFace(self, _face):
         if _face == self.infinityFace:
@@ -46,12 +73,27 @@ class HeModel:
 
         self.shell.removeFace(_face)
         _face.patch.face = None
+        HeModel.untrackSelection(_face.patch)
+        self.faceIndex.remove(_face)
         self.updateSortPatches = True
 
+        # detach the face from the containment tree
+        parent = self.faceParents.pop(_face, None)
+        if parent is not None:
+            self.faceChildren[parent].pop(_face, None)
+        self.orphanFaces.pop(_face, None)
+        for child in self.faceChildren.pop(_face, {}):
+            del self.faceParents[child]
+            self.orphanFaces[child] = None
+
     def removeEdge(self, _edge):
         self.shell.removeEdge(_edge)
         self.segments.remove(_edge.segment)
         _edge.segment.edge = None
+        HeModel.untrackSelection(_edge.segment)
+        xmin, xmax, ymin, ymax = self.edgeIndex.getBox(_edge)
+        self.edgeIndex.remove(_edge)
+        self.shrinkBoundBox(xmin, xmax, ymin, ymax)
 
     def removeShell(self):
         self.shell = None
@@ -65,10 +107,21 @@ class HeModel:
     def clearAll(self):
         self.shell = None
         self.infinityFace = None
-        self.segments = []
-        self.points = []
+        self.segments = EntityList()
+        self.points = EntityList()
         self.patches = []
+        self.selectedPoints = EntityList()
+        self.selectedSegments = EntityList()
+        self.selectedPatches = EntityList()
         self.updateSortPatches = False
+        self.boundBox = None
+        self.updateBoundBox = False
+        self.vertexIndex.clear()
+        self.edgeIndex.clear()
+        self.faceIndex.clear()
+        self.faceParents = {}
+        self.faceChildren = {}
+        self.orphanFaces = {}
 
     def getPoints(self):
         return self.points
@@ -76,6 +129,40 @@ class HeModel:
     def getSegments(self):
         return self.segments
 
+    # Returns the bounding box of the points and segments of the model, or
+    # None if there are none. It is extended on each insertion and only
+    # recomputed (from the spatial indexes) after the removal of an entity
+    # that touched its boundary.
+    def getBoundBox(self):
+        if self.updateBoundBox:
+            self.updateBoundBox = False
+            self.boundBox = None
+            for index in (self.vertexIndex, self.edgeIndex):
+                bound_box = index.getBoundBox()
+                if bound_box is not None:
+                    self.extendBoundBox(*bound_box)
+
+        return self.boundBox
+
+    def extendBoundBox(self, _xmin, _xmax, _ymin, _ymax):
+        if self.updateBoundBox:
+            return
+
+        if self.boundBox is None:
+            self.boundBox = (_xmin, _xmax, _ymin, _ymax)
+        else:
+            xmin, xmax, ymin, ymax = self.boundBox
+            self.boundBox = (min(xmin, _xmin), max(xmax, _xmax),
+                             min(ymin, _ymin), max(ymax, _ymax))
+
+    def shrinkBoundBox(self, _xmin, _xmax, _ymin, _ymax):
+        if self.updateBoundBox or self.boundBox is None:
+            return
+
+        xmin, xmax, ymin, ymax = self.boundBox
+        if _xmin <= xmin or _xmax >= xmax or _ymin <= ymin or _ymax >= ymax:
+            self.updateBoundBox = True
+
     def getPatches(self):
         if not self.isEmpty():
             if self.updateSortPatches:
@@ -83,69 +170,111 @@ class HeModel:
 
         return self.patches
 
+    # Makes the selection of a point, segment or patch inserted in the model
+    # be tracked in the given list of selected entities, which is kept up to
+    # date by setSelected
+    @staticmethod
+    def trackSelection(_entity, _selection):
+        _entity.selection = _selection
+        if _entity.isSelected():
+            _selection.append(_entity)
+
+    @staticmethod
+    def untrackSelection(_entity):
+        if _entity.selection is not None:
+            _entity.selection.discard(_entity)
+            _entity.selection = None
+
+    # The selected entities are taken from the lists of selected entities, so
+    # that the cost depends on the number of selected entities only. They are
+    # sorted by their IDs, so that commands on the selection do not depend on
+    # the order in which the entities were selected.
     def selectedEdges(self):
-        selectedEdges = []
-
-        if self.isEmpty():
-            return selectedEdges
-
-        edges = self.shell.edges
-        for edge in edges:
-            if edge.segment.isSelected():
-                selectedEdges.append(edge)
-
+        selectedEdges = [segment.edge for segment in self.selectedSegments]
+        selectedEdges.sort(key=lambda edge: edge.ID)
         return selectedEdges
 
     def selectedVertices(self):
-
-        selectedVertices = []
-
-        if self.isEmpty():
-            return selectedVertices
-
-        vertices = self.shell.vertices
-        for vertex in vertices:
-            if vertex.point.isSelected():
-                selectedVertices.append(vertex)
-
+        selectedVertices = [point.vertex for point in self.selectedPoints]
+        selectedVertices.sort(key=lambda vertex: vertex.ID)
         return selectedVertices
 
     def selectedFaces(self):
-
-        selectedFaces = []
-        if self.isEmpty():
-            return selectedFaces
-
-        faces = self.shell.faces
-        for face in faces:
-            if face.patch.isSelected():
-                selectedFaces.append(face)
-
+        selectedFaces = [patch.face for patch in self.selectedPatches]
+        selectedFaces.sort(key=lambda face: face.ID)
         return selectedFaces
 
     def verticesCrossingWindow(self, _xmin, _xmax, _ymin, _ymax):
-        vertices = []
         # search the points that are contained in the given rectangle
-        vertices_list = self.shell.vertices
-        for vertex in vertices_list:
-            if _xmin <= vertex.point.getX() and _xmax >= vertex.point.getX():
-                if _ymin <= vertex.point.getY() and _ymax >= vertex.point.getY():
-                    # then point is in window
-                    vertices.append(vertex)
-
-        vertices = list(set(vertices))
+        return self.vertexIndex.query(_xmin, _xmax, _ymin, _ymax)
+
+    # Returns the vertex of the model whose point is equal to the given point
+    # within the tolerance, or None if there is not any. If there is more than
+    # one, the last inserted vertex is returned.
+    def findVertex(self, _pt, _tol):
+        x = _pt.getX()
+        y = _pt.getY()
+        vertices = self.vertexIndex.query(x - _tol, x + _tol, y - _tol, y + _tol)
+        for vertex in reversed(vertices):
+            if abs(vertex.point.x - x) < _tol and abs(vertex.point.y - y) < _tol:
+                return vertex
+
+        return None
+
+    # Returns the edges whose segments may lie within the tolerance of
+    # the given point
+    def edgesNearPoint(self, _pt, _tol):
+        x = _pt.getX()
+        y = _pt.getY()
+        return self.edgeIndex.query(x - _tol, x + _tol, y - _tol, y + _tol)
+
+    # Returns the vertex nearest to the given point among the ones closer than
+    # the tolerance, or None if there is not any
+    def nearestVertex(self, _x, _y, _tol):
+        target = None
+        dmin = _tol
+
+        vertices = self.vertexIndex.query(_x - _tol, _x + _tol, _y - _tol, _y + _tol)
+        for vertex in vertices:
+            dx = _x - vertex.point.getX()
+            dy = _y - vertex.point.getY()
+            if abs(dx) < _tol and abs(dy) < _tol:
+                d = math.sqrt(dx*dx + dy*dy)
+                if d < dmin:
+                    dmin = d
+                    target = vertex
+
+        return target
+
+    # Returns the edge whose segment is nearest to the given point among the
+    # ones closer than the tolerance, and the closest point of its segment,
+    # or None if there is not any
+    def nearestEdge(self, _x, _y, _tol):
+        target = None
+        xClst = _x
+        yClst = _y
+        dmin = _tol
+
+        edges = self.edgeIndex.query(_x - _tol, _x + _tol, _y - _tol, _y + _tol)
+        for edge in edges:
+            xC, yC, d = edge.segment.closestPoint(_x, _y)
+            if d < dmin:
+                xClst = xC
+                yClst = yC
+                dmin = d
+                target = edge
 
-        return vertices
+        return target, xClst, yClst
 
     def edgesInWindow(self, _xmin, _xmax, _ymin, _ymax):
 
         edges_targets = []
 
         # search the edges that are contained in the given rectangle
-        edges_list = self.shell.edges
+        # among the ones whose bounding boxes overlap it
+        edges_list = self.edgeIndex.query(_xmin, _xmax, _ymin, _ymax)
         for edge in edges_list:
-            edge_segment = edge.segment
-            edg_xmin, edg_xmax, edg_ymin, edg_ymax = edge_segment.getBoundBox()
+            edg_xmin, edg_xmax, edg_ymin, edg_ymax = self.edgeIndex.getBox(edge)
 
             if _xmin <= edg_xmin and _xmax >= edg_xmax:
                 if _ymin <= edg_ymin and _ymax >= edg_ymax:
@@ -161,22 +290,15 @@ class HeModel:
         xmin, xmax, ymin, ymax = _fence.getBoundBox()
 
         # get segments crossing fence's bounding box
-        edges_list = self.shell.edges
-        for edge in edges_list:
-            segment = edge.segment
-            segment_xmin, segment_xmax, segment_ymin, segment_ymax = segment.getBoundBox()
-
-            if not (xmax < segment_xmin or segment_xmax < xmin or
-                    ymax < segment_ymin or segment_ymax < ymin):
-                edges_targets.append(edge)
+        edges_list = self.edgeIndex.query(xmin, xmax, ymin, ymax)
 
         # Checks if the segment intersects the _fence
-        for edge in edges_targets:
+        for edge in edges_list:
             status, pi, param1, param2 = _fence.intersectSegment(edge.segment)
 
-            # If it does not, remove the edge from edgesInFence and go to next edge
-            if not status:
-                edges_targets.remove(edge)
+            # If it does, add the edge to the crossing edges
+            if status:
+                edges_targets.append(edge)
 
         return edges_targets
 
@@ -201,56 +323,253 @@ class HeModel:
         edges_crossing = self.edgesCrossingFence(fence_segment)
         edges.extend(edges_crossing)
 
-        edges = list(set(edges))  # remove duplicates
+        edges = list(dict.fromkeys(edges))  # remove duplicates
 
         return edges
 
+    # Returns the patches of the model and, as NumPy arrays in the same
+    # order, their areas, perimeters, centroid coordinates and second moments
+    # of area about the centroidal axes parallel to the x and y axes.
+    # NumPy is only required by this method.
+    def patchProperties(self):
+        from hetool.compgeom.compgeomarray import CompGeomArray
+
+        patches = self.getPatches()
+        x1 = []
+        y1 = []
+        x2 = []
+        y2 = []
+        ids = []
+
+        # oriented line segments of the boundary and the holes of each patch
+        for k in range(0, len(patches)):
+            patch = patches[k]
+            loops = [(patch.segments, patch.segmentOrients)]
+            for i in range(0, len(patch.holes)):
+                loops.append((patch.holes[i], patch.holesOrients[i]))
+
+            for segments, orients in loops:
+                for i in range(0, len(segments)):
+                    pts = segments[i].getPoints()
+                    if not orients[i]:
+                        pts = pts[::-1]
+
+                    for j in range(0, len(pts)-1):
+                        x1.append(pts[j].getX())
+                        y1.append(pts[j].getY())
+                        x2.append(pts[j+1].getX())
+                        y2.append(pts[j+1].getY())
+                        ids.append(k)
+
+        area, perimeter, cx, cy, ixx, iyy, ixy = CompGeomArray.sectionProperties(
+            x1, y1, x2, y2, ids, len(patches))
+
+        return patches, area, perimeter, cx, cy, ixx, iyy, ixy
+
+    # Updates the bounding boxes of the faces whose boundaries have changed
+    # in the spatial index of faces
+    def updateFaceIndex(self):
+        faces = self.shell.popChangedBoundaries()
+        for face in faces:
+            bound_box = face.patch.getBoundBox()
+
+            if face == self.infinityFace or bound_box is None:
+                self.faceIndex.remove(face)
+            else:
+                xmin, xmax, ymin, ymax = bound_box
+                self.faceIndex.insert(face, xmin, xmax, ymin, ymax)
+
+    # Returns the faces (other than the infinity face) whose patches contain
+    # the given point
+    def facesContainingPoint(self, _pt):
+        self.updateFaceIndex()
+
+        x = _pt.getX()
+        y = _pt.getY()
+        faces = self.faceIndex.query(x, x, y, y)
+        return [face for face in faces if face.patch.isPointInside(_pt)]
+
+    # Returns the faces (other than the infinity face) whose patches are
+    # contained in the given rectangle
+    def facesInWindow(self, _xmin, _xmax, _ymin, _ymax):
+        self.updateFaceIndex()
+
+        faces_targets = []
+        faces = self.faceIndex.query(_xmin, _xmax, _ymin, _ymax)
+        for face in faces:
+            xmin, xmax, ymin, ymax = self.faceIndex.getBox(face)
+            if _xmin <= xmin and _xmax >= xmax and _ymin <= ymin and _ymax >= ymax:
+                faces_targets.append(face)
+
+        return faces_targets
+
     def whichFace(self, _pt):
-        face = self.infinityFace.next
+        self.updateFaceIndex()
 
-        while face is not None:
+        # only the faces whose bounding boxes contain the point are checked
+        x = _pt.getX()
+        y = _pt.getY()
+        faces = self.faceIndex.query(x, x, y, y)
+        for face in faces:
             if face.patch.isPointInside(_pt):
                 return face
 
-            face = face.next
+        return self.infinityFace
+
+    # Updates the containment tree of faces after the topology of the given
+    # faces has changed. The parent of a face is the face in whose hole it
+    # lies (the infinity face for the outermost ones). Faces connected through
+    # their outer loops lie in the same hole, so that a whole group of faces
+    # is only visited when it has been moved to a different hole.
+    def updateContainment(self, _faces):
+        changed = {}
+        for face in _faces:
+            if face.patch.face is face:
+                changed[face] = None
+        for face in self.orphanFaces:
+            changed[face] = None
+        self.orphanFaces = {}
+
+        resolved = {}
+
+        # the faces that lie in the holes of a changed face are assigned to it
+        for face in changed:
+            loop = face.loop.next
+            while loop is not None:
+                child = self.faceInLoop(loop)
+                if child is not None and child not in resolved:
+                    if self.faceParents.get(child) is not face:
+                        self.floodFaceParent(child, face, resolved)
+                loop = loop.next
+
+        # the remaining changed faces get the parent of a neighbor face
+        for face in changed:
+            if face is not self.infinityFace and face not in resolved:
+                parent = self.findFaceParent(face, changed, resolved)
+                self.setFaceParent(face, parent)
+                resolved[face] = None
+
+        # faces that were in a hole which is now part of the outer loop of
+        # a changed face lie in the same hole as this face
+        for face in changed:
+            if face is self.infinityFace:
+                continue
+
+            parent = self.faceParents[face]
+            he_begin = face.loop.he
+            he = he_begin
+            while True:
+                loop = he.mate().loop
+                if loop.face.loop is loop and self.faceParents.get(loop.face) is face:
+                    self.floodFaceParent(loop.face, parent, {})
+
+                he = he.next
+                if he == he_begin:
+                    break
+
+    # Returns the face on the other side of an inner loop, or None if the
+    # loop does not enclose any face
+    def faceInLoop(self, _loop):
+        he_begin = _loop.he
+        if he_begin is None or he_begin.edge is None:
+            return None
+
+        he = he_begin
+        while True:
+            loop = he.mate().loop
+            if loop is not _loop:
+                return loop.face
+
+            he = he.next
+            if he == he_begin:
+                return None
+
+    # Searches the faces connected to the given face through their outer
+    # loops until a hole that encloses them, or a face whose parent is known,
+    # is found
+    def findFaceParent(self, _face, _changed, _resolved):
+        visited = {_face: None}
+        queue = [_face]
+
+        for face in queue:
+            he_begin = face.loop.he
+            he = he_begin
+            while True:
+                loop = he.mate().loop
+                neighbor = loop.face
+
+                if neighbor.loop is not loop:
+                    return neighbor
+
+                if neighbor not in visited:
+                    parent = self.faceParents.get(neighbor)
+                    if parent is not None and parent not in visited and \
+                            (neighbor not in _changed or neighbor in _resolved):
+                        return parent
+
+                    visited[neighbor] = None
+                    queue.append(neighbor)
+
+                he = he.next
+                if he == he_begin:
+                    break
 
         return self.infinityFace
 
+    # Assigns the given parent to the face and to all the faces connected to
+    # it through their outer loops
+    def floodFaceParent(self, _face, _parent, _visited):
+        _visited[_face] = None
+        stack = [_face]
+
+        while len(stack) > 0:
+            face = stack.pop()
+            self.setFaceParent(face, _parent)
+
+            he_begin = face.loop.he
+            he = he_begin
+            while True:
+                loop = he.mate().loop
+                neighbor = loop.face
+                if neighbor.loop is loop and neighbor not in _visited:
+                    _visited[neighbor] = None
+                    stack.append(neighbor)
+
+                he = he.next
+                if he == he_begin:
+                    break
+
+    def setFaceParent(self, _face, _parent):
+        old_parent = self.faceParents.get(_face)
+        if old_parent is _parent:
+            return
+
+        if old_parent is not None:
+            self.faceChildren[old_parent].pop(_face, None)
+
+        self.faceParents[_face] = _parent
+        self.faceChildren.setdefault(_parent, {})[_face] = None
+        self.updateSortPatches = True
+
+    # The faces with holes are ordered by a traversal of the containment tree
+    # from the infinity face, so that each one comes before the faces that lie
+    # in its holes. The patches without holes are placed at the end.
     def sortPatches(self):
+        sort_patches = []
         patchesWithoutHoles = []
-        facesWithHoles = []
-
-        # initially the faces are organized in two lists of faces with holes
-        #  and patches without holes
-        faces = self.shell.faces
-        for i in range(1, len(faces)):
-            if len(faces[i].patch.holes) > 0:
-                facesWithHoles.append(faces[i])
-            else:
-                patchesWithoutHoles.append(faces[i].patch)
 
-        sort_patches = []
+        for face in self.shell.faces:
+            if face is not self.infinityFace and len(face.patch.holes) == 0:
+                patchesWithoutHoles.append(face.patch)
 
-        # From this point on, the list of faces with holes is searched looking
-        #  for the outermost face. Then the outermost face is added to the new
-        #  list of patches with holes
-        while len(facesWithHoles) > 0:
-            insert = True
-            face_target = facesWithHoles[0]
-            for j in range(1, len(facesWithHoles)):
-                face_point = face_target.loop.he.vertex.point
-                poly = facesWithHoles[j].patch.getPoints()
-
-                if CompGeom.isPointInPolygon(poly, face_point):
-                    insert = False
-                    break
+        queue = [self.infinityFace]
+        for face in queue:
+            children = self.faceChildren.get(face)
+            if children is not None:
+                queue.extend(children)
 
-            if insert:
-                sort_patches.append(face_target.patch)
-                facesWithHoles.pop(0)
-            else:
-                facesWithHoles.pop(0)
-                facesWithHoles.append(face_target)
+            if face is not self.infinityFace and len(face.patch.holes) > 0:
+                sort_patches.append(face.patch)
 
         sort_patches.extend(patchesWithoutHoles)
 
@@ -19,31 +19,13 @@ class HeView:
         return self.hemodel.isEmpty()
 
     def getSelectedPoints(self):
-        points = self.hemodel.points
-        selected_points = []
-        for pt in points:
-            if pt.isSelected():
-                selected_points.append(pt)
-
-        return selected_points
+        return list(self.hemodel.selectedPoints)
 
     def getSelectedSegments(self):
-        segments = self.hemodel.segments
-        selected_segments = []
-        for seg in segments:
-            if seg.isSelected():
-                selected_segments.append(seg)
-
-        return selected_segments
+        return list(self.hemodel.selectedSegments)
 
     def getSelectedPatches(self):
-        patches = self.hemodel.patches
-        selected_patches = []
-        for patch in patches:
-            if patch.isSelected():
-                selected_patches.append(patch)
-
-        return selected_patches
+        return list(self.hemodel.selectedPatches)
 
     def getEntityAttributes(self, _entity):
         return _entity.attributes
@@ -65,55 +47,26 @@ class HeView:
         if self.hemodel.isEmpty():
             return 0.0, 10.0, 0.0, 10.0
 
-        points = self.hemodel.points
-        x = points[0].getX()
-        y = points[0].getY()
-
-        xmin = x
-        ymin = y
-        xmax = x
-        ymax = y
-
-        for i in range(1, len(points)):
-            x = points[i].getX()
-            y = points[i].getY()
-            xmin = min(x, xmin)
-            xmax = max(x, xmax)
-            ymin = min(y, ymin)
-            ymax = max(y, ymax)
-
-        for segment in self.hemodel.segments:
-            xmin_c, xmax_c, ymin_c, ymax_c = segment.getBoundBox()
-            xmin = min(xmin_c, xmin)
-            xmax = max(xmax_c, xmax)
-            ymin = min(ymin_c, ymin)
-            ymax = max(ymax_c, ymax)
+        bound_box = self.hemodel.getBoundBox()
+        if bound_box is None:
+            return 0.0, 10.0, 0.0, 10.0
 
-        return xmin, xmax, ymin, ymax
+        return bound_box
 
+    # The snapping functions only test the entities found through the
+    # spatial indexes of the model near the given point
     def snapToSegment(self, _x, _y, _tol):
 
         if self.isEmpty():
             return False, _x, _y
 
-        xClst = _x
-        yClst = _y
-        id_target = -1
-        dmin = _tol
-
-        for i in range(0, len(self.hemodel.segments)):
-            xC, yC, dist = self.hemodel.segments[i].closestPoint(_x, _y)
-            if dist < dmin:
-                xClst = xC
-                yClst = yC
-                dmin = dist
-                id_target = i
+        target, xClst, yClst = self.hemodel.nearestEdge(_x, _y, _tol)
 
-        if id_target < 0:
+        if target is None:
             return False, xClst, yClst
 
         # try to attract to a corner of the segment
-        seg_pts = self.hemodel.segments[id_target].getPoints()
+        seg_pts = target.segment.getPoints()
 
         dmin = _tol*2
         for pt in seg_pts:
@@ -133,28 +86,27 @@ class HeView:
         if self.isEmpty():
             return False, _x, _y
 
-        xClst = _x
-        yClst = _y
-        id_target = -1
-        dmin = _tol
-
-        points = self.hemodel.points
-        for i in range(0, len(points)):
-            xC = points[i].getX()
-            yC = points[i].getY()
-            if (abs(_x - xC) < _tol) and (abs(_y - yC) < _tol):
-                d = math.sqrt((_x-xC)*(_x-xC)+(_y-yC)*(_y-yC))
-                if d < dmin:
-                    xClst = xC
-                    yClst = yC
-                    dmin = d
-                    id_target = i
-
-        if id_target < 0:
-            return False, xClst, yClst
+        target = self.hemodel.nearestVertex(_x, _y, _tol)
+
+        if target is None:
+            return False, _x, _y
 
         # If found a closest point, return its coordinates
-        return True, xClst, yClst
+        return True, target.point.getX(), target.point.getY()
+
+    # Snaps each of the given coordinates ([x, y] pairs) to the nearest point
+    # of the model or, if there is none within the tolerance, to the nearest
+    # segment. Returns a list with the result of each one, as returned by
+    # snapToPoint and snapToSegment.
+    def snapToModel(self, _coords, _tol):
+        snapped = []
+        for x, y in _coords:
+            snap = self.snapToPoint(x, y, _tol)
+            if not snap[0]:
+                snap = self.snapToSegment(x, y, _tol)
+            snapped.append(snap)
+
+        return snapped
 
     def getIncidentSegmentsFromPoint(self, _point):
         incidentEdges = _point.vertex.incidentEdges()
@@ -0,0 +1,104 @@
+import json
+
+
+# Incremental reader of a JSON document from a text file. The document is
+# walked through its objects and arrays with keys() and items(), and only the
+# values that are actually read are decoded, one at a time, so that the
+# memory used is bounded by the largest of them instead of the whole file.
+class JsonStreamReader:
+
+    CHUNK_SIZE = 65536  # number of characters read from the file at once
+
+    def __init__(self, _file):
+        self.file = _file
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    # Reads at least the given number of characters into the buffer, and
+    # discards the characters that have already been consumed
+    def fill(self, _size):
+        chunk = self.file.read(max(_size, JsonStreamReader.CHUNK_SIZE))
+        if chunk == '':
+            self.eof = True
+            return False
+
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    # Returns the next character that is not a white space, without
+    # consuming it, or an empty string at the end of the file
+    def peek(self):
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\n\r':
+                self.pos += 1
+
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+
+            if not self.fill(0):
+                return ''
+
+    def expect(self, _char):
+        if self.peek() != _char:
+            print(f'ERROR: invalid JSON file, "{_char}" expected')
+            raise ValueError
+
+        self.pos += 1
+
+    # Decodes and consumes the next value
+    def readValue(self):
+        self.peek()
+
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+
+                # a number at the end of the buffer may continue in the file
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+
+            # the value is incomplete: the buffer is at least doubled
+            self.fill(len(self.buffer) - self.pos)
+
+    # Yields the keys of the next object. The value of each key must be
+    # consumed (with readValue, keys or items) before the next key is
+    # requested.
+    def keys(self):
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+
+        while True:
+            key = self.readValue()
+            self.expect(':')
+            yield key
+
+            if self.peek() == ',':
+                self.pos += 1
+            else:
+                self.expect('}')
+                return
+
+    # Yields the decoded items of the next array
+    def items(self):
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+
+        while True:
+            yield self.readValue()
+
+            if self.peek() == ',':
+                self.pos += 1
+            else:
+                self.expect(']')
+                return
@@ -4,6 +4,7 @@ from hetool.he.topologicalEntities.linkedlist import Linkedlist
 
 # Edge class declaration
 class Edge(Linkedlist):
+    __slots__ = ('he1', 'he2', 'segment', 'ID')
 
     def __init__(self, segment=None, he1=None, he2=None):
         Linkedlist.__init__(self)
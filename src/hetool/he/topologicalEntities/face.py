@@ -2,6 +2,7 @@ from hetool.he.topologicalEntities.linkedlist import Linkedlist
 
 
 class Face(Linkedlist):
+    __slots__ = ('shell', 'loop', 'intLoops', 'patch', 'ID')
 
     def __init__(self, shell=None, loop=None, prev=None, next=None, patch=None):
         Linkedlist.__init__(self, prev, next)
@@ -108,6 +109,7 @@ class Face(Linkedlist):
                 break
 
         self.patch.setBoundary(bound, orientation)
+        self.shell.setBoundaryChanged(self)
 
     def updateHoles(self):
         loop = self.loop.next
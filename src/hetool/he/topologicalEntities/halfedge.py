@@ -2,6 +2,7 @@ from hetool.he.topologicalEntities.linkedlist import Linkedlist
 
 
 class HalfEdge(Linkedlist):
+    __slots__ = ('vertex', 'edge', 'loop', 'ID')
 
     def __init__(self, vertex=None, loop=None, edge=None, prev=None, next=None):
         Linkedlist.__init__(self, prev, next)
@@ -1,5 +1,7 @@
 # Linkedlist superclass declaration
 class Linkedlist:
+    __slots__ = ('prev', 'next')
+
     def __init__(self, prev=None, next=None):
 
         self.prev = prev
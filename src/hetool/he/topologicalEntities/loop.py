@@ -1,5 +1,6 @@
 # Loop class declaration
 class Loop():
+    __slots__ = ('prev', 'next', 'face', 'he', 'isClosed', 'ID')
 
     def __init__(self, face=None, he=None, prev=None, next=None):
         self.prev = prev
@@ -1,16 +1,24 @@
+from hetool.he.entitylist import EntityList
+
+
 # Shell class declaration
 class Shell:
+    __slots__ = ('face', 'vertices', 'edges', 'faces', 'num_vertices', 'num_edges',
+                 'num_faces', 'num_loops', 'num_hes', 'dirtyFaces',
+                 'changedBoundaries')
 
     def __init__(self, face=None):
         self.face = face
-        self.vertices = []
-        self.edges = []
-        self.faces = []
+        self.vertices = EntityList()
+        self.edges = EntityList()
+        self.faces = EntityList()
         self.num_vertices = 0
         self.num_edges = 0
         self.num_faces = -1
         self.num_loops = 0
         self.num_hes = 0
+        self.dirtyFaces = {}  # faces whose patches must be updated
+        self.changedBoundaries = {}  # faces whose patches' boundaries have changed
 
     def insertVertex(self, _vertex):
 
@@ -34,8 +42,8 @@ class Shell:
                 self.num_loops = _vertex.he.loop.ID
 
         if len(self.vertices) > 0:
-            _vertex.prev = self.vertices[-1]
-            self.vertices[-1].next = _vertex
+            _vertex.prev = self.vertices.last()
+            self.vertices.last().next = _vertex
 
         self.vertices.append(_vertex)
 
@@ -61,8 +69,8 @@ class Shell:
                 self.num_hes = _edge.he2.ID
 
         if len(self.edges) > 0:
-            _edge.prev = self.edges[-1]
-            self.edges[-1].next = _edge
+            _edge.prev = self.edges.last()
+            self.edges.last().next = _edge
 
         self.edges.append(_edge)
 
@@ -81,6 +89,25 @@ class Shell:
         elif _face.loop.ID > self.num_loops:
             self.num_loops = _face.loop.ID
 
+        self.setDirtyFace(_face)
+        self.setBoundaryChanged(_face)
+
+    def setDirtyFace(self, _face):
+        self.dirtyFaces[_face] = None
+
+    def popDirtyFaces(self):
+        dirtyFaces = list(self.dirtyFaces)
+        self.dirtyFaces.clear()
+        return dirtyFaces
+
+    def setBoundaryChanged(self, _face):
+        self.changedBoundaries[_face] = None
+
+    def popChangedBoundaries(self):
+        changedBoundaries = list(self.changedBoundaries)
+        self.changedBoundaries.clear()
+        return changedBoundaries
+
     def removeVertex(self, _vertex):
         self.vertices.remove(_vertex)
 
@@ -89,6 +116,8 @@ class Shell:
 
     def removeFace(self, _face):
         self.faces.remove(_face)
+        self.dirtyFaces.pop(_face, None)
+        self.changedBoundaries.pop(_face, None)
 
     def renumberIDS(self):
 
@@ -3,6 +3,7 @@ from hetool.he.topologicalEntities.linkedlist import Linkedlist
 
 # Vertex class declaration
 class Vertex(Linkedlist):
+    __slots__ = ('point', 'he', 'ID')
 
     def __init__(self, point=None, he=None):
         Linkedlist.__init__(self)
@@ -1,15 +1,18 @@
+from collections import deque
+
+
 class UndoRedo:
 
     def __init__(self, limit=-1):
         self.isInserting = False
         self.limit = limit
-        self.temp = []
+        self.temp = deque()  # operations of the current command, last first
         self.undocommands = []
         self.redocommands = []
 
     def begin(self):
         if not self.isInserting:
-            self.temp = []
+            self.temp = deque()
             self.isInserting = True
 
     def end(self):
@@ -30,7 +33,7 @@ class UndoRedo:
     def insertOperation(self, _operation):
 
         if self.isInserting:
-            self.temp.insert(0, _operation)
+            self.temp.appendleft(_operation)
 
     def lastCommand(self):
         return self.temp
@@ -74,6 +74,22 @@ class Hetool:
         except:
             return False
 
+    # This function tried to insert a set of segments in the model of a given
+    # controller in a single command.
+    # Input data:
+    #           - _segments: List of segments, each one given by the list of its
+    #                        coordinates (as in the insertSegment function);
+    #                        Example: _segments = [[0.0,0.0,10.0,0.0],[5.0,-5.0,5.0,5.0]];
+    #           - _tol: Tolerance used in geometric checks
+    # Output data: Returns a boolean (True or false) indicating whether the segments
+    # were added or not.
+    def insertSegments(_segments, _tol=0.01):
+        try:
+            Hetool.__hecontroller.insertSegments(_segments, _tol)
+            return True
+        except:
+            return False
+
     # This function removes all selected entities from the model.
     def delSelectedEntities():
         Hetool.__hecontroller.delSelectedEntities()
@@ -142,18 +158,38 @@ class Hetool:
     def redo():
         Hetool.__hecontroller.redo()
 
-    # This function saves a model to a file in json format.
+    # This function saves a model to a file in json format or, if the file name
+    # ends with '.heb', in the binary format. If the file name ends with '.gz',
+    # the json file is compressed with gzip.
     # Input data:
     #           - _filename: file name to be saved (str).
-    def saveFile(_filename):
-        Hetool.__hecontroller.saveFile(_filename)
+    #           - _compact: writes the json file without indentation (bool).
+    def saveFile(_filename, _compact=False):
+        Hetool.__hecontroller.saveFile(_filename, _compact)
 
-    # This function reads a saved file.
+    # This function reads a saved file (json, gzip-compressed json or binary
+    # '.heb' format).
     # Input data:
     #           - _pathfile: path to the file to be read (str).
     def openFile(_pathfile):
         Hetool.__hecontroller.openFile(_pathfile)
 
+    # This function builds a new model from a finite element mesh, replacing the
+    # current one. Regions enclosed by the mesh without elements become holes.
+    # Input data:
+    #           - _nodes: Array of node coordinates;
+    #                     Example: _nodes = [[0.0,0.0],[1.0,0.0],[0.0,1.0]];
+    #           - _elements: Array of element connectivities (indices of nodes);
+    #                        Example: _elements = [[0,1,2]].
+    # Output data: Returns a boolean (True or false) indicating whether the model was
+    # built or not.
+    def buildFromMesh(_nodes, _elements):
+        try:
+            Hetool.__hecontroller.buildFromMesh(_nodes, _elements)
+            return True
+        except:
+            return False
+
     # ----------------------------------------------------------------------------
     # -------------------------- Attributes Functions ----------------------------
     # ----------------------------------------------------------------------------
@@ -367,6 +403,18 @@ class Hetool:
     def snapToPoint(_x, _y, _tol):
         return Hetool.__heview.snapToPoint(_x, _y, _tol)
 
+    # This function can be used to snap many positions at once (e.g. the samples
+    #  of a cursor path) to the model. Each position is snapped to the closest
+    #  point of the model or, if there is none, to the closest segment.
+    # Input data:
+    #           - _coords : List of positions given by their x and y coordinates
+    #                       ([[x1, y1], [x2, y2], ...]);
+    #           - _tol : Tolerance used in geometric checks (float);
+    # Output data: This function returns a list with three terms for each position,
+    #              the same as returned by the snapToPoint and snapToSegment functions.
+    def snapToModel(_coords, _tol):
+        return Hetool.__heview.snapToModel(_coords, _tol)
+
     # ----------------------------------------------------------------------------
     # -------------------  Incidence and Adjacency Functions ---------------------
     # ----------------------------------------------------------------------------
@@ -468,12 +516,13 @@ class Hetool:
     #           - _patch: Patch class object (class Patch);For more information
     #                     about this class see src\hetool\geometry\Patch;
     # Output data: Returns a list of triangles. Each triangle is represented by another
-    # list of three points.
+    # list of three points. The triangles do not cover the holes of the patch.
+    # The triangulation is kept by the patch until its boundary or holes change,
+    # and the points are shared with the patch (they must not be modified).
     # Note 1: To use this function efficiently, get all patches by "getPatches" function
     # which already returns all ordered regions from the outermost face to the innermost.
     # This ordering was created to enable the rendering of holes.
     # Note 2: To highlight the holes with another color, check if the patch was deleted
     # through the "isDeleted" attribute of the class Patch.
     def tessellate(_patch):
-        pts = _patch.getPoints()
-        return Tesselation.tessellate(pts)
+        return _patch.tessellate()